@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+
+"""
+@file bench_archive.py
+@date 10/18/2026
+@version 0.1
+
+@brief How big the history's Archive is and how fast it is read, next to
+plain text logs.
+
+A history of random messages (one a second, taking turns between the
+contacts) is written to SQLite, then rolled into the Archive all at once.
+The same messages are written to a plain text log per contact, then both
+are read: message N of a contact, every message in a minute, and a page
+of a conversation.
+
+The history before the roll is kept in the directory, so later runs with
+the same --directory skip writing it (unless --fresh is given).
+
+Usage: python benchmarks/bench_archive.py [--messages N] [--contacts N]
+       [--block KB] [--directory PATH] [--fresh] [--tree PATH]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--messages", type=int, default=1000000)
+parser.add_argument("--contacts", type=int, default=200)
+parser.add_argument("--block", type=int, default=None,
+                    help="KB of messages compressed together")
+parser.add_argument("--directory", default=os.path.join(
+                    tempfile.gettempdir(), "calamity-bench-archive"))
+parser.add_argument("--fresh", action="store_true",
+                    help="write the history again even if it exists")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+import calamity.globals
+if arguments.block != None:
+    calamity.globals.HISTORY_BLOCK = arguments.block * 1024
+from calamity.history import History
+
+COMMON = ("the a to you i it is and that of in for me on what have do so "
+          "but").split()
+WORDS = ["w%d" % i for i in range(20000)]
+
+def message():
+    """
+    @return A random message of 3 to 15 words.
+    """
+    words = []
+    for i in range(random.randint(3, 15)):
+        if random.random() < 0.5:
+            words.append(random.choice(COMMON))
+        else:
+            index = int(random.paretovariate(1.0)) - 1
+            words.append(WORDS[min(index, len(WORDS) - 1)])
+    return " ".join(words)
+
+def size(path):
+    """
+    @return The bytes of a file, or of every file under a directory.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum([os.path.getsize(os.path.join(directory, name))
+                for directory, _, names in os.walk(path) for name in names])
+
+def timed(function, count):
+    """
+    @return The seconds function(i) takes on average, for i in range(count).
+    """
+    start = time.time()
+    for i in range(count):
+        function(i)
+    return (time.time() - start) / count
+
+# The history before the roll, kept for the next run.
+original = os.path.join(arguments.directory, "original.db")
+if arguments.fresh or not os.path.exists(original):
+    shutil.rmtree(arguments.directory, True)
+    random.seed(1)
+    history = History(original, segment_size=sys.maxint,
+                      segment_age=sys.maxint)
+    for i in range(arguments.messages):
+        history.record("c%d@x.com" % (i % arguments.contacts), "Me",
+                       message(), when=i)
+    history.close()
+    shutil.rmtree(os.path.join(arguments.directory, "original-archive"))
+
+work = os.path.join(arguments.directory, "work")
+shutil.rmtree(work, True)
+os.makedirs(work)
+shutil.copy(original, os.path.join(work, "history.db"))
+
+# Any message written to a full database rolls it.
+history = History(os.path.join(work, "history.db"), segment_size=1)
+start = time.time()
+history.record("c0@x.com", "Me", "roll please", when=arguments.messages)
+history.flush()
+archive = history.get_archive()
+print "rolled %d messages in %.1f s (on the writer)" % \
+    (archive.get_last(), time.time() - start)
+
+# The same messages as plain text, a log per contact.
+logs = os.path.join(work, "logs")
+os.makedirs(logs)
+files = {}
+for id in range(1, archive.get_last() + 1):
+    id, contact, when, sender, text = archive.get(id)
+    if contact not in files:
+        files[contact] = open(os.path.join(logs, contact + ".log"), "ab")
+    files[contact].write("%r %s: %s\n" % (when, sender, text))
+for f in files.values():
+    f.close()
+
+directory = os.path.join(work, "history-archive")
+segments = sum([os.path.getsize(os.path.join(directory, name))
+                for name in os.listdir(directory) if name.endswith(".seg")])
+print "disk: plain text logs %.1f MB, archive %.1f MB " \
+      "(segments %.1f MB, index %.1f MB, contact ids %.1f MB)" % \
+    (size(logs) / 1e6, size(directory) / 1e6, segments / 1e6,
+     (size(os.path.join(directory, "index")) + 
+      size(os.path.join(directory, "blocks"))) / 1e6,
+     size(os.path.join(directory, "contacts")) / 1e6)
+
+random.seed(2)
+contacts = files.keys()
+picks = []
+for i in range(2000):
+    contact = random.choice(contacts)
+    picks.append((contact, random.randrange(archive.count(contact))))
+
+def plain_message(i):
+    contact, n = picks[i]
+    with open(os.path.join(logs, contact + ".log")) as f:
+        for line, text in enumerate(f):
+            if line == n:
+                return text
+
+archived = timed(lambda i: archive.message(*picks[i]), len(picks))
+plain = timed(plain_message, 200)
+print "message N of a contact:  archive %8.1f us   plain logs %8.1f us" % \
+    (archived * 1e6, plain * 1e6)
+
+starts = [random.uniform(0, arguments.messages - 60) for i in range(500)]
+
+def plain_between(i):
+    found = []
+    for contact in contacts:
+        with open(os.path.join(logs, contact + ".log")) as f:
+            for line in f:
+                when = float(line.split(" ", 1)[0])
+                if starts[i] <= when < starts[i] + 60:
+                    found.append(line)
+    return found
+
+archived = timed(lambda i: archive.between(starts[i], starts[i] + 60),
+                 len(starts))
+plain = timed(plain_between, 10)
+print "a minute of messages:    archive %8.1f us   plain logs %8.1f ms" % \
+    (archived * 1e6, plain * 1e3)
+
+befores = [random.randrange(1, archive.get_last()) for i in range(500)]
+paged = timed(lambda i: history.page(picks[i][0], befores[i]), len(befores))
+print "History.page (archived): %8.2f ms" % (paged * 1e3)
+history.close()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+"""
+@file bench_engine.py
+@date 10/18/2026
+@version 0.1
+
+@brief How long a presence change waits between the server and its handler.
+
+A stand-in notification server (the other end of a socketpair, written to
+from a thread) sends NLN lines at random intervals to a Connection. The
+time from each write to the Connection handing the change to the app is
+measured with the Engine running (it wakes up as soon as data arrives),
+and with the old way of calling Connection.listen on a timer (every second
+by default, like CalamityApp.get_updates did).
+
+Usage: python benchmarks/bench_engine.py [--events N] [--gap SECONDS]
+       [--interval SECONDS] [--tree PATH]
+"""
+
+import argparse
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--events", type=int, default=200)
+parser.add_argument("--gap", type=float, default=0.05,
+                    help="longest wait between two changes, in seconds")
+parser.add_argument("--interval", type=float, default=1.0,
+                    help="how often the old way polls, in seconds")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+from network.msn import Connection
+
+class _App:
+    """
+    @brief Stands in for CalamityApp, notes when every change arrives.
+    """
+    
+    def __init__(self, count):
+        self.arrived = {}
+        self.count = count
+        self.done = None
+    
+    def set_status(self, email, status):
+        self.arrived[email] = time.time()
+        if len(self.arrived) == self.count and self.done != None:
+            self.done()
+
+def serve(sock, count, gap, sent):
+    """
+    @brief Sends count NLN lines, a random time apart.
+    
+    @var sent: Filled with the time every line was written.
+    """
+    random.seed(1)
+    for i in range(count):
+        time.sleep(random.uniform(0, gap))
+        email = "user%d@hotmail.com" % i
+        sent[email] = time.time()
+        sock.sendall("NLN NLN %s Nick%d 0\r\n" % (email, i))
+
+def measure(wait):
+    """
+    @brief Runs the stand-in server against a new Connection.
+    
+    @var wait: Called with the Connection and the app, returns once every
+    change has arrived.
+    @return The latencies in milliseconds, sorted.
+    """
+    ours, theirs = socket.socketpair()
+    connection = Connection("me@hotmail.com", "", sock=ours)
+    app = _App(arguments.events)
+    connection.set_app(app)
+    
+    sent = {}
+    server = threading.Thread(target=serve, args=(theirs, arguments.events,
+                                                  arguments.gap, sent))
+    server.start()
+    wait(connection, app)
+    server.join()
+    connection.get_engine().close()
+    theirs.close()
+    
+    return sorted((app.arrived[email] - sent[email]) * 1000
+                  for email in sent)
+
+def engine(connection, app):
+    """
+    @brief Lets the Engine wait for the data.
+    """
+    app.done = connection.get_engine().stop
+    connection.get_engine().run()
+
+def timer(connection, app):
+    """
+    @brief Polls the socket every interval, like the old timer did.
+    """
+    while len(app.arrived) < app.count:
+        time.sleep(arguments.interval)
+        connection.listen()
+
+def report(name, latencies):
+    print "%-22s median %8.2f ms  p99 %8.2f ms  max %8.2f ms" % \
+        (name, latencies[len(latencies) // 2],
+         latencies[int(len(latencies) * 0.99)], latencies[-1])
+
+print "%d changes, up to %.0f ms apart" % (arguments.events,
+                                           arguments.gap * 1000)
+report("Engine.run:", measure(engine))
+report("listen every %.1f s:" % arguments.interval, measure(timer))
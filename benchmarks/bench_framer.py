@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+
+"""
+@file bench_framer.py
+@date 10/18/2026
+@version 0.1
+
+@brief How fast the Framer splits presence-storm traffic.
+
+A storm of ILN lines (with a MSG and its payload every 50 lines) is sent
+over a socketpair and read with Framer.recv_into, the MB/s parsed is
+compared with the old way of adding every recv(4096) to a string and
+splitting the whole thing again.
+
+Usage: python benchmarks/bench_framer.py [--lines N] [--runs N] [--tree PATH]
+"""
+
+import argparse
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--lines", type=int, default=200000,
+                    help="commands in the storm")
+parser.add_argument("--runs", type=int, default=5,
+                    help="runs of each, the fastest is shown")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+from network.msn.framer import Framer
+
+def storm(count):
+    """
+    @brief Makes the traffic of a presence storm.
+    
+    @var count: How many commands.
+    @return The bytes the server would send.
+    """
+    lines = []
+    for i in range(count):
+        if i % 50 == 0:
+            body = ("MIME-Version: 1.0\r\n"
+                    "Content-Type: text/x-msmsgscontrol\r\n\r\nhello %d" % i)
+            lines.append("MSG a%d@hotmail.com Nick %d\r\n%s" % 
+                         (i, len(body), body))
+        else:
+            lines.append("ILN 9 NLN user%d@hotmail.com Some%%20Nick%d 0\r\n" %
+                         (i, i))
+    return "".join(lines)
+
+def check(data, count):
+    """
+    @brief Frames the data cut at random places, every command has to come
+    out whole.
+    """
+    framer = Framer()
+    framed = 0
+    position = 0
+    random.seed(1)
+    while position < len(data):
+        cut = random.randint(1, 9000)
+        framer.feed(data[position:position + cut])
+        position += cut
+        for command, payload in framer:
+            framed += 1
+    assert framed == count, (framed, count)
+
+def framer_speed(data):
+    """
+    @return (seconds, commands) to frame data read from a socket.
+    """
+    ours, theirs = socket.socketpair()
+    def write():
+        theirs.sendall(data)
+        theirs.close()
+    writer = threading.Thread(target=write)
+    writer.start()
+    
+    framer = Framer()
+    framed = 0
+    start = time.time()
+    while framer.recv_into(ours, 65536):
+        for command, payload in framer:
+            framed += 1
+    elapsed = time.time() - start
+    writer.join()
+    ours.close()
+    return elapsed, framed
+
+def string_speed(data):
+    """
+    @return (seconds, commands) to split data read from a socket the old way
+    (which can't find payloads at all).
+    """
+    ours, theirs = socket.socketpair()
+    def write():
+        theirs.sendall(data)
+        theirs.close()
+    writer = threading.Thread(target=write)
+    writer.start()
+    
+    buffer = ""
+    split = 0
+    start = time.time()
+    while True:
+        read = ours.recv(4096)
+        if not read:
+            break
+        buffer += read.replace("\r", "")
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        for line in lines:
+            line.split(" ")
+            split += 1
+    elapsed = time.time() - start
+    writer.join()
+    ours.close()
+    return elapsed, split
+
+def best(speed, data, runs):
+    """
+    @return The fastest (seconds, commands) of a few runs.
+    """
+    return min(speed(data) for i in range(runs))
+
+data = storm(arguments.lines)
+check(data, arguments.lines)
+
+print "%d commands, %.1f MB" % (arguments.lines, len(data) / 1e6)
+elapsed, framed = best(framer_speed, data, arguments.runs)
+print "Framer.recv_into:   %6.1f MB/s  %7.0f commands/s" % \
+    (len(data) / elapsed / 1e6, framed / elapsed)
+elapsed, split = best(string_speed, data, arguments.runs)
+print "string += and split: %5.1f MB/s  %7.0f lines/s (payloads not framed)" % \
+    (len(data) / elapsed / 1e6, split / elapsed)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+"""
+@file bench_history.py
+@date 10/18/2026
+@version 0.1
+
+@brief How long a conversation with a long history takes to open and page.
+
+A single contact with a long history (100k messages by default) is written
+through History.record, then Conversations with that contact are opened on
+the recording backend (the last page of the history is shown) and scrolled
+up a page at a time. History.page is also timed on its own, near the newest
+message, halfway and near the oldest one, against reading the whole history
+at once.
+
+The history is left in the directory, so later runs with the same
+--directory skip writing it (unless --fresh is given). With --archive the
+history is rolled into the Archive first (see bench_archive.py).
+
+Usage: python benchmarks/bench_history.py [--messages N] [--archive]
+       [--directory PATH] [--fresh] [--tree PATH]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--messages", type=int, default=100000)
+parser.add_argument("--archive", action="store_true",
+                    help="page from the Archive instead of SQLite")
+parser.add_argument("--directory", default=os.path.join(
+                    tempfile.gettempdir(), "calamity-bench-history"))
+parser.add_argument("--fresh", action="store_true",
+                    help="write the history again even if it exists")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+import gui
+# Nothing is drawn.
+recorder = gui.backend.Recorder()
+gui.backend.use(recorder)
+import calamity
+from calamity import history
+from calamity.history import History
+
+CONTACT = "friend@x.com"
+
+def open_history(path):
+    """
+    @brief Opens the history without ever rolling it into the archive.
+    """
+    return History(path, segment_size=sys.maxint, segment_age=sys.maxint)
+
+def median(times):
+    """
+    @return The median of the times, in milliseconds.
+    """
+    return sorted(times)[len(times) // 2] * 1e3
+
+path = os.path.join(arguments.directory, "history.db")
+if arguments.fresh or not os.path.exists(path):
+    shutil.rmtree(arguments.directory, True)
+    random.seed(1)
+    written = open_history(path)
+    for i in range(arguments.messages):
+        written.record(CONTACT, random.choice(["Me", "Friend"]),
+                       "message %d " % i + "x" * random.randint(5, 80),
+                       when=i)
+    written.close()
+
+if arguments.archive:
+    work = os.path.join(arguments.directory, "work")
+    shutil.rmtree(work, True)
+    os.makedirs(work)
+    shutil.copy(path, os.path.join(work, "history.db"))
+    path = os.path.join(work, "history.db")
+    
+    # Any message written to a full database rolls it.
+    rolled = History(path, segment_size=1)
+    rolled.record("nobody@x.com", "Me", "roll please", when=0)
+    rolled.close()
+
+start = time.time()
+store = open_history(path)
+print "opened a history of %d messages in %.1f ms (%s)" % \
+    (store.count(CONTACT), (time.time() - start) * 1e3,
+     arguments.archive and "archive" or "SQLite")
+history.use(store)
+
+# The first Window is the application's, conversations are the rest.
+gui.Window(title="Calamity", app=recorder.app())
+member = calamity.Member("Friend", CONTACT, "online")
+
+opened = []
+for i in range(20):
+    start = time.time()
+    conversation = calamity.Conversation(member)
+    recorder.update()
+    opened.append(time.time() - start)
+print "open a conversation:     median %7.2f ms  max %7.2f ms" % \
+    (median(opened), max(opened) * 1e3)
+
+# Until the MessageBox holds as many lines as it keeps.
+scrolled = []
+while True:
+    lines = conversation._messages.get_line_count()
+    start = time.time()
+    conversation._show_older()
+    recorder.update()
+    if conversation._messages.get_line_count() == lines:
+        break
+    scrolled.append(time.time() - start)
+print "scroll up a page:        median %7.2f ms  max %7.2f ms  (%d pages)" % \
+    (median(scrolled), max(scrolled) * 1e3, len(scrolled))
+
+newest = store.page(CONTACT)[-1][0]
+for name, before in [("newest", None), ("halfway", newest // 2),
+                     ("oldest", 100)]:
+    paged = []
+    for i in range(20):
+        start = time.time()
+        store.page(CONTACT, before)
+        paged.append(time.time() - start)
+    print "History.page %-10s median %7.2f ms" % (name + ":", median(paged))
+
+start = time.time()
+everything = store.page(CONTACT, None, arguments.messages)
+print "whole history at once:   %7.1f ms (%d messages)" % \
+    ((time.time() - start) * 1e3, len(everything))
+store.close()
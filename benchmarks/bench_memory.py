@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+"""
+@file bench_memory.py
+@date 10/18/2026
+@version 0.1
+
+@brief Bytes per contact row, on the recording backend.
+
+Contacts are added to a Group that is either hidden (its widgets are never
+made) or drawn, and every object the garbage collector can see that was
+made for them is added up with sys.getsizeof. Drawn rows include the
+recorder's own widgets, which stand in for Tk's.
+
+Usage: python benchmarks/bench_memory.py [--contacts N] [--tree PATH]
+"""
+
+import argparse
+import gc
+import os
+import sys
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--contacts", type=int, default=2000)
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+import gui
+recorder = gui.backend.Recorder()
+gui.backend.use(recorder)
+import calamity
+
+def objects():
+    """
+    @return id -> object of everything the garbage collector tracks.
+    """
+    gc.collect()
+    return dict((id(o), o) for o in gc.get_objects())
+
+def row_bytes(drawn):
+    """
+    @brief Fills a Group and measures what its contacts take.
+    
+    @var drawn: True to draw the Group, False to leave it hidden.
+    @return (bytes per contact, [(bytes per contact, type name)] biggest 
+    first)
+    """
+    group = calamity.Group("group")
+    if drawn:
+        group.get_layer().parent(recorder.app())
+    recorder.update()
+    
+    before = objects()
+    for i in range(arguments.contacts):
+        group.add(calamity.Member("nick%04d" % i, "u%d@x.com" % i, "online"))
+    recorder.update()
+    recorder.clear()
+    after = objects()
+    
+    kinds = {}
+    total = 0
+    for key, o in after.items():
+        if key in before:
+            continue
+        size = sys.getsizeof(o)
+        total += size
+        kind = type(o).__name__
+        kinds[kind] = kinds.get(kind, 0) + size
+    
+    count = float(arguments.contacts)
+    biggest = sorted([(size / count, kind) for kind, size in kinds.items()],
+                     reverse=True)
+    return total / count, biggest, group
+
+for drawn in [False, True]:
+    size, biggest, group = row_bytes(drawn)
+    print "%-7s %6.0f bytes per contact row" % \
+        (drawn and "drawn" or "hidden", size)
+    for kind_size, kind in biggest[:6]:
+        print "        %6.0f %s" % (kind_size, kind)
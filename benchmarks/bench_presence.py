@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+"""
+@file bench_presence.py
+@date 10/18/2026
+@version 0.1
+
+@brief How long a presence storm takes with 10k contacts.
+
+Contacts are spread over a few Groups, then a storm of random presence
+changes is looked up the old way (Group.find on every Group, a scan of
+every Member) and through CalamityApp's email index, and applied the way
+the Connection applies them (set_status, then one apply_status).
+
+Trees older than the recording backend (gui.backend) need a display.
+
+Usage: python benchmarks/bench_presence.py [--contacts N] [--events N]
+       [--groups N] [--tree PATH]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import types
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--contacts", type=int, default=10000)
+parser.add_argument("--events", type=int, default=5000)
+parser.add_argument("--groups", type=int, default=10)
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+import gui
+# Nothing is drawn, trees with a recording backend use it.
+if hasattr(gui, "backend"):
+    recorder = gui.backend.Recorder()
+    gui.backend.use(recorder)
+import calamity
+
+class _Layer:
+    """
+    @brief Stands in for the layer the Groups are drawn on after sign in.
+    """
+    def add(self, item):
+        pass
+
+def make_app():
+    """
+    @brief Makes a CalamityApp without its window (or sign in screen).
+    """
+    app = types.InstanceType(calamity.CalamityApp)
+    app._groups = []
+    app._contacts = {}
+    app._layer = _Layer()
+    app._presence = {}
+    app._presence_scheduled = False
+    app._presence_interval = 0
+    if hasattr(gui, "backend"):
+        app._app = recorder.app()
+    return app
+
+random.seed(1)
+app = make_app()
+for i in range(arguments.groups):
+    calamity.CalamityApp.add(app, calamity.Group("group %d" % i))
+
+start = time.time()
+emails = []
+for i in range(arguments.contacts):
+    email = "user%d@hotmail.com" % i
+    emails.append(email)
+    app[i % arguments.groups].add(calamity.Member("nick%d" % i, email))
+print "%d contacts in %d groups built in %.2f s" % \
+    (arguments.contacts, arguments.groups, time.time() - start)
+
+storm = [random.choice(emails) for i in range(arguments.events)]
+
+def linear_find(group, email):
+    """
+    @brief Group.find as it was, a scan of every Member.
+    """
+    index = 0
+    for member in group._members:
+        if member.get_email() == email:
+            return index
+        index += 1
+    return -1
+
+sample = storm[:max(1, arguments.events / 10)]
+start = time.time()
+for email in sample:
+    for group in app._groups:
+        linear_find(group, email)
+print "lookup, scan of every group:  %10.1f us/event" % \
+    ((time.time() - start) / len(sample) * 1e6)
+
+if hasattr(calamity.CalamityApp, "find"):
+    start = time.time()
+    for email in storm:
+        for member in app.find(email):
+            pass
+    print "lookup, email index:          %10.2f us/event" % \
+        ((time.time() - start) / len(storm) * 1e6)
+
+if hasattr(calamity.CalamityApp, "apply_status"):
+    statuses = ["online", "away", "busy", "offline"]
+    start = time.time()
+    for email in storm:
+        app.set_status(email, random.choice(statuses))
+    app.apply_status()
+    print "storm applied (one batch):    %10.1f us/event" % \
+        ((time.time() - start) / len(storm) * 1e6)
+    
+    # The index has to hold up after all that re-sorting.
+    for group in app._groups:
+        for index, member in enumerate(group._members):
+            assert group.find(member.get_email()) == index
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+"""
+@file bench_search.py
+@date 10/18/2026
+@version 0.1
+
+@brief How long History.search takes over a big history.
+
+A history of random messages (words drawn from a Zipf distribution, with
+half of them common words) is written through History.record, then a mix
+of common, rare, missing and multi-word queries are searched for, across
+every contact and in a single conversation. The history is kept in
+SQLite (nothing is rolled into the archive, see bench_archive.py for
+that).
+
+The history is left in the directory, so later runs with the same
+--directory skip writing it (unless --fresh is given).
+
+Usage: python benchmarks/bench_search.py [--messages N] [--contacts N]
+       [--directory PATH] [--fresh] [--tree PATH]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--messages", type=int, default=1000000)
+parser.add_argument("--contacts", type=int, default=200)
+parser.add_argument("--directory", default=os.path.join(
+                    tempfile.gettempdir(), "calamity-bench-search"))
+parser.add_argument("--fresh", action="store_true",
+                    help="write the history again even if it exists")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+from calamity.history import History
+
+COMMON = ("the a to you i it is and that of in for me on what have do so "
+          "but").split()
+WORDS = ["w%d" % i for i in range(20000)]
+
+def zipf():
+    """
+    @return A word, the first ones far more often than the rest.
+    """
+    return WORDS[min(int(random.paretovariate(1.0)) - 1, len(WORDS) - 1)]
+
+def message():
+    """
+    @return A random message of 3 to 15 words.
+    """
+    words = []
+    for i in range(random.randint(3, 15)):
+        if random.random() < 0.5:
+            words.append(random.choice(COMMON))
+        else:
+            words.append(zipf())
+    return " ".join(words)
+
+def open_history(path):
+    """
+    @brief Opens the history without ever rolling it into the archive.
+    """
+    return History(path, segment_size=sys.maxint, segment_age=sys.maxint)
+
+path = os.path.join(arguments.directory, "history.db")
+if arguments.fresh or not os.path.exists(path):
+    shutil.rmtree(arguments.directory, True)
+    random.seed(1)
+    history = open_history(path)
+    start = time.time()
+    caller = 0.0
+    for i in range(arguments.messages):
+        text = message()
+        before = time.time()
+        history.record("c%d@x.com" % (i % arguments.contacts), "Me", text,
+                       when=i)
+        caller += time.time() - before
+    history.flush()
+    elapsed = time.time() - start
+    print "wrote %d messages: record() %.1f us on the caller, " \
+          "%.0f messages/s indexed by the writer" % \
+          (arguments.messages, caller / arguments.messages * 1e6,
+           arguments.messages / elapsed)
+    history.close()
+
+history = open_history(path)
+print "history of %d messages, %.0f MB" % \
+    (sum(history.count("c%d@x.com" % i) for i in range(arguments.contacts)),
+     os.path.getsize(path) / 1e6)
+
+queries = ["the", "you", "w1", "w50", "w3000", "w1 w5", "the you", "w19000",
+           "nomatchatall", "w2 w7 w20"]
+worst = 0
+print "%-14s %-10s %9s %9s %6s" % ("query", "contacts", "median", "max",
+                                   "hits")
+for query in queries:
+    for contact in [None, "c7@x.com"]:
+        times = []
+        for i in range(7):
+            start = time.time()
+            found = history.search(query, contact)
+            times.append(time.time() - start)
+        times.sort()
+        worst = max(worst, times[-1])
+        print "%-14s %-10s %6.2f ms %6.2f ms %6d" % \
+            (query, contact == None and "all" or "one", times[3] * 1e3,
+             times[-1] * 1e3, len(found))
+print "slowest search: %.1f ms" % (worst * 1e3)
+history.close()
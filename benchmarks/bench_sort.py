@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""
+@file bench_sort.py
+@date 10/18/2026
+@version 0.1
+
+@brief How long sorting 10k Members takes, and what a contact costs in
+memory.
+
+Members are sorted through their comparison methods (the way Group sorted
+them) and by their cached key, then the bytes of each Member's data (its
+Contact and sort key) are added up.
+
+Trees older than the recording backend (gui.backend) need a display.
+
+Usage: python benchmarks/bench_sort.py [--members N] [--tree PATH]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.split("@brief ")[1]
+                                 .split("\n")[0])
+parser.add_argument("--members", type=int, default=10000)
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(
+                    os.path.abspath(__file__)), os.pardir),
+                    help="checkout to measure (this one by default)")
+arguments = parser.parse_args()
+sys.path.insert(0, os.path.abspath(arguments.tree))
+
+import gui
+if hasattr(gui, "backend"):
+    gui.backend.use(gui.backend.Recorder())
+import calamity
+
+def best(function, repeat=5):
+    """
+    @return The fastest of a few runs of function, in seconds.
+    """
+    times = []
+    for i in range(repeat):
+        start = time.time()
+        function()
+        times.append(time.time() - start)
+    return min(times)
+
+random.seed(1)
+statuses = ["online", "away", "busy", "offline"]
+members = [calamity.Member("nick%05d" % random.randrange(100000),
+                           "user%d@hotmail.com" % i, random.choice(statuses))
+           for i in range(arguments.members)]
+random.shuffle(members)
+
+print "sorting %d members:" % len(members)
+print "  through __lt__:     %7.1f ms" % (best(lambda: sorted(members)) * 1e3)
+if hasattr(calamity.Member, "get_key"):
+    print "  by the cached key:  %7.1f ms" % \
+        (best(lambda: sorted(members, key=calamity.Member.get_key)) * 1e3)
+    assert sorted(members) == sorted(members, key=calamity.Member.get_key)
+
+if hasattr(members[0], "_contact"):
+    contacts = [member._contact for member in members]
+    size = 0
+    for contact in contacts:
+        size += sys.getsizeof(contact) + sys.getsizeof(contact.key)
+    print "Contact and its key: %7.0f bytes per contact" % \
+        (size / float(len(contacts)))
+
+# Everything that was made for a Member (data and widget objects alike).
+gc.collect()
+before = set(id(o) for o in gc.get_objects())
+more = [calamity.Member("nick%05d" % i, "more%d@hotmail.com" % i, "online")
+        for i in range(1000)]
+gc.collect()
+size = sum(sys.getsizeof(o) for o in gc.get_objects() if id(o) not in before)
+print "whole Member:        %7.0f bytes per contact (gc tracked objects)" % \
+    (size / 1000.0)
@@ -10,8 +10,10 @@ solely operates on the local machine. It utilizes the GUI package to more
 easily render the on screen interface.
 """
 
+import history
 from calamity import CalamityApp
 from member import Member
 from group import Group
 from conversation import Conversation
+from history import History
 
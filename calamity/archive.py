@@ -0,0 +1,463 @@
+"""
+@file Archive.py
+@date 10/18/2026
+@version 0.1
+
+@brief The implementation of the Archive class.
+
+An Archive is where old messages go once the History has held them for too
+long. Messages are written in segments (one per roll of the History) made
+of zlib compressed blocks, and found through an index of fixed-width
+records, one per message in the order they were written, which is memory
+mapped. Reading any message takes one seek into a segment, and the messages
+of a contact (or of a time range) are found in the index without reading
+any segment at all.
+
+Files in the directory of an Archive:
+    index       The id of the first message, then a record per message.
+    blocks      A record per block, where it is.
+    NNNNNN.seg  A segment, its blocks one after the other.
+    contacts/   A file per contact (named by the hex of its email) holding
+                the ids of its messages.
+"""
+
+import bisect
+import collections
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+import globals
+
+# id of the first message in the index
+_HEADER = struct.Struct("<Q")
+
+# time, block (0 if there is no message with that id, the first block is 1)
+# and where the message starts in the uncompressed block
+_RECORD = struct.Struct("<dII")
+
+# segment, where the block starts in it and its (compressed) size
+_BLOCK = struct.Struct("<III")
+
+# In a block, the length of each message comes before it.
+_LENGTH = struct.Struct("<I")
+
+# An id in the file of a contact
+_ID = struct.Struct("<I")
+
+# How many uncompressed blocks are kept for reading the messages near the
+# last one read.
+_CACHED_BLOCKS = 16
+
+class _Ids:
+    """
+    @brief A memory mapped list of fixed-width records, i.e. the ids of a
+    contact's messages.
+    """
+    
+    def __init__(self, path, record, offset = 0):
+        """
+        @brief Maps a file (if it exists).
+        
+        @var path: The file.
+        @var record: The struct.Struct of a record.
+        @var offset: How many bytes there are before the first record.
+        """
+        self._record = record
+        self._offset = offset
+        self._map = None
+        self._length = 0
+        
+        if os.path.exists(path) and os.path.getsize(path) > offset:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._length = (len(self._map) - offset) / record.size
+    
+    def __len__(self):
+        """
+        @return The number of records.
+        """
+        return self._length
+    
+    def __getitem__(self, index):
+        """
+        @brief Reads a record.
+        
+        @var index: Which record, starting from 0.
+        @return The values of the record (a single value if it only has one).
+        """
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError(index)
+        
+        values = self._record.unpack_from(self._map,
+                                          self._offset +
+                                          index * self._record.size)
+        if len(values) == 1:
+            return values[0]
+        return values
+    
+    def header(self, struct):
+        """
+        @brief Reads what comes before the first record.
+        
+        @var struct: The struct.Struct of the header.
+        @return The values of the header.
+        """
+        return struct.unpack_from(self._map, 0)
+    
+    def close(self):
+        """
+        @brief Unmaps the file.
+        """
+        if self._map != None:
+            self._map.close()
+            self._map = None
+
+class Archive:
+    """
+    @brief Compressed, read mostly storage of old messages.
+    """
+    
+    def __init__(self, directory, block = globals.HISTORY_BLOCK):
+        """
+        @brief Opens (or creates) an Archive.
+        
+        @var directory: Where its files are kept.
+        @var block: How many bytes of messages are compressed together.
+        """
+        self._directory = directory
+        self._block = block
+        
+        if not os.path.isdir(os.path.join(directory, "contacts")):
+            os.makedirs(os.path.join(directory, "contacts"))
+        
+        # Appending is done by the History's writer, reading by the main
+        # loop.
+        self._lock = threading.Lock()
+        
+        self._index = None
+        self._table = None
+        self._first = 0
+        self._map_index()
+        
+        # hex of an email -> its _Ids
+        self._contacts = {}
+        # block -> uncompressed block, least recently read first
+        self._blocks = collections.OrderedDict()
+        # segment -> file open for reading
+        self._segments = {}
+        
+        names = [name for name in os.listdir(directory)
+                 if name.endswith(".seg")]
+        self._segment = max([int(name[:-4]) for name in names] + [0])
+    
+    def _map_index(self):
+        """
+        @brief Maps the index and the table of blocks again (after they
+        have grown).
+        """
+        if self._index != None:
+            self._index.close()
+            self._table.close()
+        
+        self._index = _Ids(os.path.join(self._directory, "index"),
+                           _RECORD, _HEADER.size)
+        self._table = _Ids(os.path.join(self._directory, "blocks"), _BLOCK)
+        if len(self._index) > 0:
+            self._first = self._index.header(_HEADER)[0]
+    
+    def _ids(self, contact):
+        """
+        @brief Gets the ids of the messages of a contact.
+        
+        @var contact: The email of the contact.
+        @return An _Ids, in the order the messages were written.
+        """
+        name = contact.encode("hex")
+        if name not in self._contacts:
+            self._contacts[name] = _Ids(os.path.join(self._directory,
+                                                     "contacts", name), _ID)
+        return self._contacts[name]
+    
+    def get_last(self):
+        """
+        @brief Gets the id of the newest message in the Archive.
+        
+        @return The id, 0 if the Archive is empty.
+        """
+        if len(self._index) == 0:
+            return 0
+        return self._first + len(self._index) - 1
+    
+    def append(self, rows):
+        """
+        @brief Writes messages into a new segment.
+        @note Messages that are already in the Archive are skipped.
+        
+        @var rows: A list of (id, contact, time, sender, message), oldest
+        first.
+        @return How many messages were written.
+        """
+        rows = [row for row in rows if row[0] > self.get_last()]
+        if len(rows) == 0:
+            return 0
+        
+        segment = self._segment + 1
+        first = self.get_last() + 1
+        if len(self._index) == 0:
+            first = rows[0][0]
+        
+        records = []
+        blocks = []
+        contacts = {}
+        # A segment holds the messages of each contact together, so a page 
+        # of a conversation takes a block or two rather than a block for 
+        # every message.
+        ordered = sorted(rows, key=lambda row: (row[1], row[0]))
+        path = os.path.join(self._directory, "%06d.seg" % segment)
+        with open(path, "wb") as f:
+            block = []
+            size = 0
+            for id, contact, time, sender, message in ordered:
+                data = "%s\0%s\0%s" % (contact, sender, message)
+                records.append((id, (time, len(self._table) + len(blocks) + 1,
+                                     size)))
+                block.append(_LENGTH.pack(len(data)))
+                block.append(data)
+                size += _LENGTH.size + len(data)
+                contacts.setdefault(contact, []).append(id)
+                
+                if size >= self._block or id == ordered[-1][0]:
+                    compressed = zlib.compress("".join(block))
+                    blocks.append((segment, f.tell(), len(compressed)))
+                    f.write(compressed)
+                    block = []
+                    size = 0
+            f.flush()
+            os.fsync(f.fileno())
+        records.sort()
+        
+        with self._lock:
+            for contact, ids in contacts.items():
+                name = contact.encode("hex")
+                path = os.path.join(self._directory, "contacts", name)
+                
+                # An append that didn't get as far as the index leaves ids
+                # past its end, they are written again below.
+                kept = self._count(self._ids(contact))
+                if kept < len(self._ids(contact)):
+                    self._contacts.pop(name).close()
+                    with open(path, "r+b") as f:
+                        f.truncate(kept * _ID.size)
+                
+                with open(path, "ab") as f:
+                    f.write("".join([_ID.pack(id) for id in ids]))
+                if name in self._contacts:
+                    self._contacts.pop(name).close()
+            
+            with open(os.path.join(self._directory, "blocks"), "ab") as f:
+                f.write("".join([_BLOCK.pack(*block) for block in blocks]))
+            
+            # The index is written last, a message is only in the Archive
+            # once it is in the index.
+            with open(os.path.join(self._directory, "index"), "ab") as f:
+                if len(self._index) == 0:
+                    f.write(_HEADER.pack(first))
+                expected = first
+                for id, record in records:
+                    # No message was written with the ids that were skipped.
+                    while expected < id:
+                        f.write(_RECORD.pack(record[0], 0, 0))
+                        expected += 1
+                    f.write(_RECORD.pack(*record))
+                    expected += 1
+            
+            self._segment = segment
+            self._map_index()
+        
+        return len(records)
+    
+    def get(self, id):
+        """
+        @brief Reads a message.
+        
+        @var id: The id of the message.
+        @return (id, contact, time, sender, message),
+        None if the message isn't in the Archive.
+        """
+        with self._lock:
+            return self._get(id)
+    
+    def _get(self, id):
+        """
+        @brief Reads a message (see get)
+        @note The lock must be held.
+        """
+        if id < self._first or id > self.get_last():
+            return None
+        
+        time, block, position = self._index[id - self._first]
+        if block == 0:
+            return None
+        
+        data = self._read_block(block)
+        length = _LENGTH.unpack_from(data, position)[0]
+        position += _LENGTH.size
+        contact, sender, message = \
+            data[position:position + length].split("\0", 2)
+        return (id, contact, time, sender, message)
+    
+    def _read_block(self, block):
+        """
+        @brief Reads and uncompresses a block of a segment.
+        
+        @var block: The number of the block.
+        @return The uncompressed block.
+        """
+        if block in self._blocks:
+            data = self._blocks.pop(block)
+        else:
+            segment, start, size = self._table[block - 1]
+            if segment not in self._segments:
+                self._segments[segment] = open(
+                    os.path.join(self._directory, "%06d.seg" % segment), "rb")
+            f = self._segments[segment]
+            f.seek(start)
+            data = zlib.decompress(f.read(size))
+            
+            if len(self._blocks) >= _CACHED_BLOCKS:
+                self._blocks.popitem(last=False)
+        
+        self._blocks[block] = data
+        return data
+    
+    def count(self, contact):
+        """
+        @brief Counts the messages of a contact.
+        
+        @var contact: The email of the contact.
+        @return The number of messages.
+        """
+        with self._lock:
+            return self._count(self._ids(contact))
+    
+    def _count(self, ids):
+        """
+        @brief Counts the ids of a contact that are in the index.
+        @note The lock must be held.
+        """
+        count = len(ids)
+        while count > 0 and ids[count - 1] > self.get_last():
+            count -= 1
+        return count
+    
+    def message(self, contact, n):
+        """
+        @brief Reads a message of a contact by its place in the
+        conversation.
+        
+        @var contact: The email of the contact.
+        @var n: Which message, 0 is the oldest.
+        @return (id, contact, time, sender, message), None if there is no
+        such message.
+        """
+        with self._lock:
+            ids = self._ids(contact)
+            if n < 0 or n >= self._count(ids):
+                return None
+            return self._get(ids[n])
+    
+    def page(self, contact, before = None, count = globals.HISTORY_PAGE):
+        """
+        @brief Reads a page of the messages of a contact (like History.page)
+        
+        @var contact: The email of the contact.
+        @var before: Only messages older than the message with this id are
+        read, None reads the newest ones.
+        @var count: The most messages read.
+        @return A list of (id, time, sender, message), oldest first.
+        """
+        with self._lock:
+            ids = self._ids(contact)
+            end = self._count(ids)
+            if before != None:
+                end = min(end, bisect.bisect_left(_Sequence(ids, end),
+                                                  before))
+            
+            rows = []
+            for i in range(max(0, end - count), end):
+                id, contact, time, sender, message = self._get(ids[i])
+                rows.append((id, time, sender, message))
+            return rows
+    
+    def between(self, start, end, contact = None):
+        """
+        @brief Reads the messages written in a time range.
+        
+        @var start: The earliest time (seconds since the epoch).
+        @var end: The latest time (not included).
+        @var contact: Only read the messages of this email,
+        None reads everyone's.
+        @return A list of (id, contact, time, sender, message), oldest
+        first.
+        """
+        with self._lock:
+            if contact == None:
+                count = len(self._index)
+                key = lambda i: self._index[i][0]
+                id = lambda i: self._first + i
+            else:
+                ids = self._ids(contact)
+                count = self._count(ids)
+                key = lambda i: self._index[ids[i] - self._first][0]
+                id = lambda i: ids[i]
+            
+            times = _Sequence(key, count)
+            rows = []
+            for i in range(bisect.bisect_left(times, start),
+                           bisect.bisect_left(times, end)):
+                row = self._get(id(i))
+                if row != None:
+                    rows.append(row)
+            return rows
+    
+    def close(self):
+        """
+        @brief Closes every file of the Archive.
+        """
+        with self._lock:
+            self._index.close()
+            self._table.close()
+            for ids in self._contacts.values():
+                ids.close()
+            for f in self._segments.values():
+                f.close()
+            self._contacts = {}
+            self._segments = {}
+            self._blocks.clear()
+
+class _Sequence:
+    """
+    @brief Something bisect can search, made of a function (or list) and a
+    length.
+    """
+    
+    def __init__(self, values, length):
+        """
+        @var values: A function of the index, or anything indexable.
+        @var length: How many values there are.
+        """
+        self._values = values
+        self._length = length
+    
+    def __len__(self):
+        return self._length
+    
+    def __getitem__(self, index):
+        if callable(self._values):
+            return self._values(index)
+        return self._values[index]
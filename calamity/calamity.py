@@ -13,6 +13,7 @@ import gui
 import network
 
 import globals
+import history
 from member import Member
 from group import Group
 from conversation import Conversation
@@ -28,7 +29,10 @@ class CalamityApp:
         @brief Constructs the Calamity application
         """
         
-        self._app = gui.App()
+        self._app = gui.backend.app()
+        gui.scheduler.get().set_app(self._app)
+        
+        history.use(history.History(globals.HISTORY_FILE))
         
         self._window = gui.Window("Calamity", self._app)
         
@@ -79,6 +83,14 @@ class CalamityApp:
         
         self._groups = []
         
+        # email -> list of Members with that email (one per Group)
+        self._contacts = {}
+        
+        # email -> status changes waiting to be applied
+        self._presence = {}
+        self._presence_scheduled = False
+        self._presence_interval = globals.PRESENCE_INTERVAL
+        
         self.add(Group("Default"))
                 
         self._window.add(menubar)
@@ -113,6 +125,104 @@ class CalamityApp:
 
         self._groups.append(item)
         self._layer.add(item.get_layer())
+        item.set_app(self)
+        
+    def track(self, member):
+        """
+        @brief Keeps track of a Member that was added to one of the Groups, 
+        so it can be found by its email.
+        
+        @var member: The Member that was added.
+        """
+        self._contacts.setdefault(member.get_email(), []).append(member)
+        
+    def untrack(self, member):
+        """
+        @brief Stops keeping track of a Member that was removed from 
+        one of the Groups.
+        
+        @var member: The Member that was removed.
+        """
+        members = self._contacts.get(member.get_email(), [])
+        if member in members:
+            members.remove(member)
+        if len(members) == 0:
+            self._contacts.pop(member.get_email(), None)
+            
+    def set_status(self, email, status):
+        """
+        @brief Changes the status of every Member with an email. 
+        Changes are buffered and applied together, so a burst of them 
+        only re-sorts each Group once.
+        
+        @var email: The email of the Members.
+        @var status: New status (online, offline, away, busy)
+        """
+        self._presence[email] = status
+        
+        if not self._presence_scheduled:
+            self._presence_scheduled = True
+            if self._presence_interval > 0:
+                self._app.after(self._presence_interval, self.apply_status)
+            else:
+                self._app.after_idle(self.apply_status)
+                
+    def set_status_interval(self, interval):
+        """
+        @brief Sets how often buffered status changes are applied.
+        
+        @var interval: Time between batches in milliseconds 
+        (0 means as soon as the main loop is idle).
+        """
+        self._presence_interval = interval
+        
+    def apply_status(self):
+        """
+        @brief Applies every buffered status change, then re-lays out the 
+        rows that moved in each Group once.
+        """
+        presence = self._presence
+        self._presence = {}
+        self._presence_scheduled = False
+        
+        # id(group) -> [group, first row moved, last row moved]
+        moved = {}
+        for email, status in presence.items():
+            for member in self.find(email):
+                if member.get_status() != status:
+                    member.set_status(status)
+                    group = member.get_group()
+                    old, new = group.update(member)
+                    if old == new:
+                        continue
+                        
+                    rows = moved.setdefault(id(group), [group, old, old])
+                    rows[1] = min(rows[1], old, new)
+                    rows[2] = max(rows[2], old, new)
+                    
+        for group, first, last in moved.values():
+            group.reorder(first, last)
+            
+    def find(self, email):
+        """
+        @brief Finds every Member with an email, no matter what Group 
+        they are in.
+        
+        @var email: The email of the Members to search for.
+        @return A list of the Members (empty if there are none).
+        """
+        return self._contacts.get(email, [])
+        
+    def receive(self, email, message):
+        """
+        @brief Shows a message someone sent.
+        
+        @var email: The email of who sent it.
+        @var message: What they said.
+        """
+        members = self.find(email)
+        if len(members) > 0:
+            members[0].receive(message)
         
         
     def tab(self, event):
@@ -164,6 +274,16 @@ class CalamityApp:
         
         self._app.mainloop()
         
+        # Leave every switchboard that is still open.
+        if network.msn.switchboard.get() != None:
+            network.msn.switchboard.get().close()
+            network.msn.switchboard.use(None)
+        
+        # Write whatever history is still queued before the app exits.
+        if history.get() != None:
+            history.get().close()
+            history.use(None)
+        
     def close(self):
         """
         @brief Closes the Calamity window.
@@ -211,12 +331,15 @@ class CalamityApp:
             
     def get_updates(self):
         """
-        @brief Get updates from the server, calls itself every second to check.
-        @todo Perhaps threading this process instead to reduce busy waiting and 
-        delay, but I foresee to many issues at the moment
+        @brief Get updates from the server as soon as they arrive. 
+        The main loop watches the connection's sockets and only wakes up 
+        when one of them has something to read.
         """
+        self._connection.get_engine().set_watcher(self._app.add_reader, 
+                                                  self._app.remove_reader,
+                                                  self._app.after)
+        network.msn.switchboard.use(self._connection.get_switchboard())
         self._connection.listen()
-        self._app.after(1000, self.get_updates)
         
         
             
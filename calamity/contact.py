@@ -0,0 +1,72 @@
+"""
+@file Contact.py
+@date 10/18/2026
+@version 0.1
+
+@brief The implementation of the Contact class.
+
+A Contact is everything there is to know about another user, without any of
+the widgets used to draw them. Members draw themselves from their Contact,
+so sorting and comparing Members never has to ask the screen anything.
+"""
+
+import globals
+
+class Contact(object):
+    """
+    @brief The data behind a Member.
+    
+    @var email: Email address of the Contact.
+    @var nickname: The name of the Contact.
+    @var message: The quote after the Contact's name.
+    @var status: Status code of the Contact (see globals.STATUS_*).
+    @var key: What Contacts are sorted by, (status, nickname, email).
+    """
+    
+    __slots__ = ("email", "nickname", "message", "status", "key")
+    
+    def __init__(self, email, nickname = "", status = "offline", message = ""):
+        """
+        @brief Constructor of the Contact
+        
+        @param email: Email address of the Contact
+        @param nickname: The name of the Contact.
+        @param status: Current state of the Contact, either a status code or
+        its name (offline, online, away, busy).
+        @param message: The quote after the Contact's name
+        """
+        self.email = email
+        self.nickname = nickname
+        self.message = message
+        self.status = globals.STATUS_OFFLINE
+        self.key = None
+        self.set_status(status)
+    
+    def set_nickname(self, nickname):
+        """
+        @brief Sets the nickname of the Contact
+        
+        @param nickname: New nickname of the Contact
+        """
+        self.nickname = nickname
+        self.key = (self.status, nickname, self.email)
+    
+    def set_status(self, status):
+        """
+        @brief Sets the status of the Contact
+        
+        @param status: A status code or its name (offline, online, away, busy)
+        """
+        if not isinstance(status, int):
+            status = globals.STATUS_CODES[status]
+        
+        self.status = status
+        self.key = (status, self.nickname, self.email)
+    
+    def get_status(self):
+        """
+        @brief Gets the name of the status of the Contact
+        
+        @return string: offline, online, away, or busy.
+        """
+        return globals.STATUS_NAMES[self.status]
@@ -8,6 +8,10 @@
 """
 
 import gui
+import network
+
+import globals
+import history
 
 class Conversation:
     """
@@ -63,6 +67,19 @@ class Conversation:
         
         self._window.add(self._layer)
         
+        # History stuff, only a conversation with a single member has one.
+        self._history = history.get()
+        self._contact = None
+        if self._history != None and member != None and len(members) == 0:
+            self._contact = member.get_email()
+        
+        # id of the oldest message shown, 0 once there are no older ones
+        self._oldest = None
+        if self._contact != None:
+            self._load_older()
+            self._messages.show()
+            self._messages.set_top_command(self._scrolled_to_top)
+        
         # Member stuff
         self._members = []
         self.add(member)
@@ -74,6 +91,15 @@ class Conversation:
         self._window.bind(gui.globals.ENTER, self.send)
         #self.__send.bind(GUIglobals.CLICKED, self.send)
             
+    def set_close_command(self, procedure):
+        """
+        @brief When the user closes the conversation's window, the procedure 
+        will be called.
+        
+        @var procedure: A function or method that takes no arguments.
+        """
+        self._window.set_close_command(procedure)
+        
     def add(self, member):
         """
         @brief Adds a member to the conversation.
@@ -88,6 +114,86 @@ class Conversation:
         in the conversation.
         """
         
-        self._messages.append("Me: " + self._entry.get_message() + "\n")
+        message = self._entry.get_message()
+        self._record("Me", message)
+        self.show("Me: " + message + "\n")
         self._entry.set_message("")
-            
\ No newline at end of file
+        
+        # The switchboard session with these members is kept open, so only 
+        # the first message waits for it to be opened.
+        switchboard = network.msn.switchboard.get()
+        contacts = [m.get_email() for m in self._members if m != None]
+        if switchboard != None and len(contacts) > 0:
+            switchboard.send(contacts, message)
+        
+    def receive(self, member, message):
+        """
+        @brief Shows a message sent by another member of the conversation.
+        
+        @var member: The Member that sent it.
+        @var message: What they said.
+        """
+        self._record(member.get_nickname(), message)
+        self.show(member.get_nickname() + ": " + message + "\n")
+        
+    def show(self, line):
+        """
+        @brief Adds a line to the conversation. Lines are drawn with the 
+        next frame, so a burst of them doesn't hold up the main loop.
+        
+        @var line: The line (ending in a new line).
+        """
+        gui.scheduler.schedule(None, self._messages.append, line)
+            
+    def _record(self, sender, message):
+        """
+        @brief Adds a message to the history of the conversation (written 
+        later, away from the main loop).
+        
+        @var sender: Who said it.
+        @var message: What they said.
+        """
+        if self._contact != None:
+            self._history.record(self._contact, sender, message)
+    
+    def _load_older(self):
+        """
+        @brief Shows the page of history that comes before the oldest 
+        message shown. Stops once the MessageBox holds as many lines as it 
+        keeps, older messages are left in the history.
+        
+        @return True if there were older messages to show.
+        """
+        scrollback = self._messages.get_scrollback()
+        if (self._oldest == 0 or (scrollback > 0 and 
+            self._messages.get_line_count() >= scrollback)):
+            return False
+        
+        rows = self._history.page(self._contact, self._oldest, 
+                                  globals.HISTORY_PAGE)
+        if len(rows) == 0:
+            self._oldest = 0
+            return False
+        
+        self._oldest = rows[0][0]
+        text = "".join(["%s: %s\n" % (sender, message) 
+                        for id, time, sender, message in rows])
+        self._messages.append(text, to="top")
+        return True
+    
+    def _scrolled_to_top(self):
+        """
+        @brief Fetches the page before the oldest message shown with the 
+        next frame (once, however many times the MessageBox says so).
+        """
+        gui.scheduler.schedule((id(self), "older"), self._show_older)
+        
+    def _show_older(self):
+        """
+        @brief Shows the page before the oldest message shown, keeping the 
+        line that was at the top in view.
+        """
+        lines = self._messages.get_line_count()
+        if self._load_older():
+            self._messages.show("%d.0" % 
+                                (self._messages.get_line_count() - lines + 1))
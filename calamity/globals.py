@@ -7,6 +7,8 @@
 @brief This file holds all the global variables that many modules need
 """
 
+import os
+
 # Width of the Status icon
 MEMBER_STATUS_WIDTH = 2
 
@@ -22,6 +24,15 @@ MEMBER_WIDTH = MEMBER_STATUS_WIDTH + MEMBER_NAME_WIDTH + MEMBER_MESSAGE_WIDTH
 MEMBER_ODD_COLOR = "white"
 MEMBER_EVEN_COLOR = "darkgrey"
 
+# Status codes, in the order Members are sorted in
+STATUS_ONLINE = 0
+STATUS_AWAY = 1
+STATUS_BUSY = 2
+STATUS_OFFLINE = 3
+
+STATUS_NAMES = ["online", "away", "busy", "offline"]
+STATUS_CODES = dict([(name, code) for code, name in enumerate(STATUS_NAMES)])
+
 # Maximum characters for a message
 MAX_MESSEGE_LENGTH = 40
 
@@ -32,6 +43,22 @@ GROUP_ODD_COLOR = "black"
 GROUP_EVEN_COLOR = "darkgreen"
 GROUP_BORDER_WIDTH = 4
 
+# How many Members a Group draws at a time, 0 draws every Member.
+# Only the Members that fit are given widgets, which are reused as the 
+# Group is scrolled.
+GROUP_ROWS = 0
+
+# How many Members one turn of the mouse wheel scrolls by
+GROUP_WHEEL_ROWS = 3
+
+# Draw every Member of a Group on a single Canvas instead of giving each 
+# one widgets of its own.
+GROUP_CANVAS = False
+
+# Size of a Member's row on a Canvas, and of a character in it (in pixels)
+CANVAS_ROW_HEIGHT = 20
+CANVAS_CHAR_WIDTH = 7
+
 HIGHLIGHT_BORDER_WIDTH = 5
 HIGHLIGHT_BORDER_COLOR_EVEN = GROUP_ODD_COLOR
 HIGHLIGHT_BORDER_COLOR_ODD = GROUP_EVEN_COLOR
@@ -39,3 +66,38 @@ HIGHLIGHT_BORDER_COLOR_ODD = GROUP_EVEN_COLOR
 CONVERSATION_EVEN_COLOR = GROUP_EVEN_COLOR
 CONVERSATION_ODD_COLOR = GROUP_ODD_COLOR
 CONVERSATION_GROUP_COLOR = "darkgreen"
+
+# How often (in milliseconds) buffered presence changes are applied, 
+# 0 applies them as soon as the main loop is idle.
+PRESENCE_INTERVAL = 16
+
+# Where the history of every conversation is kept.
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".calamity", 
+                            "history.db")
+
+# How many messages are written to the history at a time (at most), and how
+# many are read into a Conversation at a time.
+HISTORY_BATCH = 500
+HISTORY_PAGE = 50
+
+# How long (in seconds) the history waits before trying again to write
+# messages it couldn't write (i.e. the disk was full).
+HISTORY_RETRY = 1.0
+
+# The most messages a search of the history finds.
+SEARCH_RESULTS = 20
+
+# How many of the newest messages that match a search are ranked.
+SEARCH_WINDOW = 1000
+# How many of those can be in the history's archive, where each is read
+# from a compressed block.
+SEARCH_ARCHIVED_WINDOW = 250
+
+# The history database is rolled into a compressed segment of its archive
+# once its messages take up this many bytes, or the oldest of them is this
+# many seconds old.
+HISTORY_SEGMENT_SIZE = 16 * 1024 * 1024
+HISTORY_SEGMENT_AGE = 7 * 24 * 60 * 60
+
+# How many bytes of messages are compressed together in a segment.
+HISTORY_BLOCK = 8 * 1024
@@ -8,6 +8,14 @@
 
 A Group is set of "like" Members specified by the user. Members are organized
 first by  their status, then their nickname via descending alphabetical.
+The Group keeps a sorted list of every Member's key next to the Members, so 
+finding where a Member goes is a single binary search that never has to 
+call into the Members themselves.
+
+A Group either gives every Member a Row of widgets of its own, or (when it 
+is given a number of rows) only draws that many Members at a time and hands 
+its few Rows from Member to Member as the list is scrolled, so a huge Group 
+costs no more widgets than a small one.
 
 @note TabSize and FontSize must be globally defined before this file 
 can be imported.
@@ -20,19 +28,24 @@ import gui
 
 import globals
 from member import Member
+from row import Row, CanvasRow
 
 class Group:
     """
     @brief A set of like Members
     """
     
-    def __init__(self, name, position = (0,0)):
+    def __init__(self, name, position = (0,0), rows = globals.GROUP_ROWS, 
+                 canvas = globals.GROUP_CANVAS):
         """
         @brief Constructor for the Group
         
         @param name: A string that represents the name of the Group.
         @param position: where the Group is relative to other Groups.
-        @todo change over to dictionaries for efficiency.
+        @param rows: How many Members are drawn at a time, 
+        0 draws every Member.
+        @param canvas: True/False Whether every Member is drawn on a single 
+        Canvas (rows is ignored if so).
         """
 
         self._layer = gui.Layer(pos=position)
@@ -47,6 +60,59 @@ class Group:
         
         self._members = []
         
+        # Sort keys of self._members, in the same order.
+        self._sorted_keys = []
+        
+        # email -> Member, and email -> the key it is sorted by
+        self._emails = {}
+        self._keys = {}
+        
+        self._app = None
+        
+        # How many on screen changes the last reorder made.
+        self._operations = 0
+        
+        # Rows shared by the Members when only some are drawn, 
+        # and the index of the Member drawn by the first one.
+        self._pool = []
+        self._top = 0
+        
+        self._canvas = None
+        
+        # The clicks (and scrolls) of every Row are bound once, to the tag.
+        self._tag = gui.Tag()
+        self._tag.bind(gui.globals.CLICKED, self._row_clicked)
+        self._tag.bind(gui.globals.DBL_CLICKED, self._row_double_clicked)
+        
+        if canvas:
+            self._canvas = gui.Canvas(pos=(1,0), 
+                       width=globals.MEMBER_WIDTH * globals.CANVAS_CHAR_WIDTH)
+            self._canvas.bind(gui.globals.CLICKED, self._canvas_clicked)
+            self._canvas.bind(gui.globals.DBL_CLICKED, 
+                              self._canvas_double_clicked)
+            self._layer.add(self._canvas)
+            
+        elif rows > 0:
+            self._list = gui.Layer(pos=(1,0))
+            
+            for event in [gui.globals.WHEEL, 
+                          gui.globals.WHEEL_UP, 
+                          gui.globals.WHEEL_DOWN]:
+                self._tag.bind(event, self._row_scrolled)
+                
+            for i in range(rows):
+                row = Row(pooled=True, tag=self._tag)
+                row.get_layer().set_position((i,0))
+                row.detach()
+                self._pool.append(row)
+                self._list.add(row.get_layer())
+                
+            self._scroll = gui.ScrollBar(pos=(1,1), command=self._scrolled)
+            self._scroll.set_growth(height=True, width=False)
+            
+            self._layer.add(self._list)
+            self._layer.add(self._scroll)
+        
     def get_blend(self):
         """
         @brief Gets the blended color of the background
@@ -63,6 +129,17 @@ class Group:
         """
         return self._layer
         
+    def set_app(self, app):
+        """
+        @brief Sets the app the Group is in, the app is told about every 
+        Member that is added to or removed from the Group.
+        
+        @var app: The CalamityApp the Group was added to.
+        """
+        self._app = app
+        for member in self._members:
+            app.track(member)
+        
     def add(self, item):
         """
         @brief Adds a Member to the Group in the proper position
@@ -70,27 +147,295 @@ class Group:
         @param item: The Member to be inserted
         """
 
-        position = bisect.bisect(self._members, item)
-        bisect.insort(self._members, item)
+        key = item.get_key()
+        position = bisect.bisect(self._sorted_keys, key)
+        self._sorted_keys.insert(position, key)
+        self._members.insert(position, item)
+        self._emails[item.get_email()] = item
+        self._keys[item.get_email()] = key
         item.set_group(self)
         self.reorder(position)
-        self._layer.add(item.get_layer())
         
-    def reorder(self, startFrom=0):
+        if self._canvas != None:
+            CanvasRow(self._canvas).attach(item)
+            self._canvas.set_height(len(self) * globals.CANVAS_ROW_HEIGHT)
+        elif len(self._pool) == 0:
+            Row(tag=self._tag).attach(item)
+            self._layer.add(item.get_layer())
+        
+        if self._app != None:
+            self._app.track(item)
+            
+    def remove(self, item):
+        """
+        @brief Removes a Member from the Group.
+        
+        @param item: The Member to be removed.
+        """
+        position = self.find(item.get_email())
+        if position == -1:
+            return
+            
+        del self._members[position]
+        del self._sorted_keys[position]
+        del self._emails[item.get_email()]
+        del self._keys[item.get_email()]
+        
+        row = item.get_row()
+        if row != None:
+            if row.get_layer() != None and len(self._pool) == 0:
+                self._layer.remove(row.get_layer())
+                row.untag(self._tag)
+            row.detach()
+            
+        if self._canvas != None:
+            self._canvas.set_height(len(self) * globals.CANVAS_ROW_HEIGHT)
+        
+        if item in Member.focus:
+            item.select(False)
+            
+        self.reorder(position)
+        
+        if self._app != None:
+            self._app.untrack(item)
+        
+    def update(self, item):
+        """
+        @brief Moves a Member whose key (status or nickname) changed to its 
+        new position. Only the list is changed, call reorder to move the 
+        Members on screen.
+        
+        @param item: The Member that changed.
+        @return A tuple of (old position, new position), 
+        (-1, -1) if the Member is not in the Group.
         """
-        @brief Sort the array from StartFrom, to the end.
+        email = item.get_email()
+        if self._emails.get(email) is not item:
+            return (-1, -1)
+            
+        old = bisect.bisect_left(self._sorted_keys, self._keys[email])
+        key = item.get_key()
+        if key == self._keys[email]:
+            return (old, old)
+            
+        del self._sorted_keys[old]
+        del self._members[old]
+        
+        new = bisect.bisect(self._sorted_keys, key)
+        self._sorted_keys.insert(new, key)
+        self._members.insert(new, item)
+        self._keys[email] = key
+        
+        return (old, new)
+        
+    def move(self, item):
+        """
+        @brief Moves a Member whose key changed to its new position, 
+        both in the list and on screen.
+        
+        @param item: The Member that changed.
+        @return A tuple of (old position, new position).
+        """
+        old, new = self.update(item)
+        if old != new:
+            self.reorder(min(old, new), max(old, new))
+        else:
+            self._operations = 0
+        return (old, new)
+        
+    def reorder(self, startFrom=0, stopAt=-1):
+        """
+        @brief Sort the array from StartFrom, to StopAt. 
+        Only Members that changed row, changed between an odd and even row, 
+        or have the wrong border color are changed on screen.
         
         @param startFrom: Where to start from when sorting (inclusive)
+        @param stopAt: Where to stop sorting (inclusive), -1 means the end.
         """
+        if len(self._pool) > 0:
+            # Only the Members in view are drawn, so only they need placing.
+            self._operations = self._render()
+            return
+            
+        if stopAt == -1:
+            stopAt = len(self._members) - 1
+            
+        operations = 0
         i = startFrom
-        for member in self._members[startFrom:]:
+        for member in self._members[startFrom:stopAt+1]:
+            operations += self._place(member, i)
+            i+=1
+            
+        self._operations = operations
+        
+    def _place(self, member, i):
+        """
+        @brief Moves and colors a Member for being at an index, skipping 
+        whatever is already right.
+        
+        @var member: The Member to place.
+        @var i: The index of the Member.
+        @return How many changes were made.
+        """
+        operations = 0
+        
+        if member.get_position() != (i+1, 0):
             member.set_postition((i+1, 0))
+            operations += 1
+            
+        if member.get_border_color() != self._highlight_color:
             member.set_border_color(self._highlight_color)
-            if i%2 == 1:
-                member.set_background_color(globals.MEMBER_ODD_COLOR)
-            else:
-                member.set_background_color(globals.MEMBER_EVEN_COLOR)
-            i+=1
+            operations += 1
+            
+        if i%2 == 1:
+            color = globals.MEMBER_ODD_COLOR
+        else:
+            color = globals.MEMBER_EVEN_COLOR
+            
+        if member.get_background_color() != color:
+            member.set_background_color(color)
+            operations += 1
+            
+        return operations
+        
+    def _render(self):
+        """
+        @brief Hands the shared Rows to the Members that are scrolled into 
+        view, and hides the Rows left over.
+        
+        @return How many changes were made.
+        """
+        count = len(self._members)
+        operations = 0
+        
+        # Keep the view full when Members are removed from the bottom.
+        self._top = max(0, min(self._top, count - len(self._pool)))
+        
+        for i in range(len(self._pool)):
+            row = self._pool[i]
+            if self._top + i < count:
+                member = self._members[self._top + i]
+                operations += self._place(member, self._top + i)
+                if row.get_member() is not member:
+                    row.attach(member)
+                    operations += 1
+            elif row.get_member() != None:
+                row.detach()
+                operations += 1
+                
+        if count > 0:
+            last = min(count, self._top + len(self._pool))
+            self._scroll.set_view(float(self._top)/count, float(last)/count)
+        else:
+            self._scroll.set_view(0.0, 1.0)
+            
+        return operations
+            
+    def scroll_to(self, top):
+        """
+        @brief Scrolls so a Member is drawn at the top of the Group.
+        
+        @var top: The index of the Member to draw at the top.
+        """
+        if len(self._pool) == 0:
+            return
+            
+        top = max(0, min(top, len(self._members) - len(self._pool)))
+        if top != self._top:
+            self._top = top
+            self._render()
+            
+    def show(self, index):
+        """
+        @brief Scrolls (as little as possible) so a Member is drawn.
+        
+        @var index: The index of the Member to be drawn.
+        """
+        if index < self._top:
+            self.scroll_to(index)
+        elif index >= self._top + len(self._pool):
+            self.scroll_to(index - len(self._pool) + 1)
+            
+    def _scrolled(self, *args):
+        """
+        @brief Called by the ScrollBar when the user moves it.
+        """
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1])*len(self._members)))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= len(self._pool)
+            self.scroll_to(self._top + amount)
+            
+    def _row_clicked(self, event, row):
+        """
+        @brief Selects the Member drawn by the Row that was clicked.
+        """
+        row.clicked(event)
+        
+    def _row_double_clicked(self, event, row):
+        """
+        @brief Starts a conversation with the Member drawn by the Row that 
+        was double clicked.
+        """
+        row.start_conversation(event)
+        
+    def _row_scrolled(self, event, row):
+        """
+        @brief Scrolls the Group with the mouse wheel over one of its Rows.
+        """
+        self.wheel(event)
+        
+    def _canvas_member(self, event):
+        """
+        @brief Finds the Member drawn where the Canvas was clicked.
+        
+        @var event: The mouse event.
+        @return The Member, None if no Member was clicked.
+        """
+        index = int(event.y) / globals.CANVAS_ROW_HEIGHT
+        if 0 <= index < len(self._members):
+            return self._members[index]
+        return None
+        
+    def _canvas_clicked(self, event):
+        """
+        @brief Selects the Member that was clicked on the Canvas.
+        """
+        member = self._canvas_member(event)
+        if member != None:
+            member.clicked(event)
+            
+    def _canvas_double_clicked(self, event):
+        """
+        @brief Starts a conversation with the Member that was 
+        double clicked on the Canvas.
+        """
+        member = self._canvas_member(event)
+        if member != None:
+            member.start_conversation(event)
+            
+    def wheel(self, event):
+        """
+        @brief Scrolls the Group with the mouse wheel.
+        
+        @var event: The mouse wheel event.
+        """
+        if event.num == 4 or (event.num != 5 and event.delta > 0):
+            self.scroll_to(self._top - globals.GROUP_WHEEL_ROWS)
+        else:
+            self.scroll_to(self._top + globals.GROUP_WHEEL_ROWS)
+        
+    def get_operations(self):
+        """
+        @brief How many on screen changes (positions, background and border 
+        colors) the last reorder made. Handy for making sure a change 
+        doesn't move more than it has to.
+        
+        @return The number of changes.
+        """
+        return self._operations
         
 
                 
@@ -149,18 +494,19 @@ class Group:
         if len(self) == 0:
             return False
         
-        try:
-            i = self._members.index(Member.focus[0])
-        except:
-            i = -1
+        i = -1
+        if len(Member.focus) > 0:
+            email = Member.focus[0].get_email()
+            if self._emails.get(email) is Member.focus[0]:
+                i = self.find(email)
             
         if direction == gui.globals.UP:
             
             if i == -1:
-                self._members[-1].clicked("")
-                return True
+                i = len(self)
             
-            if self._members[0] != Member.focus[0]:
+            if i > 0:
+                self.show(i-1)
                 self._members[i-1].clicked("")
                 return True
             else:
@@ -168,11 +514,8 @@ class Group:
             
         elif direction == gui.globals.DOWN:
             
-            if i == -1:
-                self._members[0].clicked("")
-                return True
-            
-            if self._members[-1] != Member.focus[0]:
+            if i < len(self) - 1:
+                self.show(i+1)
                 self._members[i+1].clicked("")
                 return True
             else:
@@ -185,18 +528,27 @@ class Group:
         @var email: The email of the Member to search for.
         @return The index of the member, -1 if not found. 
         """
-        index = 0
-        for member in self._members:
-            if member.get_email() == email:
-                return index
-            index+=1
-        return -1
+        if email not in self._keys:
+            return -1
+        return bisect.bisect_left(self._sorted_keys, self._keys[email])
+        
+    def get(self, email):
+        """
+        @brief Returns the Member with the email of the parameter
+        
+        @var email: The email of the Member to search for.
+        @return The Member, None if not found.
+        """
+        return self._emails.get(email)
     
     def sort(self):
         """
         @brief Sorts the members list.
         """
-        self._members.sort()
+        self._members.sort(key=Member.get_key)
+        self._sorted_keys = [member.get_key() for member in self._members]
+        for member in self._members:
+            self._keys[member.get_email()] = member.get_key()
         self.reorder()
                 
     def __getitem__(self, index):
@@ -0,0 +1,604 @@
+"""
+@file History.py
+@date 10/18/2026
+@version 0.1
+
+@brief The implementation of the History class.
+
+Every message sent or received is kept in a SQLite database, so a
+Conversation can show what was said the last time it was open. Messages are
+written by a thread of their own in batches, so recording one never waits
+on the disk, and they are read a page at a time, newest first, so opening a
+Conversation with a long history only reads what is shown.
+
+Messages are also added to a full-text index (SQLite's FTS5) as they are
+written, so every conversation can be searched without reading through it.
+
+Once the messages in the database take up too much room, or the oldest of
+them is too old, the writer rolls them into a compressed segment of an
+Archive. Reading and searching go through both, so it makes no difference
+where a message is.
+"""
+
+import os
+import Queue
+import re
+import sqlite3
+import threading
+import time
+
+import archive
+import globals
+
+# Queued instead of a message to have the writer index every message that
+# was written before there was an index.
+_REBUILD = "rebuild"
+
+# A word, as near as the index's tokenizer (unicode61) splits them.
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# How much repeating a word and a message's length count when ranking.
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+# Put around the words that matched in the snippets search returns.
+MATCH_START = "["
+MATCH_END = "]"
+
+class History:
+    """
+    @brief An append-only store of every message, by the email of the
+    contact it was sent to or received from.
+    """
+    
+    def __init__(self, path, batch = globals.HISTORY_BATCH, 
+                 segment_size = globals.HISTORY_SEGMENT_SIZE, 
+                 segment_age = globals.HISTORY_SEGMENT_AGE):
+        """
+        @brief Opens (or creates) the store and starts its writer.
+        
+        @var path: The file the messages are kept in, the Archive is kept
+        next to it (history.db has history-archive).
+        @var batch: The most messages written in one transaction.
+        @var segment_size: How many bytes of messages the database holds 
+        before they are rolled into the Archive.
+        @var segment_age: How old (in seconds) the oldest message in the
+        database can get before they are rolled into the Archive.
+        """
+        self._path = path
+        self._batch = batch
+        self._segment_size = segment_size
+        self._segment_age = segment_age
+        
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        
+        self._archive = archive.Archive(os.path.splitext(path)[0] + 
+                                        "-archive")
+        
+        # Reads are made on the main loop's thread, writes on the writer's,
+        # each thread needs a connection of its own.
+        self._reader = self._connect()
+        self._reader.execute("CREATE TABLE IF NOT EXISTS messages ("
+                             "id INTEGER PRIMARY KEY, "
+                             "contact TEXT NOT NULL, "
+                             "time REAL NOT NULL, "
+                             "sender TEXT NOT NULL, "
+                             "message TEXT NOT NULL)")
+        self._reader.execute("CREATE INDEX IF NOT EXISTS messages_contact "
+                             "ON messages (contact, id)")
+        created = self._create_index()
+        self._reader.commit()
+        
+        self._queue = Queue.Queue()
+        self._written = 0
+        
+        # What went wrong the last time the writer failed, and how many
+        # messages it is holding on to until it can write them.
+        self._error = None
+        self._unwritten = 0
+        
+        if created:
+            self._queue.put(_REBUILD)
+        
+        self._writer = threading.Thread(target=self._write)
+        self._writer.daemon = True
+        self._writer.start()
+    
+    def _connect(self):
+        """
+        @brief Opens a connection to the store.
+        
+        @return The connection, in write-ahead logging mode so reading
+        doesn't wait on the writer (or the writer on reading).
+        """
+        connection = sqlite3.connect(self._path)
+        # Messages are kept as the bytes they arrived as.
+        connection.text_factory = str
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+    
+    def _create_index(self):
+        """
+        @brief Makes the full-text index of the messages if there isn't one.
+        
+        The index only keeps the words, the text is read from the messages
+        table through a view that also gives the contact as a single word 
+        (its hex), so a search of one conversation is narrowed down by the 
+        index instead of by reading every match.
+        
+        @return True if the index was just made (and is still empty).
+        """
+        self._indexed = self._reader.execute("SELECT COUNT(*) "
+                                             "FROM sqlite_master WHERE "
+                                             "name = 'messages_text'"
+                                             ).fetchone()[0] > 0
+        if self._indexed:
+            return False
+        
+        try:
+            self._reader.execute("CREATE VIRTUAL TABLE messages_text "
+                                 "USING fts5(message, contact, "
+                                 "content='messages_words', "
+                                 "content_rowid='id')")
+        except sqlite3.OperationalError:
+            # SQLite was built without FTS5, search reads every message.
+            return False
+        
+        self._reader.execute("CREATE VIEW IF NOT EXISTS messages_words AS "
+                             "SELECT id, message, hex(contact) AS contact "
+                             "FROM messages")
+        # Indexes each message in the same transaction it is written in.
+        self._reader.execute("CREATE TRIGGER messages_indexed "
+                             "AFTER INSERT ON messages BEGIN "
+                             "INSERT INTO messages_text "
+                             "(rowid, message, contact) VALUES "
+                             "(new.id, new.message, hex(new.contact)); END")
+        self._indexed = True
+        return True
+    
+    def get_archive(self):
+        """
+        @brief Gets the Archive that old messages are rolled into.
+        
+        @return The Archive.
+        """
+        return self._archive
+    
+    def get_path(self):
+        """
+        @brief Gets the file the messages are kept in.
+        
+        @return The path of the file.
+        """
+        return self._path
+    
+    def record(self, contact, sender, message, when = None):
+        """
+        @brief Queues a message to be written, returns right away.
+        
+        @var contact: The email of the contact the conversation is with.
+        @var sender: Who said it (i.e. "Me" or a nickname).
+        @var message: What they said.
+        @var when: When it was said (seconds since the epoch),
+        None for now.
+        """
+        if when == None:
+            when = time.time()
+        
+        self._queue.put((contact, when, sender, message))
+    
+    def page(self, contact, before = None, count = globals.HISTORY_PAGE):
+        """
+        @brief Reads a page of the messages of a contact.
+        
+        @var contact: The email of the contact.
+        @var before: Only messages older than the message with this id are
+        read, None reads the newest ones.
+        @var count: The most messages read.
+        @return A list of (id, time, sender, message), oldest first,
+        empty if there are no more.
+        """
+        if before == None:
+            rows = self._reader.execute("SELECT id, time, sender, message "
+                                        "FROM messages WHERE contact = ? "
+                                        "ORDER BY id DESC LIMIT ?",
+                                        (contact, count))
+        else:
+            rows = self._reader.execute("SELECT id, time, sender, message "
+                                        "FROM messages WHERE contact = ? "
+                                        "AND id < ? ORDER BY id DESC LIMIT ?",
+                                        (contact, before, count))
+        rows = rows.fetchall()
+        rows.reverse()
+        
+        # The rest of the page is in the Archive. A roll adds messages to 
+        # the Archive before it takes them out of the database, so every 
+        # message is in one or the other.
+        if len(rows) < count:
+            if len(rows) > 0:
+                before = rows[0][0]
+            rows = self._archive.page(contact, before, count - len(rows)) + rows
+        return rows
+    
+    def search(self, query, contact = None, count = globals.SEARCH_RESULTS,
+               window = globals.SEARCH_WINDOW):
+        """
+        @brief Finds the messages that have every word of a query.
+        
+        @var query: The words to look for (i.e. "dinner friday").
+        @var contact: Only search the messages of this email, 
+        None searches every conversation.
+        @var count: The most messages found.
+        @var window: Only the newest this many messages that match are 
+        ranked, so a word that is in most messages takes about as long to 
+        search for as one that is in a few.
+        @return A list of (id, contact, time, sender, snippet), best match 
+        first, where snippet is the part of the message around the words, 
+        marked with MATCH_START and MATCH_END. Messages that were rolled 
+        into the Archive are found too.
+        """
+        words = query.split()
+        if len(words) == 0:
+            return []
+        
+        if not self._indexed:
+            return self._scan(words, contact, count)
+        
+        # Each word is quoted, so nothing typed is taken as an operator.
+        match = " AND ".join(['message : "%s"' % word.replace('"', '""') 
+                              for word in words])
+        if contact != None:
+            match = 'contact : "%s" AND %s' % (contact.encode("hex"), match)
+        
+        # Reading the newest matches only takes the end of each word's list 
+        # of messages. They are ranked here rather than with FTS5's bm25, 
+        # which counts every message each word is in before it can rank any.
+        # Messages that were rolled into the Archive stay in the index, 
+        # they are read from there.
+        rows = self._reader.execute("SELECT messages_text.rowid, m.contact, "
+                                    "m.time, m.sender, m.message "
+                                    "FROM messages_text "
+                                    "LEFT JOIN messages AS m "
+                                    "ON m.id = messages_text.rowid "
+                                    "WHERE messages_text MATCH ? "
+                                    "ORDER BY messages_text.rowid DESC "
+                                    "LIMIT ?", (match, window)).fetchall()
+        found = []
+        archived = 0
+        for row in rows:
+            if row[1] == None:
+                # This message, and every older one, is in the Archive where
+                # each costs a block read, so fewer of them are ranked.
+                if archived == globals.SEARCH_ARCHIVED_WINDOW:
+                    break
+                archived += 1
+                row = self._archive.get(row[0])
+                if row == None:
+                    continue
+            found.append(row)
+        
+        return [(id, contact, time, sender, _snippet(message, words)) 
+                for id, contact, time, sender, message 
+                in _rank(found, words)[:count]]
+    
+    def _scan(self, words, contact, count):
+        """
+        @brief Finds the messages that have every word of a query by reading
+        them all, when there is no full-text index (see search).
+        
+        @return A list of (id, contact, time, sender, snippet), 
+        newest first (only of the messages in the database).
+        """
+        sql = ("SELECT id, contact, time, sender, message FROM messages "
+               "WHERE " + " AND ".join(["message LIKE ?"] * len(words)))
+        arguments = ["%%%s%%" % word for word in words]
+        
+        if contact != None:
+            sql += " AND contact = ?"
+            arguments.append(contact)
+        
+        arguments.append(count)
+        rows = self._reader.execute(sql + " ORDER BY id DESC LIMIT ?", 
+                                    arguments)
+        return [(id, contact, time, sender, _snippet(message, words)) 
+                for id, contact, time, sender, message in rows]
+    
+    def count(self, contact):
+        """
+        @brief Counts the (written) messages of a contact.
+        
+        @var contact: The email of the contact.
+        @return The number of messages.
+        """
+        # Messages being rolled are in both until the roll is done.
+        last = self._archive.get_last()
+        return self._archive.count(contact) + \
+               self._reader.execute("SELECT COUNT(*) FROM messages "
+                                    "WHERE contact = ? AND id > ?",
+                                    (contact, last)).fetchone()[0]
+    
+    def pending(self):
+        """
+        @brief How many messages are waiting to be written.
+        
+        @return The number of queued messages.
+        """
+        return self._queue.qsize()
+    
+    def get_written(self):
+        """
+        @brief How many messages have been written since the store was
+        opened.
+        
+        @return The number of messages.
+        """
+        return self._written
+    
+    def get_unwritten(self):
+        """
+        @brief How many messages the writer couldn't write, it keeps them
+        and tries again every globals.HISTORY_RETRY seconds.
+        
+        @return The number of messages.
+        """
+        return self._unwritten
+    
+    def get_error(self):
+        """
+        @brief Gets what went wrong the last time the writer failed.
+        
+        @return The exception (a sqlite3.Error or EnvironmentError), None
+        if the last write worked.
+        """
+        return self._error
+    
+    def flush(self):
+        """
+        @brief Waits until every queued message has been written (or tried).
+        @note Raises what went wrong if messages are still unwritten.
+        """
+        self._queue.join()
+        if self._unwritten > 0:
+            raise self._error
+    
+    def close(self):
+        """
+        @brief Writes whatever is queued, then stops the writer and closes
+        the store.
+        @note Raises what went wrong if messages couldn't be written.
+        """
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        
+        self._reader.close()
+        self._archive.close()
+        
+        if self._unwritten > 0:
+            raise self._error
+    
+    def _write(self):
+        """
+        @brief The writer, waits for messages and writes everything that has
+        been queued since the last batch in a single transaction.
+        @note Runs on a thread of its own.
+        """
+        connection = self._connect()
+        running = True
+        rebuild = False
+        # Messages of a batch that couldn't be written, they go first in
+        # the next one.
+        unwritten = []
+        
+        # How many bytes of messages the database holds and when the oldest
+        # of them was written.
+        size, oldest = self._held(connection)
+        
+        while running:
+            batch = []
+            try:
+                if len(unwritten) > 0:
+                    batch.append(self._queue.get(
+                        timeout=globals.HISTORY_RETRY))
+                else:
+                    batch.append(self._queue.get())
+            except Queue.Empty:
+                pass
+            
+            while len(batch) < self._batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Queue.Empty:
+                    break
+            
+            if None in batch:
+                running = False
+            if _REBUILD in batch:
+                rebuild = True
+            messages = unwritten + [message for message in batch 
+                                    if message != None and 
+                                    message != _REBUILD]
+            
+            try:
+                try:
+                    if rebuild:
+                        # Done first, the messages in the batch are indexed 
+                        # as they are written.
+                        connection.execute("INSERT INTO messages_text "
+                                           "(messages_text) "
+                                           "VALUES ('rebuild')")
+                    connection.executemany("INSERT INTO messages "
+                                           "(contact, time, sender, "
+                                           "message) VALUES (?, ?, ?, ?)", 
+                                           messages)
+                    connection.commit()
+                except (sqlite3.Error, EnvironmentError) as e:
+                    # Nothing is thrown away, the whole batch is tried 
+                    # again with the next one.
+                    connection.rollback()
+                    unwritten = messages
+                    self._unwritten = len(unwritten)
+                    self._error = e
+                    continue
+                
+                rebuild = False
+                unwritten = []
+                self._unwritten = 0
+                self._error = None
+                self._written += len(messages)
+                
+                for contact, when, sender, message in messages:
+                    size += len(message)
+                    if oldest == None or when < oldest:
+                        oldest = when
+                if size >= self._segment_size or (oldest != None and 
+                    time.time() - oldest >= self._segment_age):
+                    try:
+                        self._roll(connection)
+                        size, oldest = self._held(connection)
+                    except (sqlite3.Error, EnvironmentError) as e:
+                        # The messages are still in the database, the roll
+                        # is tried again after the next batch.
+                        connection.rollback()
+                        self._error = e
+            finally:
+                for message in batch:
+                    self._queue.task_done()
+        
+        connection.close()
+    
+    def _held(self, connection):
+        """
+        @brief Measures what the database holds.
+        @note Called by the writer.
+        
+        @var connection: The writer's connection.
+        @return A tuple of (bytes of messages, time of the oldest message),
+        the time is None if there are no messages.
+        """
+        return connection.execute("SELECT COALESCE(SUM(LENGTH(message)), 0), "
+                                  "MIN(time) FROM messages").fetchone()
+    
+    def _roll(self, connection):
+        """
+        @brief Moves every message but the newest (which SQLite needs to 
+        carry on from its id) out of the database into a new segment of the
+        Archive.
+        @note Called by the writer.
+        
+        @var connection: The writer's connection.
+        """
+        last = connection.execute("SELECT MAX(id) FROM messages").fetchone()[0]
+        rows = connection.execute("SELECT id, contact, time, sender, message "
+                                  "FROM messages WHERE id < ? ORDER BY id",
+                                  (last,)).fetchall()
+        if len(rows) == 0:
+            return
+        
+        # Written to the Archive first, so if anything goes wrong the 
+        # messages are still in the database, and the Archive skips what it
+        # already has the next time.
+        self._archive.append(rows)
+        connection.execute("DELETE FROM messages WHERE id < ?", (last,))
+        connection.commit()
+
+def _rank(rows, words):
+    """
+    @brief Orders messages by how well they match the words of a search 
+    (Okapi BM25, every word weighted the same since every message has them 
+    all), newest first when they match as well.
+    
+    @var rows: A list of (id, contact, time, sender, message).
+    @var words: The words searched for.
+    @return The rows, best match first.
+    """
+    words = _WORD.findall(" ".join(words).decode("utf-8", "replace").lower())
+    
+    messages = []
+    for row in rows:
+        tokens = _WORD.findall(row[4].decode("utf-8", "replace").lower())
+        messages.append((row, tokens))
+    
+    if len(messages) == 0:
+        return []
+    average = max(1.0, sum([len(tokens) for row, tokens in messages]) / 
+                       float(len(messages)))
+    
+    scores = []
+    for row, tokens in messages:
+        length = 1 - _BM25_B + _BM25_B * len(tokens) / average
+        score = 0.0
+        for word in words:
+            frequency = tokens.count(word)
+            score += (frequency * (_BM25_K1 + 1) / 
+                      (frequency + _BM25_K1 * length))
+        scores.append((-score, -row[0], row))
+    
+    scores.sort()
+    return [row for score, id, row in scores]
+
+def _snippet(message, words, size = 12):
+    """
+    @brief Cuts a message down to the words around the first word searched
+    for, marking every word searched for.
+    
+    @var message: The message.
+    @var words: The words searched for.
+    @var size: The most words kept.
+    @return The snippet, with "..." where the message was cut.
+    """
+    text = message.decode("utf-8", "replace")
+    words = set(_WORD.findall(" ".join(words).decode("utf-8", 
+                                                      "replace").lower()))
+    tokens = list(_WORD.finditer(text))
+    if len(tokens) == 0:
+        return message
+    
+    found = [i for i, token in enumerate(tokens) 
+             if token.group().lower() in words]
+    first = 0
+    if len(found) > 0:
+        first = found[0]
+    start = max(0, min(first - 2, len(tokens) - size))
+    end = min(len(tokens), start + size)
+    
+    parts = []
+    if start > 0:
+        parts.append("...")
+    position = tokens[start].start()
+    for token in tokens[start:end]:
+        parts.append(text[position:token.start()])
+        if token.group().lower() in words:
+            parts.append(MATCH_START + token.group() + MATCH_END)
+        else:
+            parts.append(token.group())
+        position = token.end()
+    if end < len(tokens):
+        parts.append("...")
+    else:
+        parts.append(text[position:])
+    
+    return "".join(parts).encode("utf-8")
+
+# The History every Conversation records to, None keeps no history.
+_history = None
+
+def use(history):
+    """
+    @brief Sets the History shared by every Conversation.
+    
+    @var history: The History, None keeps no history.
+    """
+    global _history
+    _history = history
+
+def get():
+    """
+    @brief Gets the History shared by every Conversation.
+    
+    @return The History, None if no history is kept.
+    """
+    return _history
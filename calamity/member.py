@@ -11,10 +11,17 @@
 
 
 from conversation import Conversation
+from contact import Contact
 import globals
 
 import gui
 
+# What the status TextBox shows for each status code, (text, color)
+STATUS_DISPLAY = {globals.STATUS_ONLINE: ("Y", "Green"), 
+                  globals.STATUS_AWAY: ("A", "Grey"), 
+                  globals.STATUS_BUSY: ("B", "Yellow"), 
+                  globals.STATUS_OFFLINE: ("N", "red")}
+
 class Member:
     """
     @brief A Member is a single user in one of your Groups 
@@ -40,62 +47,81 @@ class Member:
         #Used to keep track of the borderwidth when highlighted
         self._border_width = 0
         
-        self._layer = gui.Layer()
-        self._border = gui.Layer()
-        
-        self._border.blending(False)
-        self._border.set_background_color("black")
-        
-        self._layer.set_border_type("flat")
-        
-        self._email = email
-        self._status = gui.TextBox(text="N", 
-                                   pos=(0,0), 
-                                   width = globals.MEMBER_STATUS_WIDTH)
-        
-        self._nick = name
-        self._nickname = gui.TextBox(pos=(0,1), 
-                                     width = globals.MEMBER_NAME_WIDTH, 
-                                     justify="left")
-        self.set_nickname(name)
+        self._contact = Contact(email, name, status, message)
         
-        self._mess = message
-        self._message = gui.TextBox(pos=(0,2), 
-                                    width = globals.MEMBER_MESSAGE_WIDTH, 
-                                    justify="left")
-        self.set_message(message)
+        # What the Member looks like, drawn by its Row (if it has one)
+        self._position = (0,0)
+        self._background_color = ""
+        self._border_color = "black"
+        self._row = None
         
         self._selected = False
         
-        self.set_status(status)
-        
-        self._layer.add(self._status)
-        self._layer.add(self._nickname)
-        self._layer.add(self._message)
-        
-        self._border.add(self._layer)
-        
         self._group = ""
         self._window = None
         
         self._conv = []
         
-        #bindings
-        self._status.bind(gui.globals.CLICKED, self.clicked)
-        self._nickname.bind(gui.globals.CLICKED, self.clicked)
-        self._message.bind(gui.globals.CLICKED, self.clicked)
-        
-        self._status.bind(gui.globals.DBL_CLICKED, self.start_conversation)
-        self._nickname.bind(gui.globals.DBL_CLICKED, self.start_conversation)
-        self._message.bind(gui.globals.DBL_CLICKED, self.start_conversation)
-        
     def get_layer(self):
         """
         @breif Used to add the member to the screen
         
-        @return The drawable layer that can be added to the screen.
+        @return The drawable layer that can be added to the screen, 
+        None if the Member has no Row.
+        """
+        if self._row == None:
+            return None
+        return self._row.get_layer()
+        
+    def set_row(self, row):
+        """
+        @brief Sets the Row that draws this Member. 
+        @note Use Row.attach, which calls this.
+        
+        @var row: The Row drawing this Member, None if it isn't drawn.
+        """
+        self._row = row
+        
+    def get_row(self):
         """
-        return self._border
+        @brief Gets the Row that draws this Member.
+        
+        @return The Row, None if the Member isn't drawn.
+        """
+        return self._row
+        
+    def draw(self):
+        """
+        @brief Draws everything about the Member onto its Row.
+        """
+        if self._row == None:
+            return
+            
+        self._row.set_status(*STATUS_DISPLAY[self._contact.status])
+        self._row.set_nickname(self._shorten(self._contact.nickname, 
+                                             globals.MAX_NICKNAME_LENGTH))
+        self._row.set_message(self._shorten(self._contact.message, 
+                                            globals.MAX_MESSEGE_LENGTH))
+        self._row.set_position(self._position)
+        self._row.set_background_color(self._background_color)
+        self._row.set_border_color(self._border_color)
+        
+        if self._selected:
+            self._row.set_border_width(globals.HIGHLIGHT_BORDER_WIDTH)
+        else:
+            self._row.set_border_width(self._border_width)
+            
+    def _shorten(self, text, length):
+        """
+        @brief Shortens text that is too long to be displayed.
+        
+        @var text: The text to be displayed.
+        @var length: The most characters that can be displayed.
+        @return The text, ending in "..." if it was too long.
+        """
+        if len(text) > length:
+            return text[0:length-3]+"..."
+        return text
     
     def set_group(self, group):
         """
@@ -120,13 +146,18 @@ class Member:
         
         @param nickname: New nickname of the Member
         """
+        self._contact.set_nickname(nickname)
         
-        if len(nickname) > globals.MAX_NICKNAME_LENGTH:
-            nick = nickname[0:globals.MAX_NICKNAME_LENGTH-3]+"..."
-        else:
-            nick = nickname
+        if self._row != None:
+            gui.scheduler.schedule((id(self), "nickname"), self._draw_nickname)
             
-        self._nickname.set_message(nick)
+    def _draw_nickname(self):
+        """
+        @brief Draws the nickname onto the Row (once the frame is drawn).
+        """
+        if self._row != None:
+            self._row.set_nickname(self._shorten(self._contact.nickname, 
+                                                 globals.MAX_NICKNAME_LENGTH))
         
     def get_nickname(self):
         """
@@ -134,7 +165,7 @@ class Member:
         
         @return string: nickname of the Member
         """
-        return self._nick
+        return self._contact.nickname
         
     def set_status(self, status):
         """
@@ -148,21 +179,17 @@ class Member:
         
         @param status: New status of the Member
         """
-        if status == "offline":
-            self._status.set_message("N")
-            self._status.set_foreground_color("red")
-            
-        elif status == "online":
-            self._status.set_message("Y")
-            self._status.set_foreground_color("Green")
-            
-        elif status == "away":
-            self._status.set_message("A")
-            self._status.set_foreground_color("Grey")
+        self._contact.set_status(status)
+        
+        if self._row != None:
+            gui.scheduler.schedule((id(self), "status"), self._draw_status)
             
-        elif status == "busy":
-            self._status.set_message("B")
-            self._status.set_foreground_color("Yellow")
+    def _draw_status(self):
+        """
+        @brief Draws the status onto the Row (once the frame is drawn).
+        """
+        if self._row != None:
+            self._row.set_status(*STATUS_DISPLAY[self._contact.status])
         
     def get_status(self):
         """
@@ -170,19 +197,23 @@ class Member:
         
         @return string: Current status of the Member.
         """
-        status = self._status.get_message()
+        return self._contact.get_status()
         
-        if status == "N":
-            return "offline"
+    def get_contact(self):
+        """
+        @brief Gets the data the Member is drawn from.
         
-        elif status == "Y":
-            return "online"
+        @return The Contact of the Member.
+        """
+        return self._contact
         
-        elif status == "A":
-            return "away"
+    def get_key(self):
+        """
+        @brief Gets what Members are sorted by.
         
-        elif status == "B":
-            return "busy"
+        @return tuple: (status code, nickname, email)
+        """
+        return self._contact.key
         
     def set_message(self, message):
         """
@@ -190,11 +221,18 @@ class Member:
         
         @param message: The new message of the Member 
         """
-        if len(message) > globals.MAX_MESSEGE_LENGTH:
-            mess = message[0:globals.MAX_MESSEGE_LENGTH-3]+"..."
-        else:
-            mess = message
-        self._message.set_message(mess)
+        self._contact.message = message
+        
+        if self._row != None:
+            gui.scheduler.schedule((id(self), "message"), self._draw_message)
+            
+    def _draw_message(self):
+        """
+        @brief Draws the message onto the Row (once the frame is drawn).
+        """
+        if self._row != None:
+            self._row.set_message(self._shorten(self._contact.message, 
+                                                globals.MAX_MESSEGE_LENGTH))
         
     def get_message(self):
         """
@@ -202,7 +240,7 @@ class Member:
         
         @return string: The current message
         """
-        return self.__mess
+        return self._contact.message
     
     def get_email(self):
         """
@@ -210,7 +248,7 @@ class Member:
         
         @return The email of the Member
         """
-        return self._email
+        return self._contact.email
     
     def set_postition(self, position):
         """
@@ -218,7 +256,9 @@ class Member:
         
         @param postition: A tuple of size 2 indicating the Member's new position
         """
-        self._border.set_position(position)
+        self._position = position
+        if self._row != None:
+            self._row.set_position(position)
         
     def get_position(self):
         """
@@ -227,7 +267,7 @@ class Member:
         @return tuple: tuple of size two indicating the current position 
         of the Member
         """
-        return self._border.get_position()
+        return self._position
     
     def set_background_color(self, color):
         """
@@ -235,7 +275,17 @@ class Member:
         
         @var color: New color of the member.
         """
-        self._layer.set_background_color(color)
+        self._background_color = color
+        if self._row != None:
+            self._row.set_background_color(color)
+        
+    def get_background_color(self):
+        """
+        @brief Gets the background color of the member (before blending).
+        
+        @return The background color of the member.
+        """
+        return self._background_color
         
     def set_border_color(self, color):
         """
@@ -243,7 +293,17 @@ class Member:
         
         @var color: The color of the border
         """
-        self._border.set_background_color(color)
+        self._border_color = color
+        if self._row != None:
+            self._row.set_border_color(color)
+        
+    def get_border_color(self):
+        """
+        @brief Gets the border color of the Member
+        
+        @return The color of the border
+        """
+        return self._border_color
         
     def set_border_width(self, width):
         """
@@ -251,8 +311,9 @@ class Member:
         
         @var width: The new width of the border.
         """
-        self._border.set_border_width(width)
         self._border_width = width
+        if self._row != None and not self._selected:
+            self._row.set_border_width(width)
         
     def select(self, selected = True):
         """
@@ -262,14 +323,17 @@ class Member:
         """
         
         if selected != self._selected:
+            self._selected = selected
+            
             if selected:
-                self._border.set_border_width(globals.HIGHLIGHT_BORDER_WIDTH)
                 Member.focus.append(self)
+                width = globals.HIGHLIGHT_BORDER_WIDTH
             else:
-                self._border.set_border_width(self._border_width)
                 Member.focus.remove(self)
-            
-            self._selected = selected
+                width = self._border_width
+                
+            if self._row != None:
+                self._row.set_border_width(width)
         
     def selected(self):
         """
@@ -286,20 +350,7 @@ class Member:
         @return True/False First based on Status, 
         then on nickname (alphebitical decending).
         """
-        status = self.get_status()
-        Ostatus = other.get_status()
-        
-        if status == Ostatus:
-            return self.get_nickname() < other.get_nickname()
-        
-        if status == "online":
-            return True
-        elif status == "away" and Ostatus != "online":
-            return True
-        elif status == "busy" and Ostatus not in ["online", "away"]:
-            return True
-        else:
-            return False
+        return self._contact.key < other._contact.key
         
     def __eq__(self, other):
         """
@@ -307,9 +358,9 @@ class Member:
         
         @return True/False Whether the status and nickname are exactly equal.
         """
-        return (self.get_status() == other.get_status() and 
-                self.get_nickname() == other.get_nickname() and 
-                self._email == other._email)
+        if not isinstance(other, Member):
+            return False
+        return self._contact.key == other._contact.key
     
     def __le__(self, other):
         """
@@ -318,7 +369,7 @@ class Member:
         @return True/False First based on Status, 
         then on nickname (alphebitical decending).
         """
-        return self < other or self == other
+        return self._contact.key <= other._contact.key
     
     def __gt__(self, other):
         """
@@ -327,7 +378,7 @@ class Member:
         @return True/False First based on Status, 
         then on nickname (alphebitical decending).
         """
-        return not (self <= other)
+        return self._contact.key > other._contact.key
     
     def __ge__(self, other):
         """
@@ -336,7 +387,7 @@ class Member:
         @return True/False First based on Status, 
         then on nickname (alphebitical decending).
         """
-        return not (self < other)
+        return self._contact.key >= other._contact.key
     
     def __ne__(self, other):
         """
@@ -360,11 +411,25 @@ class Member:
         @brief Start a conversation with this user.
         Creates a top level window.
         """
-        if self._border.get_background_color(False) == globals.GROUP_ODD_COLOR:
+        if self._border_color == globals.GROUP_ODD_COLOR:
             background_color = globals.CONVERSATION_EVEN_COLOR
         else:
             background_color = globals.CONVERSATION_ODD_COLOR
             
-        self._conv.append(Conversation(self, bg=background_color))
+        conversation = Conversation(self, bg=background_color)
+        conversation.set_close_command(lambda: self._conv.remove(conversation))
+        self._conv.append(conversation)
+        
+    def receive(self, message):
+        """
+        @brief Shows a message this user sent, in the last conversation 
+        with them that is still open (a new one if there is none).
+        
+        @var message: What they said.
+        """
+        if len(self._conv) == 0:
+            self.start_conversation(None)
+            
+        self._conv[-1].receive(self, message)
         
     
\ No newline at end of file
@@ -0,0 +1,397 @@
+"""
+@file Row.py
+@date 10/18/2026
+@version 0.1
+
+@brief The implementation of the Row class.
+
+A Row is the set of widgets a Member is drawn with. Normally every Member
+gets a Row of its own, but a Group that only draws what fits on screen keeps
+a few Rows and hands them from Member to Member as the list is scrolled.
+"""
+
+import globals
+
+import gui
+
+class Row:
+    """
+    @brief The widgets that draw a single Member.
+    """
+    
+    def __init__(self, pooled = False, tag = None):
+        """
+        @brief Constructs the widgets of a Row (not drawn until its layer
+        is added to something)
+        
+        @param pooled: True if the Row is shared by many Members,
+        its position then stays put no matter what Member it draws.
+        @param tag: A gui.Tag that the clicks (and scrolls) of the Row are 
+        bound to, None binds each widget of the Row on its own.
+        """
+        self._pooled = pooled
+        self._member = None
+        
+        self._layer = gui.Layer()
+        self._border = gui.Layer()
+        
+        self._border.blending(False)
+        self._border.set_background_color("black")
+        
+        self._layer.set_border_type("flat")
+        
+        self._status = gui.TextBox(text="N",
+                                   pos=(0,0),
+                                   width = globals.MEMBER_STATUS_WIDTH)
+        
+        self._nickname = gui.TextBox(pos=(0,1),
+                                     width = globals.MEMBER_NAME_WIDTH,
+                                     justify="left")
+        
+        self._message = gui.TextBox(pos=(0,2),
+                                    width = globals.MEMBER_MESSAGE_WIDTH,
+                                    justify="left")
+        
+        self._layer.add(self._status)
+        self._layer.add(self._nickname)
+        self._layer.add(self._message)
+        
+        self._border.add(self._layer)
+        
+        #bindings
+        for item in [self._status, self._nickname, self._message]:
+            if tag != None:
+                tag.add(item, self)
+                continue
+                
+            item.bind(gui.globals.CLICKED, self.clicked)
+            item.bind(gui.globals.DBL_CLICKED, self.start_conversation)
+            
+            if pooled:
+                item.bind(gui.globals.WHEEL, self.scrolled)
+                item.bind(gui.globals.WHEEL_UP, self.scrolled)
+                item.bind(gui.globals.WHEEL_DOWN, self.scrolled)
+    
+    def get_layer(self):
+        """
+        @breif Used to add the Row to the screen
+        
+        @return The drawable layer that can be added to the screen.
+        """
+        return self._border
+    
+    def get_member(self):
+        """
+        @brief Gets the Member the Row is drawing.
+        
+        @return The Member, None if the Row isn't drawing anyone.
+        """
+        return self._member
+    
+    def attach(self, member):
+        """
+        @brief Draws a Member with this Row, replaces whoever the Row
+        was drawing before.
+        
+        @var member: The Member to draw.
+        """
+        if self._member is member:
+            return
+        
+        if self._member != None:
+            self._member.set_row(None)
+        
+        # Take the Member from the Row that was drawing it (if any), 
+        # that Row is given someone else to draw by whoever is moving them.
+        if member.get_row() != None:
+            member.get_row()._member = None
+        
+        self._member = member
+        member.set_row(self)
+        member.draw()
+        self._border.set_visibility(True)
+    
+    def detach(self):
+        """
+        @brief Stops drawing whatever Member the Row was drawing.
+        A pooled Row is hidden until it is attached again.
+        """
+        if self._member != None:
+            self._member.set_row(None)
+            self._member = None
+        
+        if self._pooled:
+            self._border.set_visibility(False)
+    
+    def untag(self, tag):
+        """
+        @brief Takes the widgets of the Row out of a gui.Tag.
+        
+        @var tag: The Tag the Row was made with.
+        """
+        for item in [self._status, self._nickname, self._message]:
+            tag.remove(item)
+    
+    def set_status(self, text, color):
+        """
+        @brief Sets what the status TextBox shows.
+        
+        @var text: The status character.
+        @var color: The color of the status character.
+        """
+        self._status.set_message(text)
+        self._status.set_foreground_color(color)
+    
+    def set_nickname(self, nickname):
+        """
+        @brief Sets the nickname shown.
+        
+        @var nickname: The (already shortened) nickname.
+        """
+        self._nickname.set_message(nickname)
+    
+    def set_message(self, message):
+        """
+        @brief Sets the message shown after the nickname.
+        
+        @var message: The (already shortened) message.
+        """
+        self._message.set_message(message)
+    
+    def set_position(self, position):
+        """
+        @brief Sets the position of the Row, unless it is pooled.
+        
+        @var position: A tuple of size 2.
+        """
+        if not self._pooled:
+            self._border.set_position(position)
+    
+    def set_background_color(self, color):
+        """
+        @brief Sets the background color of the Row.
+        
+        @var color: New color of the Row.
+        """
+        if self._layer.get_background_color(False) != color:
+            self._layer.set_background_color(color)
+    
+    def set_border_color(self, color):
+        """
+        @brief Sets the border color of the Row.
+        
+        @var color: The color of the border.
+        """
+        if self._border.get_background_color(False) != color:
+            self._border.set_background_color(color)
+    
+    def set_border_width(self, width):
+        """
+        @brief Sets the width of the border.
+        
+        @var width: The new width of the border.
+        """
+        self._border.set_border_width(width)
+    
+    def clicked(self, event):
+        """
+        @brief Selects the Member this Row is drawing.
+        """
+        if self._member != None:
+            self._member.clicked(event)
+    
+    def start_conversation(self, event):
+        """
+        @brief Starts a conversation with the Member this Row is drawing.
+        """
+        if self._member != None:
+            self._member.start_conversation(event)
+    
+    def scrolled(self, event):
+        """
+        @brief Scrolls the Group the Member is in with the mouse wheel.
+        """
+        if self._member != None:
+            self._member.get_group().wheel(event)
+
+class CanvasRow:
+    """
+    @brief Draws a single Member as a few items on its Group's Canvas, 
+    instead of with widgets of its own.
+    
+    Has the same methods as a Row, so a Member can't tell them apart.
+    """
+    
+    def __init__(self, canvas):
+        """
+        @brief Draws an empty Row on a Canvas.
+        
+        @param canvas: The gui.Canvas the Row is drawn on.
+        """
+        self._canvas = canvas
+        self._member = None
+        self._top = 0
+        self._border_width = 0
+        
+        height = globals.CANVAS_ROW_HEIGHT
+        width = globals.MEMBER_WIDTH * globals.CANVAS_CHAR_WIDTH
+        
+        self._background = canvas.create("rectangle", (0, 0, width, height), 
+                                         width=0, fill="")
+        self._border = canvas.create("rectangle", (0, 0, width, height), 
+                                     width=0, outline="")
+        
+        self._status = canvas.create("text", 
+                                     self._text_coordinates(0), 
+                                     anchor="w", text="N")
+        self._nickname = canvas.create("text", 
+                            self._text_coordinates(globals.MEMBER_STATUS_WIDTH), 
+                            anchor="w")
+        self._message = canvas.create("text", 
+                            self._text_coordinates(globals.MEMBER_STATUS_WIDTH + 
+                                                   globals.MEMBER_NAME_WIDTH), 
+                            anchor="w")
+    
+    def _text_coordinates(self, column):
+        """
+        @brief Where text starting at a column of characters is drawn.
+        
+        @var column: How many characters from the left the text starts.
+        @return A tuple of (x, y) in pixels.
+        """
+        return (column * globals.CANVAS_CHAR_WIDTH + 2, 
+                self._top + globals.CANVAS_ROW_HEIGHT/2)
+    
+    def get_layer(self):
+        """
+        @breif The Row is drawn on the Canvas, so there is nothing to add.
+        
+        @return None
+        """
+        return None
+    
+    def get_member(self):
+        """
+        @brief Gets the Member the Row is drawing.
+        
+        @return The Member, None if the Row isn't drawing anyone.
+        """
+        return self._member
+    
+    def attach(self, member):
+        """
+        @brief Draws a Member with this Row.
+        
+        @var member: The Member to draw.
+        """
+        if self._member != None:
+            self._member.set_row(None)
+        
+        self._member = member
+        member.set_row(self)
+        member.draw()
+    
+    def detach(self):
+        """
+        @brief Stops drawing the Member and removes the Row from the Canvas.
+        """
+        if self._member != None:
+            self._member.set_row(None)
+            self._member = None
+        
+        for item in [self._background, self._border, self._status, 
+                     self._nickname, self._message]:
+            self._canvas.delete(item)
+    
+    def set_status(self, text, color):
+        """
+        @brief Sets what the status glyph shows.
+        
+        @var text: The status character.
+        @var color: The color of the status character.
+        """
+        self._canvas.configure(self._status, text=text, fill=color)
+    
+    def set_nickname(self, nickname):
+        """
+        @brief Sets the nickname shown.
+        
+        @var nickname: The (already shortened) nickname.
+        """
+        self._canvas.configure(self._nickname, text=nickname)
+    
+    def set_message(self, message):
+        """
+        @brief Sets the message shown after the nickname.
+        
+        @var message: The (already shortened) message.
+        """
+        self._canvas.configure(self._message, text=message)
+    
+    def set_position(self, position):
+        """
+        @brief Moves the Row to a row of the Canvas.
+        
+        @var position: A tuple of size 2, (row, column) the row starts at 1.
+        """
+        top = (position[0] - 1) * globals.CANVAS_ROW_HEIGHT
+        if top == self._top:
+            return
+        
+        self._top = top
+        self._draw_border()
+        self._canvas.coordinates(self._background, 
+                                 self._coordinates(0))
+        self._canvas.coordinates(self._status, 
+                                 self._text_coordinates(0))
+        self._canvas.coordinates(self._nickname, 
+                            self._text_coordinates(globals.MEMBER_STATUS_WIDTH))
+        self._canvas.coordinates(self._message, 
+                            self._text_coordinates(globals.MEMBER_STATUS_WIDTH + 
+                                                   globals.MEMBER_NAME_WIDTH))
+    
+    def _coordinates(self, inset):
+        """
+        @brief The corners of the Row, pulled in by inset pixels.
+        
+        @var inset: How far to pull in the corners.
+        @return A tuple of (left, top, right, bottom) in pixels.
+        """
+        width = globals.MEMBER_WIDTH * globals.CANVAS_CHAR_WIDTH
+        return (inset, self._top + inset, 
+                width - inset, self._top + globals.CANVAS_ROW_HEIGHT - inset)
+    
+    def _draw_border(self):
+        """
+        @brief Draws the border inside the Row so it doesn't cover the 
+        Rows around it.
+        """
+        self._canvas.coordinates(self._border, 
+                                 self._coordinates(self._border_width/2))
+    
+    def set_background_color(self, color):
+        """
+        @brief Sets the color of the Row's stripe.
+        
+        @var color: New color of the Row.
+        """
+        self._canvas.configure(self._background, fill=color)
+    
+    def set_border_color(self, color):
+        """
+        @brief Sets the border color of the Row.
+        
+        @var color: The color of the border.
+        """
+        self._canvas.configure(self._border, outline=color)
+    
+    def set_border_width(self, width):
+        """
+        @brief Sets the width of the border (0 hides it).
+        
+        @var width: The new width of the border.
+        """
+        if width != self._border_width:
+            self._border_width = width
+            self._canvas.configure(self._border, width=width)
+            self._draw_border()
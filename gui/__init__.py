@@ -11,11 +11,17 @@ objects on said windows extremely easy.
 """
 
 import globals
+import backend
+import scheduler
 from button import Button
+from canvas import Canvas
 from entrybox import EntryBox
 from layer import Layer
 from menu import Menu, MenuItem, MenuBar
 from messagebox import MessageBox
+from scheduler import Scheduler
+from scrollbar import ScrollBar
+from tag import Tag
 from textbox import TextBox
 from window import Window, PopUp, App
 
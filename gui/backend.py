@@ -0,0 +1,558 @@
+"""
+@file Backend.py
+@date 10/18/2026
+@version 0.1
+
+@brief What the gui package draws with.
+
+Every widget in the gui package is made through the current backend.
+Normally that is Tk, but a Recorder can be used instead, it draws nothing
+and keeps a log of everything that would have been sent to Tk, so the
+gui (and everything built on it) can be run and measured without a display.
+"""
+
+import heapq
+
+import Tkinter
+
+class Tk:
+    """
+    @brief Draws with Tkinter.
+    """
+    
+    def widget(self, kind, parent, **options):
+        """
+        @brief Makes a widget.
+        
+        @var kind: The name of the Tkinter class (Frame, Label, Button, ...)
+        @var parent: The widget it goes in (None for a top level one).
+        @var options: The Tkinter options it starts with.
+        @return The widget.
+        """
+        return getattr(Tkinter, kind)(parent, **options)
+    
+    def app(self):
+        """
+        @brief Makes the application (the root window and the main loop).
+        
+        @return A gui.App
+        """
+        from window import App
+        return App()
+
+# The backend everything is drawn with.
+_current = [Tk()]
+
+def use(backend):
+    """
+    @brief Sets what new widgets are made with. Widgets that were already
+    made keep using what they were made with.
+    
+    @var backend: A Tk or Recorder (or anything with widget and app methods)
+    """
+    _current[0] = backend
+
+def get():
+    """
+    @brief Gets what new widgets are made with.
+    
+    @return The current backend.
+    """
+    return _current[0]
+
+def widget(kind, parent, **options):
+    """
+    @brief Makes a widget with the current backend.
+    
+    @var kind: The name of the Tkinter class (Frame, Label, Button, ...)
+    @var parent: The widget it goes in (None for a top level one).
+    @var options: The Tkinter options it starts with.
+    @return The widget.
+    """
+    return _current[0].widget(kind, parent, **options)
+
+def app():
+    """
+    @brief Makes the application with the current backend.
+    
+    @return The application.
+    """
+    return _current[0].app()
+
+# (red, green, blue) of the color names a Recorder knows,
+# anything else has to be given as #rgb, #rrggbb or #rrrrggggbbbb.
+COLORS = {"white": (65535, 65535, 65535),
+          "black": (0, 0, 0),
+          "red": (65535, 0, 0),
+          "green": (0, 65535, 0),
+          "blue": (0, 0, 65535),
+          "yellow": (65535, 65535, 0),
+          "orange": (65535, 42405, 0),
+          "grey": (48830, 48830, 48830),
+          "gray": (48830, 48830, 48830),
+          "darkgrey": (43433, 43433, 43433),
+          "darkgray": (43433, 43433, 43433),
+          "lightgrey": (54227, 54227, 54227),
+          "lightgray": (54227, 54227, 54227),
+          "darkgreen": (0, 25700, 0)}
+
+# The options every recorded widget starts with (Tk's defaults on X11).
+DEFAULTS = {"bg": "#d9d9d9",
+            "fg": "#000000",
+            "bd": 0,
+            "relief": "flat",
+            "text": "",
+            "width": 0,
+            "height": 0,
+            "state": "normal"}
+
+class Recorder:
+    """
+    @brief A backend that draws nothing and logs everything.
+    
+    Every call that would have reached Tk is added to the log as a tuple of
+    (widget name, operation, arguments). The widgets remember their options,
+    their place in the grid, their text and the items on them, so reading
+    anything back gives what Tk would have given.
+    
+    after and after_idle callbacks are kept until update is called, time
+    only passes when advance is called (or the main loop runs out of
+    idle callbacks).
+    
+    @var log: Everything sent to the widgets, in order.
+    """
+    
+    def __init__(self):
+        """
+        @brief Creates a Recorder with an empty log.
+        """
+        self.log = []
+        self._names = 0
+        self._time = 0
+        self._idle = []
+        # heap of (time, number, callback, arguments)
+        self._timers = []
+        self._scheduled = 0
+        # (bind tag, event) -> callback
+        self._class_binds = {}
+    
+    def widget(self, kind, parent, **options):
+        """
+        @brief Makes a recorded widget.
+        
+        @var kind: The name of the Tkinter class (Frame, Label, Button, ...)
+        @var parent: The widget it goes in (None for a top level one).
+        @var options: The Tkinter options it starts with.
+        @return The widget.
+        """
+        return _Widget(self, kind, parent, options)
+    
+    def app(self):
+        """
+        @brief Makes a recorded application.
+        
+        @return The application.
+        """
+        return _App(self)
+    
+    def record(self, name, operation, *arguments):
+        """
+        @brief Adds an operation to the log.
+        
+        @var name: The name of the widget it was sent to.
+        @var operation: What was done (configure, grid_configure, ...)
+        @var arguments: What it was done with.
+        """
+        self.log.append((name, operation, arguments))
+    
+    def counts(self):
+        """
+        @brief How many times each operation was logged.
+        
+        @return A dictionary of operation -> count.
+        """
+        counts = {}
+        for name, operation, arguments in self.log:
+            counts[operation] = counts.get(operation, 0) + 1
+        return counts
+    
+    def clear(self):
+        """
+        @brief Empties the log.
+        """
+        self.log = []
+    
+    def _name(self, kind):
+        """
+        @brief Gives a new widget a name (like Tk's .!frame2)
+        
+        @var kind: What kind of widget it is.
+        @return The name.
+        """
+        self._names += 1
+        return "%s%d" % (kind.lower(), self._names)
+    
+    def after(self, delay, callback, *arguments):
+        """
+        @brief Calls callback once delay milliseconds have passed.
+        
+        @return An id that can be given to after_cancel.
+        """
+        self._scheduled += 1
+        heapq.heappush(self._timers, (self._time + delay, self._scheduled,
+                                      callback, arguments))
+        return "after#%d" % self._scheduled
+    
+    def after_idle(self, callback, *arguments):
+        """
+        @brief Calls callback the next time update is called.
+        
+        @return An id that can be given to after_cancel.
+        """
+        self._scheduled += 1
+        self._idle.append((self._scheduled, callback, arguments))
+        return "after#%d" % self._scheduled
+    
+    def after_cancel(self, id):
+        """
+        @brief Stops a callback from being called.
+        
+        @var id: What after or after_idle gave back.
+        """
+        number = int(id.split("#")[1])
+        
+        # Taken out of the queues rather than skipped when it comes up, so
+        # what is left is exactly what will be called.
+        self._idle = [idle for idle in self._idle if idle[0] != number]
+        timers = [timer for timer in self._timers if timer[1] != number]
+        if len(timers) != len(self._timers):
+            heapq.heapify(timers)
+            self._timers = timers
+    
+    def update(self):
+        """
+        @brief Calls every timer that is due and every idle callback
+        (including ones added by those callbacks).
+        
+        @return How many callbacks were called.
+        """
+        called = 0
+        while True:
+            if self._timers and self._timers[0][0] <= self._time:
+                time, number, callback, arguments = \
+                    heapq.heappop(self._timers)
+            elif self._idle:
+                number, callback, arguments = self._idle.pop(0)
+            else:
+                return called
+            
+            callback(*arguments)
+            called += 1
+    
+    def advance(self, delay=None):
+        """
+        @brief Lets time pass and calls whatever became due.
+        
+        @var delay: How many milliseconds pass, None means until
+        the next timer.
+        @return How many callbacks were called.
+        """
+        if delay == None:
+            if not self._timers:
+                return self.update()
+            self._time = max(self._time, self._timers[0][0])
+        else:
+            self._time += delay
+        return self.update()
+    
+    def pending(self):
+        """
+        @brief Whether or not any callbacks are waiting to be called.
+        
+        @return True/False
+        """
+        return len(self._idle) + len(self._timers) > 0
+
+class _Widget(object):
+    """
+    @brief A widget that records what is done to it instead of drawing.
+    """
+    
+    def __init__(self, recorder, kind, parent, options):
+        self._recorder = recorder
+        self._kind = kind
+        self._name = recorder._name(kind)
+        self._parent = parent
+        self._options = dict(DEFAULTS)
+        self._options.update(options)
+        self._grid = None
+        self._rows = {}
+        self._columns = {}
+        self._text = ""
+        self._items = {}
+        self._next_item = 1
+        self._binds = {}
+        self._protocols = {}
+        self._tags = (self._name, kind, "all")
+        self._record("create", kind, options)
+    
+    def __str__(self):
+        return self._name
+    
+    def _record(self, operation, *arguments):
+        self._recorder.record(self._name, operation, *arguments)
+    
+    def __setitem__(self, option, value):
+        self.configure(**{option: value})
+    
+    def __getitem__(self, option):
+        return self.cget(option)
+    
+    def configure(self, **options):
+        if not options:
+            return dict(self._options)
+        self._record("configure", options)
+        self._options.update(options)
+    
+    config = configure
+    
+    def cget(self, option):
+        self._record("cget", option)
+        return self._options.get(option, "")
+    
+    def keys(self):
+        return self._options.keys()
+    
+    def bind(self, event, callback=None, add=None):
+        self._record("bind", event)
+        self._binds[event] = callback
+    
+    def protocol(self, name, callback=None):
+        self._record("protocol", name)
+        self._protocols[name] = callback
+    
+    def bind_class(self, tag, event, callback=None, add=None):
+        self._record("bind_class", tag, event)
+        self._recorder._class_binds[(tag, event)] = callback
+    
+    def bindtags(self, tags=None):
+        if tags == None:
+            return self._tags
+        self._record("bindtags", tags)
+        self._tags = tuple(tags)
+    
+    def event_generate(self, event, **fields):
+        """
+        @brief Makes an event happen on the widget, calling what is bound 
+        to it the way Tk would (through each of its bind tags in order, 
+        until one returns "break").
+        
+        @var event: The event (i.e. <Button-1>)
+        @var fields: Fields of the event (x, y, num, delta, ...)
+        """
+        self._record("event_generate", event, fields)
+        
+        details = _Event(self, fields)
+        for tag in self._tags:
+            if tag == self._name:
+                callback = self._binds.get(event)
+            else:
+                callback = self._recorder._class_binds.get((tag, event))
+            
+            if callback != None and callback(details) == "break":
+                break
+    
+    def grid_configure(self, **options):
+        self._record("grid_configure", options)
+        if self._grid == None:
+            self._grid = {}
+        self._grid.update(options)
+    
+    grid = grid_configure
+    
+    def grid_forget(self):
+        self._record("grid_forget")
+        self._grid = None
+    
+    def grid_info(self):
+        return dict(self._grid or {})
+    
+    def grid_rowconfigure(self, row, **options):
+        self._record("grid_rowconfigure", row, options)
+        self._rows[row] = options
+    
+    def grid_columnconfigure(self, column, **options):
+        self._record("grid_columnconfigure", column, options)
+        self._columns[column] = options
+    
+    def pack(self, **options):
+        self._record("pack", options)
+        self._grid = options
+    
+    def pack_forget(self):
+        self._record("pack_forget")
+        self._grid = None
+    
+    forget = pack_forget
+    
+    def pack_info(self):
+        return dict(self._grid or {})
+    
+    def winfo_rgb(self, color):
+        self._record("winfo_rgb", color)
+        return _rgb(color)
+    
+    def after(self, delay, callback, *arguments):
+        self._record("after", delay)
+        return self._recorder.after(delay, callback, *arguments)
+    
+    def after_idle(self, callback, *arguments):
+        self._record("after_idle")
+        return self._recorder.after_idle(callback, *arguments)
+    
+    def after_cancel(self, id):
+        self._record("after_cancel", id)
+        self._recorder.after_cancel(id)
+    
+    def _index(self, index):
+        """
+        @brief Works out where an Entry or Text index is in the text.
+        
+        @var index: A number, "end", or "line.column" (lines start at 1)
+        @return How many characters into the text it is.
+        """
+        if index == Tkinter.END:
+            return len(self._text)
+        if isinstance(index, int):
+            return min(index, len(self._text))
+            
+        line, column = [int(part) for part in index.split(".")]
+        start = 0
+        for i in range(line - 1):
+            start = self._text.find("\n", start)
+            if start == -1:
+                return len(self._text)
+            start += 1
+        return min(start + column, len(self._text))
+    
+    def insert(self, index, text):
+        self._record("insert", index, text)
+        position = self._index(index)
+        self._text = self._text[:position] + text + self._text[position:]
+    
+    def delete(self, first, last=None):
+        self._record("delete", first, last)
+        if first in self._items and last == None:
+            del self._items[first]
+            return
+            
+        first = self._index(first)
+        if last == None:
+            last = first + 1
+        else:
+            last = self._index(last)
+        self._text = self._text[:first] + self._text[last:]
+    
+    def get(self, *arguments):
+        self._record("get")
+        return self._text
+    
+    def set(self, *arguments):
+        self._record("set", *arguments)
+        self._options["view"] = arguments
+    
+    def itemconfigure(self, item, **options):
+        self._record("itemconfigure", item, options)
+        self._items[item][2].update(options)
+    
+    def coords(self, item, *coordinates):
+        self._record("coords", item, coordinates)
+        self._items[item][1] = coordinates
+    
+    def _create(self, type, *coordinates, **options):
+        item = self._next_item
+        self._next_item += 1
+        self._record("create_" + type, coordinates, options)
+        self._items[item] = [type, coordinates, options]
+        return item
+    
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        
+        if name.startswith("create_"):
+            type = name[len("create_"):]
+            return lambda *coordinates, **options: \
+                self._create(type, *coordinates, **options)
+        
+        # Anything else (title, focus_set, add_command, ...) is only logged.
+        def operation(*arguments, **options):
+            self._record(name, arguments, options)
+        return operation
+
+class _Event:
+    """
+    @brief What a recorded widget gives to the procedures bound to it.
+    """
+    
+    def __init__(self, widget, fields):
+        self.widget = widget
+        self.x = self.y = self.num = self.delta = 0
+        self.__dict__.update(fields)
+
+class _App(_Widget):
+    """
+    @brief A recorded application (root window and main loop).
+    """
+    
+    def __init__(self, recorder):
+        _Widget.__init__(self, recorder, "Tk", None, {})
+        self._readers = {}
+        self._running = False
+    
+    def add_reader(self, fd, callback, writable=False):
+        if hasattr(fd, "fileno"):
+            fd = fd.fileno()
+        self._record("createfilehandler", fd)
+        self._readers[fd] = callback
+    
+    def remove_reader(self, fd):
+        if hasattr(fd, "fileno"):
+            fd = fd.fileno()
+        if fd in self._readers:
+            self._record("deletefilehandler", fd)
+            del self._readers[fd]
+    
+    def mainloop(self):
+        """
+        @brief Calls callbacks until the application is destroyed or
+        there is nothing left to call.
+        """
+        self._running = True
+        while self._running and self._recorder.pending():
+            self._recorder.advance()
+        self._running = False
+    
+    def destroy(self):
+        self._record("destroy")
+        self._running = False
+    
+    quit = destroy
+
+def _rgb(color):
+    """
+    @brief Works out the (red, green, blue) of a color the way Tk does.
+    
+    @var color: A color name or #rgb, #rrggbb, #rrrrggggbbbb.
+    @return A tuple of (red, green, blue) from 0 to 65535.
+    """
+    if color.startswith("#") and len(color) in (4, 7, 13):
+        digits = (len(color) - 1) / 3
+        scale = 65535 / (16 ** digits - 1)
+        return tuple(int(color[1+i*digits:1+(i+1)*digits], 16) * scale
+                     for i in range(3))
+    
+    if color.lower() in COLORS:
+        return COLORS[color.lower()]
+    
+    raise Tkinter.TclError('unknown color name "%s"' % color)
@@ -9,13 +9,14 @@ A button is a clickable object on screen, I'm sure you know.
 """
 
 from object import Object
-import Tkinter
 
 class Button(Object):
     """
     @brief Clickable object with a label inside it.
     """
     
+    __slots__ = ("_text", "_forecolor")
+    
     def __init__(self, text=""):
         """
         @brief constructs a button with a given text.
@@ -33,7 +34,7 @@ class Button(Object):
         @var text: The label of the Button
         """
         if self._component != None:
-            self._component["text"] = text
+            self._set_options(text=text)
         self._text = text
         
     def get_message(self):
@@ -43,7 +44,7 @@ class Button(Object):
         @return What is currently in the Button
         """
         if self._component != None:
-            return self._component["text"]
+            return self._get_option("text")
         return self._text
     
     def set_foreground_color(self, color):
@@ -55,7 +56,7 @@ class Button(Object):
         Tkinter provides other valid methods for specifying color)
         """
         if self._component != None:
-            self._component["fg"] = color
+            self._set_options(fg=color)
             
         self._forecolor = color 
             
@@ -66,22 +67,22 @@ class Button(Object):
         @return The current color of the text.
         """
         if self._component != None:
-            return self._component["fg"]
+            return self._get_option("fg")
         return self._forecolor
             
     
-    def parent(self, parent):
+    def _realize(self, parent):
         """
-        @brief Sets the parent of the TextBox
+        @brief Makes the component of the Button (see Object.parent)
         @note Can only be called once
         
         @var parent The Widget that the TextBox is to be placed on.
         """
         if self._component == None:
-            self._component = Tkinter.Button(parent, text=self._text)
-            
+            options = {"text": self._text}
             if self._forecolor != "":
-                self._component["fg"] = self._forecolor
-
+                options["fg"] = self._forecolor
+                
+            self._make("Button", parent, **options)
             self._parent()
             
\ No newline at end of file
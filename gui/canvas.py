@@ -0,0 +1,148 @@
+"""
+@file Canvas.py
+@date 10/18/2026
+@version 0.1
+
+@brief Canvas source code.
+
+A Canvas is a single widget that many shapes and texts can be drawn on.
+Drawing lots of simple things on one Canvas is a lot cheaper than making
+a widget for each of them.
+"""
+
+from object import Object
+
+class Canvas(Object):
+    """
+    @brief A drawing surface for shapes and text.
+    
+    Items can be drawn before the Canvas has a parent, they are kept and
+    drawn once it does.
+    """
+    
+    __slots__ = ("_items", "_drawn", "_next_item", "_height")
+    
+    def __init__(self, pos = (0,0), width = 0, height = 0):
+        """
+        @brief Constructs a Canvas (not displayed until added to something)
+        
+        @var pos: Tuple of size 2 indicating position. i.e. (50,50)
+        @var width: Width of the Canvas in pixels.
+        @var height: Height of the Canvas in pixels.
+        """
+        Object.__init__(self)
+        
+        # item -> [type, coordinates, options]
+        self._items = {}
+        # item -> id of the item on the Tkinter Canvas
+        self._drawn = {}
+        self._next_item = 1
+        self._height = height
+        
+        self.set_position(pos)
+        if width > 0:
+            self.set_width(width)
+    
+    def create(self, type, coordinates, **options):
+        """
+        @brief Draws a new item on the Canvas.
+        
+        @var type: What to draw (rectangle, text, line, oval, ...)
+        @var coordinates: A tuple of the item's coordinates in pixels.
+        @var options: The Tkinter options of the item (fill, text, ...)
+        @return The item, used to change it later.
+        """
+        item = self._next_item
+        self._next_item += 1
+        
+        self._items[item] = [type, tuple(coordinates), options]
+        
+        if self._component != None:
+            self._draw(item)
+        
+        return item
+    
+    def configure(self, item, **options):
+        """
+        @brief Changes the options of an item.
+        
+        @var item: An item returned by create.
+        @var options: The Tkinter options to change.
+        """
+        current = self._items[item][2]
+        changed = {}
+        for option, value in options.items():
+            if option not in current or current[option] != value:
+                changed[option] = value
+        
+        if not changed:
+            return
+        
+        current.update(changed)
+        
+        if self._component != None:
+            self._component.itemconfigure(self._drawn[item], **changed)
+    
+    def coordinates(self, item, coordinates):
+        """
+        @brief Moves an item.
+        
+        @var item: An item returned by create.
+        @var coordinates: A tuple of the item's new coordinates in pixels.
+        """
+        coordinates = tuple(coordinates)
+        if self._items[item][1] == coordinates:
+            return
+        
+        self._items[item][1] = coordinates
+        
+        if self._component != None:
+            self._component.coords(self._drawn[item], *coordinates)
+    
+    def delete(self, item):
+        """
+        @brief Removes an item from the Canvas.
+        
+        @var item: An item returned by create.
+        """
+        del self._items[item]
+        
+        if self._component != None:
+            self._component.delete(self._drawn.pop(item))
+    
+    def set_height(self, height):
+        """
+        @brief Sets the height of the Canvas in pixels.
+        
+        @var height: New height of the Canvas.
+        """
+        if self._component != None:
+            self._set_options(height=height)
+        
+        self._height = height
+    
+    def _draw(self, item):
+        """
+        @brief Draws an item on the Tkinter Canvas.
+        
+        @var item: An item returned by create.
+        """
+        type, coordinates, options = self._items[item]
+        create = getattr(self._component, "create_" + type)
+        self._drawn[item] = create(*coordinates, **options)
+    
+    def _realize(self, parent):
+        """
+        @brief Makes the component of the Canvas (see Object.parent)
+        @note Can only be called once
+        
+        @var parent The Widget that the Canvas is to be placed on.
+        """
+        if self._component == None:
+            self._make("Canvas", parent, highlightthickness=0, 
+                       height=self._height)
+            
+            for item in sorted(self._items.keys()):
+                self._draw(item)
+            
+            self._parent()
@@ -12,11 +12,15 @@ An EntryBox is a single line user-writable box.
 from object import Object
 import Tkinter
 
+import backend
+
 class EntryBox(Object):
     """
     @brief A textbox that is writable, and is used for user input.
     """
     
+    __slots__ = ("_text", "_hidden", "_hidden_character")
+    
     def __init__(self):
         """
         @brief Creates an EntryBox
@@ -38,7 +42,7 @@ class EntryBox(Object):
         self._hidden_character = char
         
         if self._component != None and self._hidden:
-            self._component["show"] = self._hidden_character
+            self._set_options(show=self._hidden_character)
         
     def set_message(self, message):
         """
@@ -71,14 +75,14 @@ class EntryBox(Object):
             self._component.delete(0,Tkinter.END)
 
     
-    def parent(self, parent):
+    def _realize(self, parent):
         """
-        @brief Sets the parent of the EntryBox
+        @brief Makes the component of the EntryBox (see Object.parent)
         @note Can only be called once
         
         @var parent The Widget that the EntryBox is to be placed on.
         """
-        self._component = Tkinter.Entry(parent)
+        self._component = backend.widget("Entry", parent)
         self.set_hidden_message(char=self._hidden_character, 
                                 hidden=self._hidden)
         self.set_message(self._text)
@@ -17,6 +17,21 @@ TAB = "<KeyPress-Tab>"
 CLICKED = "<Button-1>"
 DBL_CLICKED = "<Double-Button-1>"
 ENTER = "<KeyPress-Return>"
+WHEEL = "<MouseWheel>"
+WHEEL_UP = "<Button-4>"
+WHEEL_DOWN = "<Button-5>"
 
 # Text Positions
-TXT_END = Tkinter.END
\ No newline at end of file
+TXT_END = Tkinter.END
+
+# The most time (in milliseconds) a frame of queued screen changes can take
+# before the rest are left for the next frame.
+FRAME_BUDGET = 8
+
+# How often (in milliseconds) sockets are checked where Tk can't watch them
+# (Windows), the main loop is woken up right away everywhere else.
+READER_POLL_INTERVAL = 10
+
+# The most lines a MessageBox keeps (0 keeps them all), the oldest are
+# thrown away to make room for new ones.
+MESSAGE_SCROLLBACK = 1000
@@ -10,9 +10,29 @@ A layer is an object that contains other graphical objects (even other Layers)
 in specific locations on it.
 """
 
-import Tkinter
 from object import Object
 
+# Layers whose blend changed since the last pass, and whether or not a pass 
+# is already waiting for the next idle callback.
+_dirty = []
+_scheduled = [False]
+
+def _flush_dirty():
+    """
+    @brief Hands every blend change made since the last pass down to the 
+    children, walking each changed subtree once from the top down.
+    """
+    _scheduled[0] = False
+    layers = _dirty[:]
+    del _dirty[:]
+    
+    visited = 0
+    for layer in layers:
+        if layer._dirty and not layer._owner_dirty():
+            visited += layer._flush({})
+    
+    Layer.visited = visited
+
 class Layer(Object):
     """
     @brief A subdivision of the parent Widget for organization sake.
@@ -20,7 +40,20 @@ class Layer(Object):
     This allows you to group on screen objects and allows for 
     relative placement.It will also dynamically grow to fit whatever 
     is inside it.
+    
+    Blend changes are not handed to the children right away, the Layer is 
+    marked dirty and all the dirty Layers are resolved in one pass on the 
+    next idle callback, so changing the same Layer many times in a row 
+    only walks its children once.
+    
+    @var visited: How many objects the last pass visited.
     """
+    
+    visited = 0
+    
+    __slots__ = ("_items", "_blended_background", "_blendedBackground", 
+                 "_pending", "_dirty", "_dirty_below", "_owner")
+    
     def __init__(self, pos = (0,0), align="grid"):
         """
         @brief Constructs a Layer at specified position.
@@ -38,8 +71,22 @@ class Layer(Object):
         
         self._blended_background = False
         
+        # color -> how many times it still has to be blended into 
+        # the children (negative to take it out)
+        self._pending = None
+        self._dirty = False
+        # Whether or not a Layer somewhere in this one is dirty, so a pass 
+        # that reaches this Layer has to go on down to it.
+        self._dirty_below = False
+        self._owner = None
+    
     def get_blend(self):
-        return str(self._blend)
+        """
+        @brief Gets the colors blended into the background.
+        
+        @return A string of the list of colors.
+        """
+        return str(self.get_blend_colors())
     
     def blending(self, blended):
         """
@@ -52,7 +99,7 @@ class Layer(Object):
             for item in self._items:
                 item.blend(remove=self._bColor)
             self._blended_background = False
-            
+        
         Object.blending(self, blended)
     
     def add(self, item):
@@ -61,36 +108,69 @@ class Layer(Object):
         
         @var item: The drawable item that is to be added to the layer.
         """
+        if self._dirty:
+            self._flush({})
+        
         self._items.append(item)
+        if isinstance(item, Layer):
+            item._owner = self
+            if item._dirty or item._dirty_below:
+                item._mark_owners()
         
         if (self.get_background_color(False) != "" and 
             self.get_background_color(False) != "clear" and 
             self._blended):
             item.blend(self.get_background_color(blended=False))
             self._blendedBackground = True
-  
-        for color in self._blend:
+        
+        for color in self.get_blend_colors():
             item.blend(color)
-                
+        
         if self._component != None:                
             item.parent(self._component)
-            
-    def parent(self, parent):
+    
+    def remove(self, item):
+        """
+        @brief Removes an item from a layer.
+        
+        @var item: The drawable item that is to be removed from the layer.
         """
-        @brief Sets the parent of the Layer object.
-        @note Can only be called once.
+        if self._dirty:
+            self._flush({})
+        
+        self._items.remove(item)
+        if isinstance(item, Layer):
+            item._owner = None
+        
+        if (self.get_background_color(False) != "" and 
+            self.get_background_color(False) != "clear" and 
+            self._blended):
+            item.blend(remove=self.get_background_color(blended=False))
+        
+        for color in self.get_blend_colors():
+            item.blend(remove=color)
+        
+        item.set_visibility(False)
+    
+    def _realize(self, parent):
+        """
+        @brief Makes the component of the Layer (see Object.parent)
+        @note Can only be called once
         
         @var parent: The object the Layer will be on.
         """
         if self._component == None:
-            self._component = Tkinter.Frame(parent)
-
+            if self._dirty:
+                self._flush({})
+                
+            self._make("Frame", parent)
+            
             for item in self._items:
                 item.parent(self._component)
-                
-            self._parent() 
-                
             
+            self._parent() 
+    
+    
     def set_background_color(self, color):
         """
         @brief Overloaded background color set to include blending.
@@ -98,26 +178,129 @@ class Layer(Object):
         @var color: Color of the base background (before blending).
         """
         if self._blended:
-            for item in self._items:
-                item.blend(add=color, 
-                           remove=self.get_background_color(blended=False))
-                self._blendedBackground = True
-            
+            self._queue(color, 1)
+            self._queue(self.get_background_color(blended=False), -1)
+            self._blendedBackground = True
+        
         # The old method can carry on from here
         Object.set_background_color(self, color)
         
+        if self._component == None and self._pending:
+            # Handed down when the Layer is shown (or changed).
+            self._dirty = True
+            self._mark_owners()
+    
     def blend(self, add="", remove=""):
         """
         @brief Overloaded blend to propagate blend to all children 
-        of all sub-layers.
+        of all sub-layers (on the next idle callback).
         
         @var add: The color to be blended into the background.
         @var remove: The color to be taken out of the blend 
         (has to be in there already).
         """
-        for item in self._items:
-            item.blend(add=add, remove=remove)
+        if remove != "" and remove in (self._blend or {}):
+            self._mix(remove, -1)
+            self._queue(remove, -1)
+        
+        if add != "" and add != "clear":
+            self._mix(add, 1)
+            self._queue(add, 1)
+        
+        if self._component == None:
+            # Nothing is drawn yet, so the children get the changes when 
+            # the Layer is shown (or changed), and changes made until then 
+            # that cancel out are never handed down at all.
+            self._dirty = True
+            self._mark_owners()
+            return
+        
+        if not self._dirty:
+            self._dirty = True
+            self._mark_owners()
+            _dirty.append(self)
+        
+        if not _scheduled[0]:
+            _scheduled[0] = True
+            self._component.after_idle(_flush_dirty)
+    
+    def _queue(self, color, count):
+        """
+        @brief Remembers a color that still has to be blended into 
+        the children.
+        
+        @var color: The color.
+        @var count: How many times to add it (negative to take it out).
+        """
+        if color == "" or color == "clear":
+            return
+        
+        if self._pending == None:
+            self._pending = {}
             
-        # The old method can carry on from here
-        Object.blend(self, add=add, remove=remove)
-     
\ No newline at end of file
+        count += self._pending.get(color, 0)
+        if count == 0:
+            self._pending.pop(color, None)
+        else:
+            self._pending[color] = count
+    
+    def _mark_owners(self):
+        """
+        @brief Marks every Layer this one is in as having a dirty Layer 
+        below it.
+        """
+        owner = self._owner
+        while owner != None and not owner._dirty_below:
+            owner._dirty_below = True
+            owner = owner._owner
+    
+    def _owner_dirty(self):
+        """
+        @brief Determines if a Layer this one is in is waiting for a pass, 
+        in which case that pass will take care of this Layer too.
+        
+        @return True/False Whether or not a Layer above this one is dirty.
+        """
+        owner = self._owner
+        while owner != None:
+            if owner._dirty:
+                return True
+            owner = owner._owner
+        return False
+    
+    def _flush(self, changes):
+        """
+        @brief Blends the changes made above this Layer into it, redraws it, 
+        and hands them down to the children along with its own changes.
+        
+        @var changes: color -> count of the changes made to the Layers above.
+        @return How many objects were visited.
+        """
+        for color, count in changes.items():
+            self._mix(color, count)
+        
+        if self._pending:
+            changes = dict(changes)
+            for color, count in self._pending.items():
+                changes[color] = changes.get(color, 0) + count
+            self._pending = None
+        self._dirty = False
+        self._dirty_below = False
+        
+        if self._component != None:
+            self._paint()
+        
+        visited = 1
+        for item in self._items:
+            if isinstance(item, Layer):
+                if changes or item._dirty or item._dirty_below:
+                    visited += item._flush(changes)
+            elif changes:
+                for color, count in changes.items():
+                    item._mix(color, count)
+                if item.get_component() != None:
+                    item._paint()
+                visited += 1
+        
+        return visited
+
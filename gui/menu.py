@@ -10,7 +10,7 @@ A Menubar is that convenient bar at the top of a window
 which has all sorts of usefull menu options. 
 """
 
-import Tkinter
+import backend
 
 class MenuItem:
     """
@@ -66,7 +66,7 @@ class Menu:
         @var parent: What Widget the Menu will be placed in.
         """
         if self.__menu == None:
-            self.__menu = Tkinter.Menu(parent, tearoff=0)
+            self.__menu = backend.widget("Menu", parent, tearoff=0)
             for item in self.__menuitems:
                 item.parent(self.__menu)
             parent.add_cascade(label=self._name, menu=self.__menu)        
@@ -102,7 +102,7 @@ class MenuBar:
         @var parent: The Window the MenuBar will be on. 
         """
         if self._component == None:
-            self._component = Tkinter.Menu(parent)
+            self._component = backend.widget("Menu", parent)
         
             for menu in self.__menus:
                 menu.parent(self._component)
@@ -10,21 +10,40 @@ A MessageBox is multi-line TextBox which supports features such as
 tagged text formatting (different formating for text between tags). 
 """
 
+import collections
+
 from object import Object
 import Tkinter
 
+import backend
+import globals
+
 class MessageBox(Object):
     """
     @brief A multi-line Textbox with some extra features.
+    
+    The text is kept as the messages it was appended in, rather than one 
+    string, so appending never copies what is already there. Only the 
+    newest lines are kept (see set_scrollback), once there are too many the 
+    oldest are thrown away in one go.
     """
     
-    def __init__(self):
+    __slots__ = ("_records", "_lines", "_scrollback", "_top_command")
+    
+    def __init__(self, scrollback = globals.MESSAGE_SCROLLBACK):
         """
         @brief Creates a multi-line text box.
+        
+        @var scrollback: The most lines kept, 0 keeps them all.
         """
         Object.__init__(self)
-        self._text = ""
         
+        # (message, new lines in it), from the top of the text to the bottom
+        self._records = collections.deque()
+        self._lines = 0
+        self._scrollback = scrollback
+        self._top_command = None
+    
     def append(self, message = "", to="bottom"):
         """
         @brief Appends a message onto the existing message.
@@ -32,29 +51,154 @@ class MessageBox(Object):
         @var message: Message to be appended.
         @var to: Where to append it. (top, bottom)
         """
+        if not message:
+            return
+        
+        record = (message, message.count("\n"))
+        self._lines += record[1]
+        
         if to == "bottom":
-            self._text += message
-                
-        if to == "top":
-            self._text = message + self._text
-            
+            self._records.append(record)
+        elif to == "top":
+            self._records.appendleft(record)
+        
         if self._component != None:
-            self._component["state"]=Tkinter.NORMAL
+            self._set_options(state=Tkinter.NORMAL)
             if to == "bottom":
                 self._component.insert(Tkinter.END, message)
             elif to == "top":
                 self._component.insert("1.0", message)
-                
-            self._component["state"]=Tkinter.DISABLED
-                
-    def parent(self, parent):
+            
+            self._set_options(state=Tkinter.DISABLED)
+        
+        # Lines are let past the scrollback by a quarter of it before any
+        # are thrown away, so they go in bulk rather than one per append.
+        if (self._scrollback > 0 and 
+            self._lines > self._scrollback + self._scrollback / 4):
+            if to == "top":
+                self._trim("bottom")
+            else:
+                self._trim("top")
+    
+    def set_scrollback(self, lines):
+        """
+        @brief Sets how many lines are kept, the oldest (the top) are 
+        thrown away to make room for new ones.
+        
+        @var lines: The most lines kept, 0 keeps them all.
+        """
+        self._scrollback = lines
+        
+        if lines > 0 and self._lines > lines:
+            self._trim("top")
+    
+    def get_scrollback(self):
+        """
+        @brief Gets how many lines are kept.
+        
+        @return The most lines kept, 0 if they are all kept.
+        """
+        return self._scrollback
+    
+    def set_top_command(self, command):
+        """
+        @brief Sets what is called when the text is scrolled to the top 
+        (i.e. to fetch older messages).
+        
+        @var command: Called without any arguments, None calls nothing.
+        """
+        self._top_command = command
+        
+        if self._component != None:
+            self._set_options(yscrollcommand=self._scrolled)
+    
+    def show(self, index = Tkinter.END):
+        """
+        @brief Scrolls the text so a part of it is shown.
+        
+        @var index: Where in the text, i.e. "12.0" for the start of the 
+        twelfth line or Tkinter.END for the bottom.
+        """
+        if self._component != None:
+            self._component.see(index)
+    
+    def _scrolled(self, first, last):
+        """
+        @brief Called by the component whenever the shown part of the text 
+        changes.
+        
+        @var first: Where the shown part starts (0.0 to 1.0).
+        @var last: Where the shown part ends (0.0 to 1.0).
+        """
+        if self._top_command != None and float(first) <= 0.0:
+            self._top_command()
+    
+    def get_line_count(self):
+        """
+        @brief Gets how many lines the MessageBox holds.
+        
+        @return The number of new lines in the text.
+        """
+        return self._lines
+    
+    def get_message(self):
+        """
+        @brief Gets the text of the MessageBox.
+        
+        @return The text, without the lines that were thrown away.
+        """
+        return "".join([record[0] for record in self._records])
+    
+    def _trim(self, side):
+        """
+        @brief Throws away whole lines from one side until no more than the 
+        scrollback are left.
+        
+        @var side: The side the lines are thrown away from. (top, bottom)
+        """
+        excess = self._lines - self._scrollback
+        removed = 0
+        
+        if side == "top":
+            # Stop after a message that ends a line, so a line is never cut
+            # in half.
+            while self._records:
+                message, lines = self._records.popleft()
+                removed += lines
+                if removed >= excess and message.endswith("\n"):
+                    break
+            end = "%d.0" % (removed + 1)
+            first = "1.0"
+        else:
+            # Stop once the messages that are left end a line.
+            while self._records:
+                if (removed >= excess and 
+                    self._records[-1][0].endswith("\n")):
+                    break
+                removed += self._records.pop()[1]
+            end = Tkinter.END
+            first = "%d.0" % (self._lines - removed + 1)
+        
+        self._lines -= removed
+        if not self._records:
+            first, end = "1.0", Tkinter.END
+        
+        if self._component != None:
+            self._set_options(state=Tkinter.NORMAL)
+            self._component.delete(first, end)
+            self._set_options(state=Tkinter.DISABLED)
+    
+    def _realize(self, parent):
         """
-        @brief Sets the parent of the MessageBox
+        @brief Makes the component of the MessageBox (see Object.parent)
         @note Can only be called once
         
         @var parent The Widget that the MessageBox is to be placed on.
         """
-        self._component = Tkinter.Text(parent)
-        self._component["state"] = Tkinter.DISABLED
-        self.append(self._text)
-        self._parent()
\ No newline at end of file
+        self._component = backend.widget("Text", parent)
+        self._set_options(state=Tkinter.NORMAL)
+        self._component.insert(Tkinter.END, self.get_message())
+        self._set_options(state=Tkinter.DISABLED)
+        if self._top_command != None:
+            self._set_options(yscrollcommand=self._scrolled)
+        self._parent()
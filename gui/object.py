@@ -8,32 +8,73 @@
 The Object is an abstract class which all on screen objects will inherit from.
 """
 
-class Object:
+import contextlib
+
+import backend
+
+# color name -> (red, green, blue), shared by every Object so each color 
+# only has to be looked up through Tk once.
+_rgb = {}
+
+# class -> the background its components start with, only read from Tk 
+# for the first component of each class.
+_default_bg = {}
+
+class Object(object):
     """
     @brief All GUI classes share these specific methods and data.
+    
+    There can be a lot of Objects (a few for every contact), so they use 
+    __slots__ instead of a dictionary each, and the dictionaries and lists 
+    most of them never need are None until they are first used.
     """
+    
+    __slots__ = ("_component", "_container", "_options", "_border_width", 
+                 "_border_type", "_align", "_border_color", 
+                 "_background_color", "_position", "_column_growth_rate", 
+                 "_row_growth_rate", "_growth", "_width", "_blend", 
+                 "_blend_count", "_blend_sum", "_bg", "_binds", "_tags", 
+                 "_padding", "_visible", "_sticky", "_blended", 
+                 "_layout_depth", "_layout_changed", "_focus")
+    
     def __init__(self):
         """
         @brief Constructor for an abstract GUIobject visable
         """
         self._component = None
+        # what the component goes in, kept until the Object is first visible
+        self._container = None
+        # option -> value, a copy of every option set on (or read from) the 
+        # component, so unchanged values are never sent to Tk again
+        self._options = None
         self._border_width = 0
         self._border_type="flat"
         self._align = "grid"
         self._border_color = ""
         self._background_color = ""
-        self._position = [0,0]
-        self._column_growth_rate = dict()
-        self._row_growth_rate = dict()
-        self._growth = [False, False]
+        self._position = (0,0)
+        self._column_growth_rate = None
+        self._row_growth_rate = None
+        self._growth = (False, False)
         self._width = 0
-        self._blend = []
-        self._binds = []
-        self._padding = [0,0]
+        # color -> how many times it is blended in, and the sum of the 
+        # (red, green, blue) of all of them (None when it needs adding up)
+        self._blend = None
+        self._blend_count = 0
+        self._blend_sum = None
+        self._bg = ""
+        self._binds = None
+        self._tags = None
+        self._padding = (0,0)
         self._visible = True
         self._sticky = ""
         self._blended = True
         
+        # How many layout changes are being held back, and whether or not 
+        # the layout has to be sent to Tk once they are done.
+        self._layout_depth = 0
+        self._layout_changed = False
+        
         self._focus = False
         
     def bind(self, event, procedure):
@@ -46,15 +87,87 @@ class Object:
         """
         if self._component != None:
             self._component.bind(event, procedure)
+        elif self._binds == None:
+            self._binds = [(event, procedure)]
         else:
             self._binds.append((event, procedure))
         
+    def add_tag(self, tag):
+        """
+        @brief Adds a shared set of bindings to the Object.
+        @note Use Tag.add, which calls this.
+        
+        @var tag: The Tag.
+        """
+        if self._component != None:
+            tag._attach(self)
+        elif self._tags == None:
+            self._tags = [tag]
+        else:
+            self._tags.append(tag)
+        
     def get_component(self):
         """
         @brief returns the component of a GUIobject that can actually be drawn.
         """
         return self._component
     
+    def parent(self, parent):
+        """
+        @brief Sets the parent of the Object.
+        The component isn't made until the Object is visible, so hidden 
+        objects (and everything in them) cost nothing until they are shown. 
+        Bindings, colors and options set in the meantime are kept and 
+        applied then.
+        @note Can only be called once.
+        
+        @var parent: The Widget that the Object is to be placed on.
+        """
+        if self._component != None or self._container != None:
+            return
+            
+        self._container = parent
+        
+        if self._visible:
+            self._realize(parent)
+            
+    def _realize(self, parent):
+        """
+        @brief Abstract method that makes the component of the Object.
+        
+        @var parent: The Widget that the Object is to be placed on.
+        """
+        pass
+        
+    def _make(self, kind, parent, **options):
+        """
+        @brief Makes the component with every option that is already known 
+        (the border, width and background too), all in the one call to Tk.
+        
+        @var kind: The name of the Tkinter class (Frame, Label, Button, ...)
+        @var parent: The Widget that the Object is to be placed on.
+        @var options: The options only this kind of Object has.
+        """
+        options["bd"] = self._border_width
+        options["relief"] = self._border_type
+        if self._width > 0:
+            options["width"] = self._width
+        known = dict(options)
+        
+        default = _default_bg.get(type(self))
+        if default != None:
+            known["bg"] = default
+            if self._border_color == "":
+                self._border_color = default
+                
+        if self._border_color != "":
+            bg = self._background()
+            if bg != None and bg != default:
+                options["bg"] = known["bg"] = bg
+        
+        self._component = backend.widget(kind, parent, **options)
+        self._options = known
+        
     def _parent(self):
         """
         @brief Abstract parent method. 
@@ -62,12 +175,15 @@ class Object:
         method. (See parent methods of children classes)
         """
         
-        # for efficiency
-        tmpVis = self.get_visibility()
-        self.set_visibility(False)
+        # for efficiency, the layout only reaches Tk once at the end
+        self.begin_layout()
         
-        for b in self._binds:
+        for b in self._binds or []:
             self._component.bind(b[0], b[1])
+            
+        for tag in self._tags or []:
+            tag._attach(self)
+        self._binds = self._tags = None
          
         self.column_growth_rate()   
         #for i in self._colGrowthRate:
@@ -80,20 +196,21 @@ class Object:
         self.set_growth()
         self.set_padding()
         
-        self._component["bd"] = self._border_width
+        options = {"bd": self._border_width, "relief": self._border_type}
+        if self._width > 0:
+            options["width"] = self._width
+        self._set_options(**options)
         
         if self._border_color == "":
-            self._border_color = self._component["bg"]
+            read = self._options == None or "bg" not in self._options
+            self._border_color = self._get_option("bg")
+            if read:
+                _default_bg[type(self)] = self._border_color
             
         self.set_background_color(self._border_color)
-        
-        if self._width > 0:
-            self._component["width"] = self._width
-            
-        self.set_border_type(self._border_type)
         self.set_align(self._align)
         
-        self.set_visibility(tmpVis)
+        self.end_layout()
             
     def set_visibility(self, visible):
         """
@@ -104,8 +221,12 @@ class Object:
         
         if self._visible != visible:
             self._visible = visible
-        
-            if self._component != None:
+            
+            if (visible and self._component == None and 
+                self._container != None):
+                self._realize(self._container)
+                
+            elif self._component != None:
                 if visible == False:
                     if self._align == "pack":
                         self._component.forget()
@@ -137,6 +258,8 @@ class Object:
         """
         
         if column != -1:
+            if self._column_growth_rate == None:
+                self._column_growth_rate = {}
             self._column_growth_rate[column] = growthRate
         
         if self._component != None:
@@ -149,6 +272,8 @@ class Object:
         @var growthRate: weight value that determines the growth rate of a row.
         """
         if row != -1:
+            if self._row_growth_rate == None:
+                self._row_growth_rate = {}
             self._row_growth_rate[row] = growthRate
             
         if self._component != None:
@@ -168,9 +293,9 @@ class Object:
         @todo Packed objects can't grow, only Grid objects can.
         """
         if width != -1:
-            self._growth[0] = width
+            self._growth = (width, self._growth[1])
         if height != -1:
-            self._growth[1] = height
+            self._growth = (self._growth[0], height)
             
         if self._align == "grid" and self._component != None:
             
@@ -193,9 +318,9 @@ class Object:
         @var y: Padding on the top and bottom sides (-1 means don't change it)
         """
         if x != -1:
-            self._padding[0] = x
+            self._padding = (x, self._padding[1])
         if y != -1:
-            self._padding[1] = y
+            self._padding = (self._padding[0], y)
             
         if self._component != None:
             self._configure()
@@ -221,7 +346,7 @@ class Object:
         @var width: The new width of the border.
         """
         if self._component != None:
-            self._component["bd"] = width
+            self._set_options(bd=width)
             
         self._border_width = width
         
@@ -232,7 +357,7 @@ class Object:
         @return The current border width.
         """
         if self._component != None:
-            return self._component["bd"]
+            return self._get_option("bd")
         return self._border_width
     
     def set_border_type(self, type):
@@ -243,7 +368,7 @@ class Object:
         """
         self._border_type = type
         if self._component != None:
-            self._component["relief"] = type
+            self._set_options(relief=type)
                 
     def set_background_color(self, color):
         """
@@ -281,44 +406,140 @@ class Object:
         """
             
         if remove != "":
-            try:
-                self._blend.remove(remove)
-            except:
-                pass
+            self._mix(remove, -1)
             
         if add != "" and add != "clear":
-            self._blend.append(add)
+            self._mix(add, 1)
         
         if self._component != None:
-            r=g=b=0
-            count = len(self._blend)
-            
-            # Add up all colors
-            for c in self._blend:
-                tmp = self._component.winfo_rgb(c)
-                r+= tmp[0]
-                g+= tmp[1]
-                b+= tmp[2]
+            self._paint()
+            
+    def _mix(self, color, count):
+        """
+        @brief Adds a color to (or takes it out of) the blend without 
+        redrawing anything.
+        
+        @var color: The color to be blended in.
+        @var count: How many times to add it (negative to take it out, 
+        as long as it is in there).
+        """
+        if self._blend == None:
+            self._blend = {}
+            
+        if count < 0:
+            count = -min(-count, self._blend.get(color, 0))
+            
+        if count == 0:
+            return
+            
+        self._blend[color] = self._blend.get(color, 0) + count
+        if self._blend[color] == 0:
+            del self._blend[color]
+            
+        self._blend_count += count
+        self._add_rgb(color, count)
+        
+    def _paint(self):
+        """
+        @brief Draws the blended background color.
+        """
+        bg = self._background()
+        if bg != None:
+            self._set_options(bg=bg)
+            
+    def _background(self):
+        """
+        @brief Works out the blended background color.
+        
+        @return The color, None if there is nothing to draw (no blended 
+        colors and a clear base background) or a color that was never 
+        looked up can't be yet.
+        """
+        count = self._blend_count
+        if self._border_color != "clear":
+            count += 1
+        
+        # If there is no blended colors and a clear base background, 
+        # then leave it alone!
+        if count == 0:
+            return None
+        
+        if self._blended != True:
+            return self._border_color
+            
+        if self._blend_count == 0:
+            # Only the base color, which doesn't need looking up.
+            self._bg = self._border_color
+            return self._bg
+            
+        if self._blend_sum == None:
+            # Colors were blended in before they could be looked up.
+            self._blend_sum = [0, 0, 0]
+            for color, count in (self._blend or {}).items():
+                self._add_rgb(color, count)
+            if self._blend_sum == None:
+                return None
                 
-            # Add in current background color
-            if self._border_color != "clear":
-                bg = self._component.winfo_rgb(self._border_color)
-                count += 1
-                r+= bg[0]
-                g+= bg[1]
-                b+= bg[2]
-            
-            # If there is no blended colors and a clear base background, 
-            # then leave it alone!
-            if count != 0:
-                self._bg = "#%04x%04x%04x" %(r/count,g/count,b/count)
+        r, g, b = self._blend_sum
+        count = self._blend_count
+            
+        # Add in current background color
+        if self._border_color != "clear":
+            bg = self._get_rgb(self._border_color)
+            if bg == None:
+                return None
+            count += 1
+            r+= bg[0]
+            g+= bg[1]
+            b+= bg[2]
+        
+        self._bg = "#%04x%04x%04x" %(r/count,g/count,b/count)
+        return self._bg
                 
-                if self._blended == True:
-                    self._component["bg"] = self._bg
-                else:
-                    self._component["bg"] = self._border_color
+    def get_blend_colors(self):
+        """
+        @brief Gets every color blended into the background.
+        
+        @return A list of the colors (a color blended in twice is listed twice)
+        """
+        colors = []
+        for color, count in (self._blend or {}).items():
+            colors += [color] * count
+        return colors
+        
+    def _get_rgb(self, color):
+        """
+        @brief Looks up the (red, green, blue) value of a color, only asking 
+        Tk the first time a color is seen.
         
+        @var color: The name of the color.
+        @return A tuple of (red, green, blue), None if the color has never 
+        been seen and this Object can't ask Tk yet.
+        """
+        rgb = _rgb.get(color)
+        if rgb == None and self._component != None:
+            rgb = _rgb[color] = self._component.winfo_rgb(color)
+        return rgb
+        
+    def _add_rgb(self, color, count):
+        """
+        @brief Adds a color to the running (red, green, blue) sum.
+        
+        @var color: The name of the color.
+        @var count: How many times to add it (negative to take it out).
+        """
+        if self._blend_sum == None:
+            return
+            
+        rgb = self._get_rgb(color)
+        if rgb == None:
+            self._blend_sum = None
+            return
             
+        self._blend_sum[0] += rgb[0] * count
+        self._blend_sum[1] += rgb[1] * count
+        self._blend_sum[2] += rgb[2] * count
+        
     def get_background_color(self, blended=True):
         """
         @brief Gets the color of the background of the Object.
@@ -328,7 +549,7 @@ class Object:
         @return The current color of the background of the Object.
         """
         if self._component != None and blended:
-            return self._component["bg"]
+            return self._get_option("bg")
         return self._border_color
     
     def set_position(self, pos):
@@ -359,15 +580,84 @@ class Object:
         @var width New width of the object.
         """
         if self._component != None:
-            self._component["width"] = width
+            self._set_options(width=width)
 
         self._width = width
         
+    def _set_options(self, **options):
+        """
+        @brief Sets options of the component, only the ones that are 
+        actually changing are sent to Tk (all in one go).
+        
+        @var options: option -> new value.
+        """
+        if self._options == None:
+            self._options = {}
+            
+        changed = {}
+        for option, value in options.items():
+            if option not in self._options or self._options[option] != value:
+                changed[option] = value
+                
+        if changed:
+            self._options.update(changed)
+            self._component.configure(**changed)
+            
+    def _get_option(self, option):
+        """
+        @brief Gets an option of the component, Tk is only asked the first 
+        time an option that was never set is read.
+        
+        @var option: The name of the option.
+        @return The value of the option.
+        """
+        if self._options == None:
+            self._options = {}
+            
+        if option not in self._options:
+            self._options[option] = self._component[option]
+        return self._options[option]
+        
+    def begin_layout(self):
+        """
+        @brief Holds back changes to the position, alignment, padding and 
+        growth of the object until end_layout is called, so a lot of 
+        changes only reach Tk once. Can be nested.
+        """
+        self._layout_depth += 1
+        
+    def end_layout(self):
+        """
+        @brief Sends the layout changes held back since begin_layout to Tk 
+        (once the outermost begin_layout is ended).
+        """
+        self._layout_depth -= 1
+        
+        if self._layout_depth == 0 and self._layout_changed:
+            self._layout_changed = False
+            self._configure()
+            
+    @contextlib.contextmanager
+    def layout(self):
+        """
+        @brief begin_layout/end_layout for a with statement.
+        i.e. with item.layout(): item.set_position(...); item.set_padding(...)
+        """
+        self.begin_layout()
+        try:
+            yield self
+        finally:
+            self.end_layout()
+        
     def _configure(self):
         """
         @brief Internal function that should not be called outside of here. 
         It is what actually draws the objects on screen.
         """
+        if self._layout_depth > 0:
+            self._layout_changed = True
+            return
+            
         if self._visible:
             if self._align == "pack":
                 self._component.pack()
@@ -380,10 +670,10 @@ class Object:
              
             # Even if this item is packed or exists without packaging, 
             # doesn't mean the children aren't packaged!   
-            for row, rate in self._row_growth_rate.items():
+            for row, rate in (self._row_growth_rate or {}).items():
                 self._component.grid_rowconfigure(row, weight=rate)
                     
-            for column, rate in self._column_growth_rate.items():
+            for column, rate in (self._column_growth_rate or {}).items():
                 self._component.grid_columnconfigure(column, weight=rate)
                     
 
@@ -0,0 +1,193 @@
+"""
+@file Scheduler.py
+@date 10/18/2026
+@version 0.1
+
+@brief Scheduler source code.
+
+Changes to what is on screen are queued and made once per frame, when the
+main loop is idle. A frame only runs for so long, whatever is left is
+done in the frames after it, so a burst of changes never keeps the main
+loop from handling input for longer than that.
+"""
+
+import collections
+import time
+
+import globals
+
+class Scheduler:
+    """
+    @brief Queues changes to the screen and makes them a frame at a time.
+    
+    A change queued with a key replaces the change with the same key that
+    is still waiting (keeping its place in the queue), so only the last
+    nickname set before a frame is drawn, for example.
+    """
+    
+    def __init__(self, app = None, budget = globals.FRAME_BUDGET):
+        """
+        @brief Creates an empty Scheduler.
+        
+        @var app: The application whose main loop runs the frames,
+        None makes every change right away.
+        @var budget: The most milliseconds a frame runs for.
+        """
+        self._app = app
+        self._budget = budget
+        
+        # key -> (procedure, arguments), in the order they were queued
+        self._queue = collections.OrderedDict()
+        self._calls = 0
+        self._scheduled = False
+        
+        self.reset()
+    
+    def set_app(self, app):
+        """
+        @brief Sets the application whose main loop runs the frames.
+        
+        @var app: The application, None makes every change right away.
+        """
+        self._app = app
+        
+        if app == None:
+            self.flush()
+    
+    def set_budget(self, budget):
+        """
+        @brief Sets how long a frame can run for.
+        
+        @var budget: The most milliseconds a frame runs for
+        (at least one change is always made).
+        """
+        self._budget = budget
+    
+    def get_budget(self):
+        """
+        @brief Gets how long a frame can run for.
+        
+        @return The budget in milliseconds.
+        """
+        return self._budget
+    
+    def schedule(self, key, procedure, *arguments):
+        """
+        @brief Queues a change for the next frame.
+        
+        @var key: What is being changed (i.e. (id(member), "nickname")),
+        None if it shouldn't replace anything.
+        @var procedure: Called as procedure(*arguments) to make the change.
+        """
+        if key == None:
+            self._calls += 1
+            key = (None, self._calls)
+        elif key in self._queue:
+            self._collapsed += 1
+        
+        self._queue[key] = (procedure, arguments)
+        self._queued += 1
+        
+        if self._app == None:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            self._app.after_idle(self._frame)
+    
+    def cancel(self, key):
+        """
+        @brief Takes a change out of the queue.
+        
+        @var key: What the change was queued with.
+        """
+        self._queue.pop(key, None)
+    
+    def flush(self, budget = None):
+        """
+        @brief Makes the queued changes.
+        
+        @var budget: The most milliseconds to spend, None makes them all.
+        @return How many changes were made.
+        """
+        if budget != None:
+            deadline = time.time() + budget / 1000.0
+        
+        flushed = 0
+        while self._queue:
+            key, (procedure, arguments) = self._queue.popitem(last=False)
+            procedure(*arguments)
+            flushed += 1
+            self._flushed += 1
+            
+            if budget != None and time.time() >= deadline:
+                break
+        
+        return flushed
+    
+    def _frame(self):
+        """
+        @brief Makes as many changes as fit in the budget, leaving the rest
+        for the next frame.
+        """
+        self._scheduled = False
+        self._frames += 1
+        
+        try:
+            self.flush(self._budget)
+        finally:
+            if self._queue:
+                self._deferred += len(self._queue)
+                self._scheduled = True
+                # A timer rather than after_idle, so waiting input is
+                # handled before the next frame.
+                self._app.after(1, self._frame)
+    
+    def pending(self):
+        """
+        @brief How many changes are waiting.
+        
+        @return The number of queued changes.
+        """
+        return len(self._queue)
+    
+    def stats(self):
+        """
+        @brief Counters of what the Scheduler has done.
+        
+        @return A dictionary with queued (changes queued), collapsed
+        (changes replaced before they were made), flushed (changes made),
+        deferred (changes left for a later frame, once per frame they
+        waited) and frames (how many frames ran).
+        """
+        return {"queued": self._queued,
+                "collapsed": self._collapsed,
+                "flushed": self._flushed,
+                "deferred": self._deferred,
+                "frames": self._frames}
+    
+    def reset(self):
+        """
+        @brief Sets every counter back to zero.
+        """
+        self._queued = 0
+        self._collapsed = 0
+        self._flushed = 0
+        self._deferred = 0
+        self._frames = 0
+
+# The Scheduler the gui is drawn with.
+_scheduler = Scheduler()
+
+def get():
+    """
+    @brief Gets the Scheduler shared by the whole gui.
+    
+    @return The Scheduler.
+    """
+    return _scheduler
+
+def schedule(key, procedure, *arguments):
+    """
+    @brief Queues a change with the shared Scheduler (see Scheduler.schedule)
+    """
+    _scheduler.schedule(key, procedure, *arguments)
@@ -0,0 +1,75 @@
+"""
+@file ScrollBar.py
+@date 10/18/2026
+@version 0.1
+
+@brief ScrollBar source code.
+
+A ScrollBar lets the user move through something that is too big to fit on 
+screen. It doesn't scroll anything itself, it just tells whoever is 
+listening where the user wants to go.
+"""
+
+from object import Object
+import Tkinter
+
+class ScrollBar(Object):
+    """
+    @brief A vertical scroll bar.
+    """
+    
+    __slots__ = ("_command", "_view")
+    
+    def __init__(self, pos = (0,0), command = None):
+        """
+        @brief Constructs a ScrollBar (not displayed until added to something)
+        
+        @var pos: Tuple of size 2 indicating position. i.e. (50,50)
+        @var command: Called with the scroll bar's arguments when the user 
+        moves it, either ("moveto", fraction) or ("scroll", amount, what) 
+        where what is "units" or "pages".
+        """
+        Object.__init__(self)
+        
+        self._command = command
+        self._view = (0.0, 1.0)
+        
+        self.set_position(pos)
+    
+    def set_view(self, first, last):
+        """
+        @brief Sets what part of the whole is currently shown.
+        
+        @var first: Where the shown part starts (0.0 to 1.0).
+        @var last: Where the shown part ends (0.0 to 1.0).
+        """
+        if (first, last) == self._view:
+            return
+        
+        self._view = (first, last)
+        if self._component != None:
+            self._component.set(first, last)
+    
+    def get_view(self):
+        """
+        @brief Gets what part of the whole is currently shown.
+        
+        @return A tuple of (first, last).
+        """
+        return self._view
+    
+    def _realize(self, parent):
+        """
+        @brief Makes the component of the ScrollBar (see Object.parent)
+        @note Can only be called once
+        
+        @var parent The Widget that the ScrollBar is to be placed on.
+        """
+        if self._component == None:
+            options = {"orient": Tkinter.VERTICAL}
+            if self._command != None:
+                options["command"] = self._command
+            self._make("Scrollbar", parent, **options)
+            self._component.set(*self._view)
+            
+            self._parent()
@@ -0,0 +1,123 @@
+"""
+@file Tag.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tag source code.
+
+A Tag lets many Objects share the same bindings. Instead of every Object
+binding its own events, the events are bound once to the Tag (a Tk bind
+tag) and the Tag works out which Object the event happened on.
+"""
+
+class Tag:
+    """
+    @brief Bindings shared by many Objects.
+    
+    Every Object added to a Tag is given a value (i.e. the row it is part
+    of), procedures bound to the Tag are called with the event and the
+    value of the Object the event happened on.
+    """
+    
+    _tags = 0
+    
+    def __init__(self):
+        """
+        @brief Creates a Tag without any Objects or bindings.
+        """
+        Tag._tags += 1
+        self._name = "tag%d" % Tag._tags
+        
+        self._binds = []
+        # Objects that were added before they had a component -> value
+        self._waiting = {}
+        # widget path -> value
+        self._values = {}
+        # Any widget, used to bind to the tag.
+        self._widget = None
+    
+    def get_name(self):
+        """
+        @brief Gets the name of the Tk bind tag.
+        
+        @return The name of the tag.
+        """
+        return self._name
+    
+    def bind(self, event, procedure):
+        """
+        @brief When the event occurs on any Object in the Tag, the procedure
+        will be called.
+        
+        @var event: Any event that can occur such as a key press.
+        @var procedure: Called as procedure(event, value), where value is
+        what the Object the event happened on was added with.
+        """
+        self._binds.append((event, procedure))
+        
+        if self._widget != None:
+            self._bind(event, procedure)
+    
+    def add(self, item, value):
+        """
+        @brief Adds an Object to the Tag.
+        
+        @var item: The Object.
+        @var value: What the bound procedures are given when an event
+        happens on the Object.
+        """
+        self._waiting[item] = value
+        item.add_tag(self)
+    
+    def remove(self, item):
+        """
+        @brief Takes an Object out of the Tag, its events are no longer
+        handed to the bound procedures.
+        
+        @var item: The Object.
+        """
+        self._waiting.pop(item, None)
+        
+        if item.get_component() != None:
+            self._values.pop(str(item.get_component()), None)
+    
+    def _attach(self, item):
+        """
+        @brief Adds the tag to the bind tags of an Object's component.
+        @note Called by the Object once it has a component.
+        
+        @var item: The Object.
+        """
+        component = item.get_component()
+        
+        tags = component.bindtags()
+        component.bindtags((tags[0], self._name) + tuple(tags[1:]))
+        
+        self._values[str(component)] = self._waiting.pop(item, None)
+        
+        if self._widget == None:
+            self._widget = component
+            for event, procedure in self._binds:
+                self._bind(event, procedure)
+    
+    def _bind(self, event, procedure):
+        """
+        @brief Binds a procedure to the Tk bind tag.
+        
+        @var event: The event.
+        @var procedure: The procedure.
+        """
+        self._widget.bind_class(self._name, event,
+            lambda event: self._dispatch(event, procedure))
+    
+    def _dispatch(self, event, procedure):
+        """
+        @brief Hands an event to a procedure along with the value of the
+        Object it happened on.
+        
+        @var event: The event.
+        @var procedure: The procedure.
+        """
+        value = self._values.get(str(event.widget))
+        if value != None:
+            return procedure(event, value)
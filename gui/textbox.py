@@ -13,13 +13,17 @@ a label.
 """
 
 from object import Object
-import Tkinter
+
+# justify -> the anchor of the text
+_ANCHORS = {"left": "w", "right": "e", "center": "center"}
 
 class TextBox(Object):
     """
     @brief A way of displaying information onto Widgets
     """
     
+    __slots__ = ("_text", "_forecolor", "_justified")
+    
     def __init__(self, text="", pos = (0,0), align="grid", 
                  width = 0, justify="center"):
         """
@@ -54,13 +58,8 @@ class TextBox(Object):
         @return What the current alignment of the text is.
         """
         self._justified = justify
-        if self._component != None:
-            if self._justified == "left":
-                self._component["anchor"]="w"
-            elif self._justified == "right":
-                self._component["anchor"]="e"
-            elif self._justified == "center":
-                self._component["anchor"]="center"
+        if self._component != None and self._justified in _ANCHORS:
+            self._set_options(anchor=_ANCHORS[self._justified])
                 
         return self._justified
     
@@ -71,7 +70,7 @@ class TextBox(Object):
         @var message: New message to be displayed.
         """
         if self._component != None:
-            self._component["text"] = text
+            self._set_options(text=text)
 
         self._text = text
         
@@ -82,7 +81,7 @@ class TextBox(Object):
         @return What is currently in the TextBox
         """
         if self._component != None:
-            return self._component["text"]
+            return self._get_option("text")
         return self._text
     
     def set_foreground_color(self, color):
@@ -94,7 +93,7 @@ class TextBox(Object):
         Tkinter provides other valid methods for specifying color)
         """
         if self._component != None:
-            self._component["fg"] = color
+            self._set_options(fg=color)
             
         self._forecolor = color 
             
@@ -105,23 +104,24 @@ class TextBox(Object):
         @return The current color of the text.
         """
         if self._component != None:
-            return self._component["fg"]
+            return self._get_option("fg")
         return self._forecolor
             
     
-    def parent(self, parent):
+    def _realize(self, parent):
         """
-        @brief Sets the parent of the TextBox
+        @brief Makes the component of the TextBox (see Object.parent)
         @note Can only be called once
         
         @var parent The Widget that the TextBox is to be placed on.
         """
         if self._component == None:
-            self._component = Tkinter.Label(parent, text=self._text)
-            self.justify(self._justified)
-            
+            options = {"text": self._text}
+            if self._justified in _ANCHORS:
+                options["anchor"] = _ANCHORS[self._justified]
             if self._forecolor != "":
-                self._component["fg"] = self._forecolor
-
+                options["fg"] = self._forecolor
+                
+            self._make("Label", parent, **options)
             self._parent()
             
\ No newline at end of file
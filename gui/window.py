@@ -10,17 +10,121 @@ A Window is an object that does not need a parent,
 as it is not placed onto anything.
 """
 
+import select
+
 import Tkinter
-from object import Object
 
-"""
-@note Tk is a class in Tkinter in charge of the whole application. 
-This makes App an alias to it.
-@note The run method is the only method that will be used by App, 
-and is therefore important that it exists. (i.e. if you port it)
-"""
-App = Tkinter.Tk    
+import backend
+import globals
+from object import Object
 
+class App(Tkinter.Tk):
+    """
+    @brief The whole application (Tk's root window and main loop).
+    
+    Besides running the main loop, an App can watch file descriptors 
+    (i.e. sockets) and call back into the main loop only when they have 
+    something to read, so network I/O never needs a polling timer.
+    
+    @note The mainloop method is the only method that will be used by 
+    CalamityApp, and is therefore important that it exists. 
+    (i.e. if you port it)
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """
+        @brief Creates the application. Takes the same arguments as Tk.
+        """
+        Tkinter.Tk.__init__(self, *args, **kwargs)
+        self._readers = {}
+        # Descriptors Tk can't watch, polled from the main loop instead.
+        self._polled = set()
+        # The ones of those that are also watched for being writable.
+        self._writers = set()
+        self._polling = None
+        
+    def add_reader(self, fd, callback, writable=False):
+        """
+        @brief Calls callback (with no arguments) from within the main loop 
+        every time fd becomes readable.
+        
+        @var fd: A file descriptor (or anything with a fileno method).
+        @var callback: The function/method to call.
+        @var writable: True to also call it while fd is writable 
+        (i.e. a socket that is still connecting), until add_reader is 
+        called again without it.
+        """
+        if hasattr(fd, "fileno"):
+            fd = fd.fileno()
+            
+        self.remove_reader(fd)
+        self._readers[fd] = callback
+        
+        mask = Tkinter.READABLE
+        if writable:
+            mask |= Tkinter.WRITABLE
+        
+        try:
+            self.tk.createfilehandler(fd, mask, self._readable)
+        except (AttributeError, Tkinter.TclError):
+            # No file handlers on this platform (Windows), Tk can only be
+            # called from the main thread, so the main loop checks them 
+            # every so often.
+            self._polled.add(fd)
+            if writable:
+                self._writers.add(fd)
+            if self._polling == None:
+                self._polling = self.after(globals.READER_POLL_INTERVAL, 
+                                           self._poll_readers)
+            
+    def remove_reader(self, fd):
+        """
+        @brief Stops watching a file descriptor.
+        
+        @var fd: A file descriptor previously given to add_reader.
+        """
+        if hasattr(fd, "fileno"):
+            fd = fd.fileno()
+            
+        if fd in self._readers:
+            del self._readers[fd]
+            if fd in self._polled:
+                self._polled.discard(fd)
+                self._writers.discard(fd)
+                return
+            try:
+                self.tk.deletefilehandler(fd)
+            except (AttributeError, Tkinter.TclError):
+                pass
+                
+    def _readable(self, fd, mask):
+        """
+        @brief Called by Tk when a watched file descriptor is readable
+        (or writable, if it was asked for).
+        
+        @var fd: The readable file descriptor.
+        @var mask: What happened to it (READABLE and/or WRITABLE).
+        """
+        if fd in self._readers:
+            self._readers[fd]()
+            
+    def _poll_readers(self):
+        """
+        @brief Calls back every polled file descriptor that is readable
+        (or writable), for as long as there are any.
+        """
+        self._polling = None
+        if len(self._polled) == 0:
+            return
+        
+        readable, writable, _ = select.select(list(self._polled), 
+                                              list(self._writers), [], 0)
+        for fd in set(readable) | set(writable):
+            self._readable(fd, Tkinter.READABLE)
+        
+        if len(self._polled) > 0 and self._polling == None:
+            self._polling = self.after(globals.READER_POLL_INTERVAL, 
+                                       self._poll_readers)
         
 class PopUp(Tkinter.Toplevel):
     """
@@ -53,6 +157,8 @@ class Window(Object):
     """
     _windows = 0
     
+    __slots__ = ("_bColor",)
+    
     def __init__(self, title = "Title", app = None):
         """
         @brief Constructs a top level Window with obvious binds already done. 
@@ -65,7 +171,7 @@ class Window(Object):
         Object.__init__(self)
         
         if Window._windows != 0:
-            self._component = Tkinter.Toplevel()
+            self._component = backend.widget("Toplevel", None)
         else:
             self._component = app
             
@@ -89,4 +195,16 @@ class Window(Object):
                 item.blend(self.get_background_color(blended=False))
             except:
                 pass
-            
\ No newline at end of file
+                
+    def set_close_command(self, procedure):
+        """
+        @brief When the user closes the Window, the procedure will be called
+        before it is destroyed.
+        
+        @var procedure: A function or method that takes no arguments.
+        """
+        def close():
+            procedure()
+            self._component.destroy()
+            
+        self._component.protocol("WM_DELETE_WINDOW", close)
@@ -10,4 +10,9 @@ sending messages to specific
 networks (such as MSN).
 """
 
-from connection import Connection
\ No newline at end of file
+from connection import Connection
+from engine import Engine
+from framer import Framer, FrameError
+from dispatcher import Dispatcher
+from switchboard import Switchboard
+import switchboard
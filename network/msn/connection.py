@@ -13,6 +13,10 @@ import ssl
 import hashlib
 
 import calamity 
+from engine import Engine
+from framer import Framer
+from dispatcher import Dispatcher
+from switchboard import Switchboard
 
 def get_ticket(challange, password, email):
     """
@@ -59,19 +63,27 @@ def get_ticket(challange, password, email):
     
     return rec[x:y]
 
-def recv(map, sock, waitfor = -1):
+def recv(map, sock, waitfor = -1, framer = None):
     """
     @brief Receives from the socket and maps the responses by TID in the map.
     
     @var map: Where the responses are stored.
     @var sock: Where the responses are read from.
     @var waitfor: Wait for a specific TID message before continuing
+    @var framer: The Framer of the socket, keeps commands that were cut off 
+    for the next call.
     """
+    if framer == None:
+        framer = Framer()
+        
     recieved = False
     while not recieved:
-        for line in sock.recv(4096).split("\n"):
-            if line != "":
-                map[int(line.split(" ")[1])]= line
+        if framer.recv_into(sock) == 0:
+            raise ValueError("The server closed the connection!")
+            
+        for command, payload in framer:
+            if len(command) > 1:
+                map[int(command[1])] = " ".join(command)
             
         if waitfor != -1:
             try:
@@ -87,12 +99,16 @@ class Connection:
     @brief Connection to the msn server
     """
     
-    def __init__(self, email, password):
+    def __init__(self, email, password, engine=None, sock=None):
         """
         @brief Sets up the connection to the MSN Server
         
         @var email: The email address of the person signing in.
         @var password: The password of the person signing in.
+        @var engine: The Engine that watches the notification socket 
+        (a new one is made if not given).
+        @var sock: An already signed in notification server socket, 
+        skips the sign in process if given.
         """
         # Number to keep me in sync with MSN server
         self._sync = 0
@@ -101,14 +117,94 @@ class Connection:
         self._socket = None
         self._email = email
         self._password = password
-        self._data = ""
-        self._connect()
+        self._framer = Framer()
+        if sock == None:
+            self._connect()
+        else:
+            self._socket = sock
         self._app = None
-        self._socket.send("SYN %d %d\n"%(self._tid, self._sync))
+        self.__app = None
+        self._switchboard = None
+        # tid of an XFR -> called with the address and cookie it gave
+        self._transfers = {}
+        self._socket.setblocking(False)
+        
+        if engine == None:
+            engine = Engine()
+        self._engine = engine
+        self._dispatcher = Dispatcher()
+        self._dispatcher.register("LSG", self._on_group)
+        self._dispatcher.register("LST", self._on_member)
+        self._dispatcher.register("SYN", self._on_sync)
+        self._dispatcher.register("CHL", self._on_challenge)
+        self._dispatcher.register(["NLN", "ILN"], self._on_online)
+        self._dispatcher.register("FLN", self._on_offline)
+        self._dispatcher.register("XFR", self._on_transfer)
+        self._dispatcher.register("RNG", self._on_ring)
+        
+        self._channel = engine.add(self._socket, self._dispatcher.dispatch, 
+                                   framer=self._framer)
+        
+        self._send("SYN %d %d\n"%(self._tid, self._sync))
         self._tid+=1
-        self._socket.send("CHG %d HDN 0\n"%self._tid)
+        self._send("CHG %d HDN 0\n"%self._tid)
         self._tid+=1
-        self._socket.setblocking(False)
+        
+    def get_engine(self):
+        """
+        @brief Gets the Engine that watches the notification socket.
+        
+        @return The Engine of this Connection.
+        """
+        return self._engine
+        
+    def get_email(self):
+        """
+        @brief Gets the email of the person signed in.
+        
+        @return The email of this Connection.
+        """
+        return self._email
+        
+    def get_switchboard(self):
+        """
+        @brief Gets the Switchboard messages are sent through 
+        (made the first time it is asked for).
+        
+        @return The Switchboard of this Connection.
+        """
+        if self._switchboard == None:
+            self._switchboard = Switchboard(self)
+            self._switchboard.set_handler(self._on_text)
+        return self._switchboard
+        
+    def request_switchboard(self, callback):
+        """
+        @brief Asks the notification server for a switchboard (XFR SB).
+        
+        @var callback: Called as callback(address, cookie) once the server 
+        answers.
+        """
+        self._transfers[self._tid] = callback
+        self._send("XFR %d SB\n"%self._tid)
+        self._tid += 1
+        
+    def get_dispatcher(self):
+        """
+        @brief Gets the table of command handlers, used to handle new 
+        commands or to see how much time each command takes.
+        
+        @return The Dispatcher of this Connection.
+        """
+        return self._dispatcher
+        
+    def _send(self, message):
+        """
+        @brief Sends a command to the notification server.
+        
+        @var message: The full command to be sent.
+        """
+        self._channel.push(message)
         
     def set_app(self, app):
         """
@@ -133,84 +229,118 @@ class Connection:
         elif status == "busy":
             tmp = "BSY"
             
-        self._socket.send("CHG %d %s 0\n"%(self._tid, tmp))
+        self._send("CHG %d %s 0\n"%(self._tid, tmp))
         self._tid += 1
         
-    def listen(self):
+    def listen(self, timeout=0.0):
         """
-        @brief Listens for changes from the server.
+        @brief Handles any changes from the server that have arrived.
+        
+        @var timeout: How long to wait for changes in seconds.
         """
+        self._engine.poll(timeout)
         
-        # TCP doesn't have to give me all the stuff together, 
-        # so I make sure I have the full command.
-        updates = []
-        try:
-            self._data += self._socket.recv(4096).replace("\r", "")
-            if self._data[-1] == '\n':
-                updates = self._data.split('\n')
-                self._data = ""
-            else:
-                updates = self._data.split('\n')
-                self._data = updates[-1]
-                updates.pop()         
-        except:
-            pass
+    def feed(self, data):
+        """
+        @brief Handles data from the server that was read some other way.
         
-        for update in updates:
-            tmp = update.split(' ')
+        @var data: Data from the notification server.
+        """
+        self._framer.feed(data)
+        for command, payload in self._framer:
+            self._dispatcher.dispatch(command, payload)
+        
+    def _on_group(self, command, payload):
+        """
+        @brief LSG: A Group in the contact list.
+        """
+        self.__app.add(calamity.Group(command[2].replace("%20", " ")))
+        
+    def _on_member(self, command, payload):
+        """
+        @brief LST: A Member in the contact list, and the Groups it is in.
+        """
+        email = command[1]
+        name = command[2].replace("%20", " ")
+        
+        groups = []
+        
+        if len(command) >= 5:
+            groups = command[4].split(',')
             
-            # Lists
-            if tmp[0] == "LSG":
-                self.__app.add(calamity.Group(tmp[2].replace("%20", " ")))
-                
-            elif tmp[0] == "LST":
-                member = calamity.Member(email=tmp[1], \
-                                         name=tmp[2].replace("%20", " "))
-                
-                groups = []
+        # A Member can only be drawn in one Group, 
+        # so each Group gets its own.
+        if len(groups) == 0:
+            self.__app[0].add(calamity.Member(email=email, name=name))
+        else:
+            for group in groups:
+                self.__app[int(group)+1].add(calamity.Member(email=email, 
+                                                             name=name))
                 
-                if len(tmp) >= 5:
-                    groups = tmp[4].split(',')
-                    
-                if len(groups) == 0:
-                    self.__app[0].add(member)
-                else:
-                    for group in groups:
-                        self.__app[int(group)+1].add(member)
-                        
-            elif tmp[0] == "SYN":
-                self.__sync = int(tmp[2])
+    def _on_sync(self, command, payload):
+        """
+        @brief SYN: The version of the contact list.
+        """
+        self.__sync = int(command[2])
+        
+    def _on_challenge(self, command, payload):
+        """
+        @brief CHL: msn challenges me!
+        """
+        digest = hashlib.md5(command[2] + "Q1P7W2E4J9R8U3S5").hexdigest()
+        message = "QRY %d msmsgs@msnmsgr.com 32\n%s"%(self._tid, digest)
+        self._send(message)
+        self._tid+=1
+        
+    def _on_online(self, command, payload):
+        """
+        @brief NLN/ILN: A Member changed (or told me) their status.
+        """
+        # ILN has a TID before the status, NLN doesn't.
+        if command[0] == "ILN":
+            status, email = command[2], command[3]
+        else:
+            status, email = command[1], command[2]
+            
+        if status == "NLN":
+            status = "online"
+        elif status in ["AWY", "BRB", "IDL"]:
+            status = "away"
+        elif status in ["BSY", "PHN", "LUN"]:
+            status = "busy"
+        else:
+            return
+            
+        self.__app.set_status(email, status)
                 
-            elif tmp[0] == "CHL":
-                payload = hashlib.md5(tmp[2] + "Q1P7W2E4J9R8U3S5").hexdigest()
-                message = "QRY %d msmsgs@msnmsgr.com 32\n%s"%(self._tid, 
-                                                              payload)
-                self._socket.send(message)
-                self._tid+=1
+    def _on_offline(self, command, payload):
+        """
+        @brief FLN: A Member signed out.
+        """
+        self.__app.set_status(command[1], "offline")
                 
-            # Status updates    
-            elif tmp[0] in ["NLN", "ILN"]:
-                for group in self.__app:
-                    index = group.find(email=tmp[3])
-                    if index != -1:
-                        if tmp[2] == "NLN":
-                            group[index].set_status("online")
-                        elif tmp[2] in ["AWY", "BRB", "IDL"]:
-                            group[index].set_status("away")
-                        elif tmp[2] in ["BSY", "PHN", "LUN"]:
-                            group[index].set_status("busy")
-                        else:
-                            print tmp
-                        group.sort()
+    def _on_transfer(self, command, payload):
+        """
+        @brief XFR: The switchboard I asked for.
+        """
+        callback = self._transfers.pop(int(command[1]), None)
+        if callback != None and command[2] == "SB":
+            callback(command[3], command[5])
             
-            elif tmp[0] == "FLN":
-                for group in self.__app:
-                    group[group.find(email=tmp[1])].set_status("offline")
+    def _on_ring(self, command, payload):
+        """
+        @brief RNG: A Member invited me to a switchboard.
+        """
+        self.get_switchboard().ring(command[1], command[2], command[4], 
+                                    command[5])
+        
+    def _on_text(self, contacts, email, name, message):
+        """
+        @brief A Member sent me a message through a switchboard.
+        """
+        if self.__app != None:
+            self.__app.receive(email, message)
                 
-            else:
-                print update
-    
-
     def _connect(self):
         """
         @brief Connects to the msn server.
@@ -241,6 +371,7 @@ class Connection:
             self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self._socket.connect((ipInfo[0], int(ipInfo[1])))
             
+            self._framer = Framer()
             self._socket.send("VER %d MSNP8 CVR0\n" %self._tid)
             self._tid += 1
             
@@ -252,7 +383,7 @@ class Connection:
             self._socket.send("USR %d TWN I %s\n" %(self._tid, self._email))
             self._tid+=1
             
-            recv(self._received, self._socket, self._tid-1)
+            recv(self._received, self._socket, self._tid-1, self._framer)
             
             if self._received[self._tid-1].split(" ")[0] != "XFR":
                 busy = False
@@ -262,7 +393,7 @@ class Connection:
         ticket = get_ticket(challenge, self._password, self._email)
         self._socket.send("USR %d TWN S %s\n" %(self._tid, ticket))
         self._tid+=1
-        recv(self._received, self._socket, self._tid-1)
+        recv(self._received, self._socket, self._tid-1, self._framer)
         
         if self._received[self._tid-1].split(" ")[0] == "911":
             raise ValueError("Invalid Email or Password!")
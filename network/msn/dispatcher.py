@@ -0,0 +1,114 @@
+"""
+@file Dispatcher.py
+@date 10/18/2026
+@version 0.1
+
+@brief Maps the commands sent by the server to the methods that handle them.
+
+Looking a command up in a table costs the same no matter how many commands
+there are, and keeps track of how often each one shows up and how long
+its handler takes.
+"""
+
+import time
+
+class Dispatcher:
+    """
+    @brief A table of command handlers.
+    """
+    
+    def __init__(self):
+        """
+        @brief Creates an empty table.
+        """
+        self._handlers = {}
+        self._counts = {}
+        self._times = {}
+        self._unhandled = {}
+    
+    def register(self, verbs, handler):
+        """
+        @brief Sets the handler of one or more commands, replaces any
+        handler the commands already had.
+        
+        @var verbs: A command (i.e. "NLN") or a list of commands.
+        @var handler: Called as handler(command, payload), where command is
+        the list of parts of the command and payload is its payload (or None).
+        """
+        if isinstance(verbs, str):
+            verbs = [verbs]
+        
+        for verb in verbs:
+            self._handlers[verb] = handler
+            self._counts.setdefault(verb, 0)
+            self._times.setdefault(verb, 0.0)
+    
+    def unregister(self, verb):
+        """
+        @brief Removes the handler of a command.
+        
+        @var verb: The command to stop handling.
+        """
+        if verb in self._handlers:
+            del self._handlers[verb]
+    
+    def dispatch(self, command, payload=None):
+        """
+        @brief Hands a command to its handler.
+        
+        @var command: The command split into its parts.
+        @var payload: The payload that came with the command (or None).
+        @return True/False Whether or not the command had a handler.
+        """
+        verb = command[0]
+        handler = self._handlers.get(verb)
+        
+        if handler == None:
+            self._unhandled[verb] = self._unhandled.get(verb, 0) + 1
+            return False
+        
+        start = time.time()
+        try:
+            handler(command, payload)
+        finally:
+            self._times[verb] += time.time() - start
+            self._counts[verb] += 1
+        
+        return True
+    
+    def stats(self):
+        """
+        @brief How often each handled command came in and how long its
+        handler took in total.
+        
+        @return A dictionary of command -> (count, seconds).
+        """
+        stats = {}
+        for verb, count in self._counts.items():
+            stats[verb] = (count, self._times[verb])
+        return stats
+    
+    def unhandled(self):
+        """
+        @brief How often each command without a handler came in.
+        
+        @return A dictionary of command -> count.
+        """
+        return dict(self._unhandled)
+    
+    def reset(self):
+        """
+        @brief Sets every counter and timer back to zero.
+        """
+        for verb in self._counts:
+            self._counts[verb] = 0
+            self._times[verb] = 0.0
+        self._unhandled = {}
+    
+    def __contains__(self, verb):
+        """
+        @brief Whether or not a command has a handler.
+        
+        @return True/False Whether or not verb has a handler.
+        """
+        return verb in self._handlers
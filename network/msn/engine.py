@@ -0,0 +1,343 @@
+"""
+@file Engine.py
+@date 10/18/2026
+@version 0.1
+
+@brief Event driven I/O for the MSN connections.
+
+The Engine watches every socket it owns with select() (through asyncore) and
+hands incoming data to its owner the moment it arrives, instead of waiting for
+somebody to come along and poll the socket. It also keeps the timers of its 
+owners (i.e. closing a switchboard session that has been idle for too long).
+"""
+
+import asyncore
+import errno
+import heapq
+import socket
+import time
+
+from framer import FrameError
+
+class Channel(asyncore.dispatcher):
+    """
+    @brief A single socket watched by an Engine.
+    """
+    
+    def __init__(self, sock, handler, engine, closed=None, framer=None):
+        """
+        @brief Wraps a socket.
+        
+        @var sock: The socket to watch (connected, or see connect).
+        @var handler: Called with every chunk of data read from the socket, 
+        or with every complete command if a framer is given.
+        @var engine: The Engine that owns this Channel.
+        @var closed: Called (with no arguments) when the socket is closed.
+        @var framer: A Framer the socket is read straight into.
+        """
+        asyncore.dispatcher.__init__(self, sock, engine._map)
+        self._engine = engine
+        self._fd = sock.fileno()
+        self._handler = handler
+        self._closed = closed
+        self._framer = framer
+        self._out = ""
+        
+        # Whether the watcher was last told to watch for writability too.
+        self._writing = False
+    
+    def push(self, data):
+        """
+        @brief Queues data to be written to the socket.
+        
+        @var data: The string to be sent.
+        """
+        self._out += data
+        if self.connected:
+            self.handle_write()
+    
+    def readable(self):
+        return True
+    
+    def writable(self):
+        # Connecting sockets become writable once they are connected.
+        return self.connecting or len(self._out) > 0
+    
+    def handle_connect_event(self):
+        error = self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        self.connecting = False
+        if error != 0:
+            self.handle_close()
+            return
+        
+        self.connected = True
+        self.handle_connect()
+    
+    def handle_connect(self):
+        # Sends what was pushed while connecting, writability is only 
+        # watched from now on while some of it is left.
+        self.handle_write()
+    
+    def handle_read(self):
+        if self._framer == None:
+            data = self.recv(4096)
+            if data:
+                self._handler(data)
+            return
+        
+        try:
+            read = self._framer.recv_into(self.socket)
+        except socket.error, e:
+            if e.args[0] in (errno.EWOULDBLOCK, errno.EAGAIN):
+                return
+            if e.args[0] in asyncore._DISCONNECTED:
+                self.handle_close()
+                return
+            raise
+        
+        if read == 0:
+            self.handle_close()
+            return
+        
+        try:
+            for command, payload in self._framer:
+                self._handler(command, payload)
+        except FrameError:
+            # The rest of the stream can't be trusted.
+            self.handle_close()
+    
+    def handle_write(self):
+        try:
+            sent = self.send(self._out)
+        except socket.error:
+            return
+        self._out = self._out[sent:]
+        
+        if self._writing != self.writable() and self.connected:
+            self._engine._rewatch(self._fd)
+    
+    def close(self):
+        # A failed connect is reported more than once in a single round.
+        if self._fileno == None:
+            return
+        asyncore.dispatcher.close(self)
+        self._engine._unwatch(self._fd)
+    
+    def handle_close(self):
+        if self._fileno == None:
+            return
+        self.close()
+        if self._closed != None:
+            self._closed()
+    
+    def handle_error(self):
+        # Let the caller see what went wrong instead of asyncore's summary.
+        self.close()
+        raise
+
+class Engine:
+    """
+    @brief Owns a set of Channels and dispatches their data as it arrives.
+    """
+    
+    def __init__(self):
+        """
+        @brief Creates an Engine with no Channels.
+        """
+        self._map = {}
+        self._running = False
+        self._watch = None
+        self._unwatch_fd = None
+        self._later = None
+    
+        # (when, order, callback), soonest first
+        self._timers = []
+        self._order = 0
+    
+    def set_watcher(self, watch, unwatch, later=None):
+        """
+        @brief Hands the waiting over to someone else's event loop 
+        (i.e. gui.App.add_reader and gui.App.remove_reader).
+        
+        Every socket is given to watch along with the Engine's poll method, 
+        which must be called whenever the socket is readable. A socket that 
+        is still connecting (or has data waiting to be sent) is given with 
+        writable set, poll must also be called once it is writable, until it 
+        is given again without it. unwatch is given the socket once it has 
+        been closed.
+        
+        @var watch: Called as watch(fd, callback) for every socket, or 
+        watch(fd, callback, True) while it is connecting or has data 
+        waiting to be sent.
+        @var unwatch: Called as unwatch(fd) for every closed socket.
+        @var later: Called as later(milliseconds, callback) for every timer 
+        (i.e. gui.App.after), None keeps the timers in the Engine, where they 
+        only run when poll is called.
+        """
+        self._watch = watch
+        self._unwatch_fd = unwatch
+        self._later = later
+        for fd in self._map.keys():
+            self._rewatch(fd)
+        
+        if later != None:
+            timers = self._timers
+            self._timers = []
+            for when, order, callback in sorted(timers):
+                self.call_later(max(0, when - time.time()), callback)
+    
+    def call_later(self, delay, callback):
+        """
+        @brief Calls a procedure once, after a delay.
+        
+        @var delay: How long to wait in seconds.
+        @var callback: Called with no arguments.
+        """
+        if self._later != None:
+            self._later(int(delay * 1000), callback)
+            return
+        
+        self._order += 1
+        heapq.heappush(self._timers, (time.time() + delay, self._order, 
+                                      callback))
+    
+    def _wait(self, timeout):
+        """
+        @brief How long to wait for sockets before the next timer is due.
+        
+        @var timeout: The longest the caller wants to wait (None is forever).
+        @return The time to wait in seconds (None is forever).
+        """
+        if len(self._timers) == 0:
+            return timeout
+        
+        due = max(0.0, self._timers[0][0] - time.time())
+        if timeout == None:
+            return due
+        return min(timeout, due)
+    
+    def _run_timers(self):
+        """
+        @brief Calls every timer that is due.
+        """
+        now = time.time()
+        while len(self._timers) > 0 and self._timers[0][0] <= now:
+            when, order, callback = heapq.heappop(self._timers)
+            callback()
+    
+    def _rewatch(self, fd):
+        """
+        @brief Tells the watcher (if any) what to watch a socket for.
+        
+        @var fd: The file descriptor of the socket.
+        """
+        if self._watch == None:
+            return
+        
+        channel = self._map[fd]
+        channel._writing = channel.writable()
+        if channel._writing:
+            self._watch(fd, self.poll, True)
+        else:
+            self._watch(fd, self.poll)
+    
+    def _unwatch(self, fd):
+        """
+        @brief Tells the watcher (if any) a socket was closed.
+        
+        @var fd: The file descriptor of the closed socket.
+        """
+        if self._unwatch_fd != None:
+            self._unwatch_fd(fd)
+    
+    def add(self, sock, handler, closed=None, framer=None):
+        """
+        @brief Starts watching a socket.
+        
+        @var sock: The connected socket to watch.
+        @var handler: Called with every chunk of data read from the socket.
+        If a framer is given, it is instead called as handler(command, payload)
+        for every complete command.
+        @var closed: Called when the socket is closed by the other side.
+        @var framer: A Framer the socket is read straight into.
+        @return The Channel that wraps the socket.
+        """
+        channel = Channel(sock, handler, self, closed, framer)
+        self._rewatch(channel._fd)
+        return channel
+    
+    def connect(self, sock, address, handler, closed=None, framer=None):
+        """
+        @brief Starts connecting a socket and watching it, without waiting 
+        for the connection to be made. What is pushed to the Channel in the 
+        meantime is sent once it is.
+        
+        @var sock: The socket, not connected yet.
+        @var address: Where to connect it, (host, port), the host being an 
+        IP address (a name would be looked up first, which blocks).
+        @var handler: See add.
+        @var closed: Called when the socket is closed, or couldn't be 
+        connected.
+        @var framer: See add.
+        @return The Channel that wraps the socket.
+        @note socket.error is raised if the connection failed right away.
+        """
+        channel = Channel(sock, handler, self, closed, framer)
+        try:
+            channel.connect(address)
+        except socket.error:
+            channel.close()
+            raise
+        
+        self._rewatch(channel._fd)
+        return channel
+    
+    def poll(self, timeout=0.0):
+        """
+        @brief Waits up to timeout seconds for one round of socket activity
+        and dispatches it.
+        
+        @var timeout: How long to wait in seconds (0 means don't wait).
+        """
+        if len(self._map) > 0:
+            asyncore.loop(timeout=self._wait(timeout), use_poll=True,
+                          map=self._map, count=1)
+        self._run_timers()
+    
+    def run(self):
+        """
+        @brief Dispatches socket activity (and timers) until stop() is called 
+        or every Channel has been closed and every timer has run. 
+        Blocks without waking up while idle.
+        """
+        self._running = True
+        while self._running and (len(self._map) > 0 or 
+                                 len(self._timers) > 0):
+            if len(self._map) > 0:
+                asyncore.loop(timeout=self._wait(None), use_poll=True,
+                              map=self._map, count=1)
+            else:
+                time.sleep(self._wait(None))
+            self._run_timers()
+        self._running = False
+    
+    def stop(self):
+        """
+        @brief Makes run() return after the current round of activity.
+        """
+        self._running = False
+    
+    def close(self):
+        """
+        @brief Closes every Channel owned by the Engine.
+        """
+        for channel in self._map.values():
+            channel.close()
+    
+    def __len__(self):
+        """
+        @brief Returns how many Channels the Engine is watching.
+        
+        @return The number of open Channels.
+        """
+        return len(self._map)
@@ -0,0 +1,270 @@
+"""
+@file Framer.py
+@date 10/18/2026
+@version 0.1
+
+@brief Splits the MSN byte stream into commands.
+
+TCP can cut a command anywhere, so data is read into one growing buffer and
+commands are only handed out once they are complete. Commands such as MSG
+end with the length of a binary payload that follows the line, the payload
+is handed out as a view into the buffer instead of a copy.
+"""
+
+import itertools
+import operator
+import re
+
+# Commands whose last argument is the length of a payload after the line.
+PAYLOAD_COMMANDS = set(["MSG", "UBX", "UUX", "NOT", "GCF", "UBM", "IPG"])
+
+# The "\n" before a line with one of those (group 1 is the line without its
+# "\r\n"), or a "\n" that ends a line alone (no group), the two are found in
+# the same search.
+_PAYLOAD_LINE = re.compile("\n(?:(?<=[^\r]\n)|(?=((?:%s) [^\r\n]*)\r\n))" % 
+                           "|".join(sorted(PAYLOAD_COMMANDS)))
+
+# A line with one of those right where a payload ended.
+_PAYLOAD_COMMAND = re.compile("((?:%s) [^\r\n]*)\r\n" % 
+                              "|".join(sorted(PAYLOAD_COMMANDS)))
+
+_split = operator.methodcaller("split", " ")
+
+def _batch(lines):
+    """
+    @brief Splits lines that have no payloads.
+    
+    @var lines: The lines, each ending in "\r\n".
+    @return An iterator of (command, None) tuples.
+    """
+    lines = lines.split("\r\n")
+    lines.pop()
+    return itertools.izip(itertools.imap(_split, lines), 
+                          itertools.repeat(None))
+
+class FrameError(ValueError):
+    """
+    @brief The stream can't be split any further (i.e. a payload with a 
+    negative length), whatever comes after is garbage.
+    """
+    pass
+
+class Framer:
+    """
+    @brief Incremental command/payload splitter.
+    
+    Iterating over a Framer gives (command, payload) pairs for every
+    complete command in the buffer. The command is a list of its space
+    separated parts, the payload is a memoryview (or None).
+    
+    @note Payload views are only valid until the next read into the Framer.
+    """
+    
+    def __init__(self, size=8192):
+        """
+        @brief Creates an empty Framer.
+        
+        @var size: Starting size of the buffer in bytes,
+        it grows if a single command doesn't fit.
+        """
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+    
+    def _reserve(self, size):
+        """
+        @brief Makes room for at least size more bytes at the end of
+        the buffer. Moves the unread data to the front, or moves it into
+        a bigger buffer when it can't fit.
+        
+        @var size: How many bytes are needed.
+        """
+        if len(self._buffer) - self._end >= size:
+            return
+        
+        pending = self._end - self._start
+        
+        if pending + size <= len(self._buffer):
+            # Copied out first since the two ranges can overlap.
+            pending_data = self._view[self._start:self._end].tobytes()
+            self._buffer[0:pending] = pending_data
+        else:
+            buffer = bytearray(max(len(self._buffer)*2, pending + size))
+            buffer[0:pending] = self._view[self._start:self._end]
+            self._buffer = buffer
+            self._view = memoryview(buffer)
+        
+        self._start = 0
+        self._end = pending
+    
+    def recv_into(self, sock, size=4096):
+        """
+        @brief Reads from a socket straight into the buffer.
+        
+        @var sock: The socket to read from.
+        @var size: The most bytes to read.
+        @return How many bytes were read (0 means the socket was closed).
+        """
+        if self._start == self._end:
+            self._start = self._end = 0
+        self._reserve(size)
+        
+        read = sock.recv_into(self._view[self._end:], size)
+        self._end += read
+        return read
+    
+    def feed(self, data):
+        """
+        @brief Adds data that has already been read to the buffer.
+        
+        @var data: The data to add.
+        """
+        if self._start == self._end:
+            self._start = self._end = 0
+        self._reserve(len(data))
+        
+        self._buffer[self._end:self._end+len(data)] = data
+        self._end += len(data)
+    
+    def pending(self):
+        """
+        @brief How many bytes are waiting for the rest of their command.
+        
+        @return The number of unused bytes in the buffer.
+        """
+        return self._end - self._start
+    
+    def __iter__(self):
+        """
+        @brief Gives every complete command in the buffer, leaving anything 
+        cut off in the buffer for the next read.
+        
+        The lines between the commands with a payload are split all in one 
+        go and handed out as a batch, only the commands with a payload are 
+        found one at a time (the command after a payload starts wherever it 
+        ends, which can be in the middle of a line).
+        
+        @return An iterator of (command, payload) tuples.
+        @note A payload with a negative length raises FrameError.
+        @note Commands are taken out of the buffer a batch at a time, the 
+        rest of a batch is lost if the loop over them is left early.
+        """
+        return itertools.chain.from_iterable(self._batches())
+    
+    def _batches(self):
+        """
+        @brief Takes the complete commands out of the buffer (see __iter__).
+        
+        @return A generator of iterators of (command, payload) tuples.
+        """
+        buffer = self._buffer
+        view = self._view
+        
+        while True:
+            start = self._start
+            end = self._end
+            last = buffer.rfind("\n", start, end)
+            if last == -1:
+                return
+            
+            text = view[start:last+1].tobytes()
+            position = 0
+            
+            for line in itertools.chain((None,), 
+                                        _PAYLOAD_LINE.finditer(text)):
+                if line != None:
+                    following = line.start() + 1
+                    if following <= position:
+                        # In a payload that was already handed out.
+                        continue
+                    if line.lastindex == None:
+                        # Lines ending in "\n" alone are split one at a time.
+                        yield self._split_lines()
+                        return
+                    
+                    self._start = start + following
+                    yield _batch(text[position:following])
+                    position = following
+                elif text[:1] == "\n":
+                    yield self._split_lines()
+                    return
+                
+                # The payload can be followed by another command with one.
+                while (text[position+3:position+4] == " " and 
+                       text[position:position+3] in PAYLOAD_COMMANDS):
+                    if line == None or line.start(1) != position:
+                        line = _PAYLOAD_COMMAND.match(text, position)
+                        if line == None:
+                            yield self._split_lines()
+                            return
+                    
+                    command = line.group(1).split(" ")
+                    length = self._length(command)
+                    
+                    payload = start + line.end(1) + 2
+                    if payload + length > end:
+                        # Wait for the rest of the payload.
+                        return
+                    
+                    position = line.end(1) + 2 + length
+                    self._start = start + position
+                    yield ((command, view[payload:payload+length]),)
+            
+            if position < len(text):
+                self._start = start + len(text)
+                yield _batch(text[position:])
+    
+    def _length(self, command):
+        """
+        @brief Gets the length of the payload after a command.
+        
+        @var command: The command, split on spaces.
+        @return The length in bytes (0 if it isn't a number).
+        """
+        try:
+            length = int(command[-1])
+        except ValueError:
+            return 0
+        
+        if length < 0:
+            raise FrameError("Payload of %s has a negative length: %d"
+                             % (command[0], length))
+        return length
+    
+    def _split_lines(self):
+        """
+        @brief Gives every complete command in the buffer, finding the end 
+        of each line on its own (see __iter__).
+        
+        @return A generator of (command, payload) tuples.
+        """
+        buffer = self._buffer
+        view = self._view
+        end = self._end
+        
+        while True:
+            start = self._start
+            newline = buffer.find("\n", start, end)
+            if newline == -1:
+                return
+            
+            if newline > start and buffer[newline-1] == 13: # \r
+                command = view[start:newline-1].tobytes().split(" ")
+            else:
+                command = view[start:newline].tobytes().split(" ")
+            
+            payload = None
+            start = newline + 1
+            
+            if command[0] in PAYLOAD_COMMANDS:
+                length = self._length(command)
+                if start + length > end:
+                    # Wait for the rest of the payload.
+                    return
+                
+                payload = view[start:start+length]
+                start += length
+            
+            self._start = start
+            yield command, payload
@@ -0,0 +1,659 @@
+"""
+@file Switchboard.py
+@date 10/18/2026
+@version 0.1
+
+@brief The implementation of the Switchboard and Session classes.
+
+Messages aren't sent through the notification server, a conversation takes
+a switchboard session of its own: the notification server is asked for a
+switchboard (XFR SB), the session signs in to it (USR) and invites the
+contacts (CAL), and messages are sent (MSG) once they have joined (JOI).
+That is a few round trips before the first message goes out, so a
+Switchboard keeps the sessions it opens and sends every later message to
+the same contacts through the session that is already open.
+
+Sessions that haven't been used for a while are closed, and only so many
+are kept open at once, the least recently used one is closed to make room
+for a new one.
+"""
+
+import collections
+import socket
+import time
+
+from framer import Framer
+from dispatcher import Dispatcher
+
+# How many sessions are kept open at once.
+SESSION_LIMIT = 8
+
+# Seconds a session is kept open without a message being sent or received.
+IDLE_TIMEOUT = 300
+
+# What comes before the text of a message.
+_TEXT_HEADER = ("MIME-Version: 1.0\r\n"
+                "Content-Type: text/plain; charset=UTF-8\r\n\r\n")
+
+def _key(contacts):
+    """
+    @brief The key of the session with a set of contacts.
+    
+    @var contacts: The emails of the contacts.
+    @return A frozenset of the (lower case) emails.
+    """
+    return frozenset([contact.lower() for contact in contacts])
+
+class Session:
+    """
+    @brief A single connection to a switchboard server,
+    and the contacts invited to it.
+    """
+    
+    # Waiting for the notification server to give a switchboard.
+    WAITING = "waiting"
+    # Waiting for the switchboard to let us in.
+    SIGNING_IN = "signing in"
+    # Waiting for the contacts to join.
+    CALLING = "calling"
+    # Every contact is there, messages are sent right away.
+    READY = "ready"
+    CLOSED = "closed"
+    
+    def __init__(self, switchboard, contacts):
+        """
+        @brief Creates a Session that isn't connected to anything yet
+        (see connect and answer).
+        
+        @var switchboard: The Switchboard that keeps the Session.
+        @var contacts: A frozenset of the emails of the contacts.
+        """
+        self._switchboard = switchboard
+        self._contacts = contacts
+        self._joined = set()
+        self._state = Session.WAITING
+        self._tid = 1
+        self._channel = None
+        self._last_used = time.time()
+        
+        # (message, acked) waiting for the contacts to join
+        self._queue = []
+        # tid -> acked of a message that was sent
+        self._acks = {}
+        
+        self._framer = Framer()
+        self._dispatcher = Dispatcher()
+        self._dispatcher.register("USR", self._on_signed_in)
+        self._dispatcher.register("ANS", self._on_answered)
+        self._dispatcher.register("IRO", self._on_roster)
+        self._dispatcher.register("JOI", self._on_joined)
+        self._dispatcher.register("BYE", self._on_left)
+        self._dispatcher.register("MSG", self._on_message)
+        self._dispatcher.register(["ACK", "NAK"], self._on_ack)
+    
+    def get_contacts(self):
+        """
+        @brief Gets who the Session is with.
+        
+        @return A frozenset of their emails.
+        """
+        return self._contacts
+    
+    def get_state(self):
+        """
+        @brief Gets what the Session is doing.
+        
+        @return One of WAITING, SIGNING_IN, CALLING, READY or CLOSED.
+        """
+        return self._state
+    
+    def get_last_used(self):
+        """
+        @brief Gets when a message was last sent or received.
+        
+        @return The time in seconds since the epoch.
+        """
+        return self._last_used
+    
+    def get_dispatcher(self):
+        """
+        @brief Gets the table of command handlers of the Session.
+        
+        @return The Dispatcher of this Session.
+        """
+        return self._dispatcher
+    
+    def pending(self):
+        """
+        @brief How many messages are waiting for the contacts to join.
+        
+        @return The number of queued messages.
+        """
+        return len(self._queue)
+    
+    def connect(self, address, cookie):
+        """
+        @brief Signs in to the switchboard the notification server gave
+        (XFR), then invites the contacts.
+        
+        @var address: Where the switchboard is, "ip:port".
+        @var cookie: What the switchboard is signed in to with.
+        """
+        if self._state != Session.WAITING or not self._open(address):
+            return
+        
+        self._state = Session.SIGNING_IN
+        self._send("USR", "%s %s" % (self._switchboard.get_email(), cookie))
+    
+    def answer(self, address, cookie, session):
+        """
+        @brief Joins a switchboard a contact invited us to (RNG).
+        
+        @var address: Where the switchboard is, "ip:port".
+        @var cookie: What the switchboard is signed in to with.
+        @var session: The id of the switchboard session.
+        """
+        if self._state != Session.WAITING or not self._open(address):
+            return
+        
+        self._state = Session.SIGNING_IN
+        self._send("ANS", "%s %s %s" % (self._switchboard.get_email(),
+                                        cookie, session))
+    
+    def _open(self, address):
+        """
+        @brief Starts connecting to a switchboard server, without waiting 
+        for it (the commands sent in the meantime wait for the connection).
+        
+        @var address: Where the switchboard is, "ip:port".
+        @return True/False Whether or not the connection was started.
+        """
+        try:
+            host, port = address.split(":")
+            port = int(port)
+        except ValueError:
+            self.close()
+            return False
+        
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Commands are small and often sent back to back (a CAL for each
+        # contact), they shouldn't wait on each other.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        try:
+            self._channel = self._switchboard.get_engine().connect(
+                sock, (host, port), self._handle, closed=self._closed, 
+                framer=self._framer)
+        except socket.error:
+            self.close()
+            return False
+        return True
+    
+    def _send(self, verb, arguments, payload=""):
+        """
+        @brief Sends a command to the switchboard server.
+        
+        @var verb: The command (i.e. "MSG")
+        @var arguments: What comes after the TID.
+        @var payload: What comes after the command.
+        @return The TID of the command.
+        """
+        tid = self._tid
+        self._tid += 1
+        self._channel.push("%s %d %s\r\n%s" % (verb, tid, arguments,
+                                               payload))
+        return tid
+    
+    def send(self, message, acked=None):
+        """
+        @brief Sends a message to every contact of the Session,
+        or queues it until they have all joined.
+        
+        @var message: The text of the message.
+        @var acked: Called as acked(True/False) once the switchboard says
+        whether or not the message was delivered.
+        """
+        self._last_used = time.time()
+        
+        if self._state == Session.CLOSED:
+            if acked != None:
+                acked(False)
+        elif self._state == Session.READY and self._contacts <= self._joined:
+            self._write(message, acked)
+        else:
+            self._queue.append((message, acked))
+            
+            # Someone left since the last message, invite them back.
+            if self._state == Session.READY:
+                self._state = Session.CALLING
+                self._call()
+    
+    def take(self):
+        """
+        @brief Takes the messages waiting to be sent out of the Session
+        (to send them through another one).
+        
+        @return A list of (message, acked).
+        """
+        queue = self._queue
+        self._queue = []
+        return queue
+    
+    def _write(self, message, acked):
+        """
+        @brief Sends a message (MSG) that asks to be acknowledged.
+        """
+        if isinstance(message, unicode):
+            message = message.encode("utf-8")
+        
+        payload = _TEXT_HEADER + message
+        tid = self._send("MSG", "A %d" % len(payload), payload)
+        if acked != None:
+            self._acks[tid] = acked
+    
+    def _call(self):
+        """
+        @brief Invites every contact who isn't in the session (CAL).
+        """
+        missing = self._contacts - self._joined
+        if len(missing) == 0:
+            self._ready()
+            return
+        
+        for contact in missing:
+            self._send("CAL", contact)
+    
+    def _ready(self):
+        """
+        @brief Sends every message that was waiting.
+        """
+        self._state = Session.READY
+        for message, acked in self.take():
+            self._write(message, acked)
+    
+    def close(self, out=True):
+        """
+        @brief Leaves the switchboard, messages that weren't sent
+        (or acknowledged) are failed.
+        
+        @var out: True to say goodbye (OUT) first,
+        False if the server is already gone.
+        """
+        if self._state == Session.CLOSED:
+            return
+        self._state = Session.CLOSED
+        
+        if self._channel != None:
+            if out:
+                self._channel.push("OUT\r\n")
+            self._channel.close()
+        
+        failed = [acked for message, acked in self.take()]
+        failed.extend(self._acks.values())
+        self._acks = {}
+        for acked in failed:
+            if acked != None:
+                acked(False)
+        
+        self._switchboard._closed(self)
+    
+    def _closed(self):
+        """
+        @brief The switchboard server closed the connection.
+        """
+        self.close(out=False)
+    
+    def _handle(self, command, payload):
+        """
+        @brief Hands a command from the switchboard server to its handler.
+        """
+        if self._dispatcher.dispatch(command, payload):
+            return
+        
+        # An error (i.e. 217, the contact is offline) leaves the Session
+        # unable to send what it has, so it is given up on.
+        if command[0].isdigit() and self._state != Session.READY:
+            self.close()
+    
+    def _on_signed_in(self, command, payload):
+        """
+        @brief USR: We are in the switchboard, time to invite the contacts.
+        """
+        if command[2] == "OK":
+            self._state = Session.CALLING
+            self._call()
+    
+    def _on_answered(self, command, payload):
+        """
+        @brief ANS: We joined the switchboard we were invited to, everyone
+        there was listed (IRO) before this.
+        """
+        if command[2] == "OK":
+            self._ready()
+    
+    def _on_roster(self, command, payload):
+        """
+        @brief IRO: Someone who is already in the switchboard we joined.
+        """
+        self._joined.add(command[4].lower())
+    
+    def _on_joined(self, command, payload):
+        """
+        @brief JOI: A contact accepted the invitation.
+        """
+        self._joined.add(command[1].lower())
+        if self._state == Session.CALLING and self._contacts <= self._joined:
+            self._ready()
+    
+    def _on_left(self, command, payload):
+        """
+        @brief BYE: A contact left the switchboard.
+        """
+        self._joined.discard(command[1].lower())
+    
+    def _on_message(self, command, payload):
+        """
+        @brief MSG: A contact sent something, only text is passed on
+        (typing notifications and the like are dropped).
+        """
+        self._last_used = time.time()
+        
+        header, _, body = payload.tobytes().partition("\r\n\r\n")
+        if "text/plain" not in header.lower():
+            return
+        
+        self._switchboard._received(self, command[1].lower(),
+                                    command[2].replace("%20", " "), body)
+    
+    def _on_ack(self, command, payload):
+        """
+        @brief ACK/NAK: A message was (or wasn't) delivered.
+        """
+        acked = self._acks.pop(int(command[1]), None)
+        if acked != None:
+            acked(command[0] == "ACK")
+
+class Switchboard:
+    """
+    @brief Opens switchboard sessions as messages need them, and keeps them
+    open for the messages after.
+    """
+    
+    def __init__(self, connection, limit=SESSION_LIMIT, idle=IDLE_TIMEOUT):
+        """
+        @brief Creates a Switchboard with no sessions.
+        
+        @var connection: The Connection to the notification server,
+        switchboards are asked for through it.
+        @var limit: The most sessions kept open at once.
+        @var idle: Seconds a session is kept open without being used.
+        """
+        self._connection = connection
+        self._limit = limit
+        self._idle = idle
+        self._handler = None
+        # When the expiry timer is set for, None if it isn't set.
+        self._due = None
+        
+        # frozenset of emails -> Session, least recently used first
+        self._sessions = collections.OrderedDict()
+        
+        self.reset()
+    
+    def get_engine(self):
+        """
+        @brief Gets the Engine that watches the sessions' sockets.
+        
+        @return The Engine of the Connection.
+        """
+        return self._connection.get_engine()
+    
+    def get_email(self):
+        """
+        @brief Gets the email the sessions are signed in with.
+        
+        @return The email of the Connection.
+        """
+        return self._connection.get_email()
+    
+    def set_handler(self, handler):
+        """
+        @brief Sets what is called with every message received.
+        
+        @var handler: Called as handler(contacts, email, name, message),
+        contacts being a frozenset of the emails in the session.
+        """
+        self._handler = handler
+    
+    def set_limit(self, limit):
+        """
+        @brief Sets how many sessions are kept open at once,
+        closing the least recently used ones that don't fit.
+        
+        @var limit: The most sessions kept open (at least 1).
+        """
+        self._limit = max(1, limit)
+        self._make_room(0)
+    
+    def get_limit(self):
+        """
+        @brief Gets how many sessions are kept open at once.
+        
+        @return The most sessions kept open.
+        """
+        return self._limit
+    
+    def set_idle_timeout(self, idle):
+        """
+        @brief Sets how long a session is kept open without being used.
+        
+        @var idle: The time in seconds.
+        """
+        self._idle = idle
+        self._expire_later()
+    
+    def get_idle_timeout(self):
+        """
+        @brief Gets how long a session is kept open without being used.
+        
+        @return The time in seconds.
+        """
+        return self._idle
+    
+    def get_session(self, contacts):
+        """
+        @brief Gets the open session with a set of contacts.
+        
+        @var contacts: The emails of the contacts.
+        @return The Session, None if there is none.
+        """
+        return self._sessions.get(_key(contacts))
+    
+    def send(self, contacts, message, acked=None):
+        """
+        @brief Sends a message, through the session that is already open
+        with the contacts, or a new one.
+        
+        @var contacts: The emails of the contacts.
+        @var message: The text of the message.
+        @var acked: Called as acked(True/False) once the switchboard says
+        whether or not the message was delivered.
+        @return The Session it was sent through.
+        """
+        key = _key(contacts)
+        session = self._sessions.pop(key, None)
+        
+        if session == None:
+            session = self._open(key)
+            self._connection.request_switchboard(session.connect)
+        else:
+            self._reused += 1
+            self._sessions[key] = session
+        
+        self._sent += 1
+        session.send(message, acked)
+        return session
+    
+    def ring(self, session, address, cookie, email):
+        """
+        @brief A contact invited us to a switchboard (RNG), it replaces the
+        session we had with them (if any), since that is where they will
+        send their messages.
+        
+        @var session: The id of the switchboard session.
+        @var address: Where the switchboard is, "ip:port".
+        @var cookie: What the switchboard is signed in to with.
+        @var email: Who invited us.
+        """
+        key = _key([email])
+        replaced = self._sessions.pop(key, None)
+        
+        answered = self._open(key)
+        answered.answer(address, cookie, session)
+        
+        if replaced != None:
+            for message, acked in replaced.take():
+                answered.send(message, acked)
+            replaced.close()
+    
+    def _open(self, key):
+        """
+        @brief Creates a Session, closing the least recently used ones if
+        there are too many.
+        
+        @var key: The frozenset of emails of the Session.
+        @return The new Session.
+        """
+        self._make_room(1)
+        
+        session = Session(self, key)
+        self._sessions[key] = session
+        self._opened += 1
+        self._expire_later()
+        return session
+    
+    def _make_room(self, count):
+        """
+        @brief Closes the least recently used sessions until there is room
+        for count more.
+        """
+        while len(self._sessions) > 0 and \
+              len(self._sessions) + count > self._limit:
+            key, session = self._sessions.popitem(last=False)
+            self._evicted += 1
+            session.close()
+    
+    def _closed(self, session):
+        """
+        @brief Forgets a Session that was closed.
+        """
+        key = session.get_contacts()
+        if self._sessions.get(key) is session:
+            del self._sessions[key]
+    
+    def _received(self, session, email, name, message):
+        """
+        @brief Hands a message to the handler, the session it came through
+        becomes the most recently used.
+        """
+        key = session.get_contacts()
+        if self._sessions.get(key) is session:
+            self._sessions[key] = self._sessions.pop(key)
+        
+        self._received_count += 1
+        if self._handler != None:
+            self._handler(key, email, name, message)
+    
+    def _expire_later(self):
+        """
+        @brief Sets a timer for when the least recently used session will
+        have been idle for too long (unless one is already set for sooner).
+        """
+        if len(self._sessions) == 0:
+            return
+        
+        oldest = self._sessions.itervalues().next().get_last_used()
+        due = oldest + self._idle
+        if self._due != None and self._due <= due:
+            return
+        
+        self._due = due
+        self.get_engine().call_later(max(0, due - time.time()), self._expire)
+    
+    def _expire(self):
+        """
+        @brief Closes every session that has been idle for too long.
+        """
+        self._due = None
+        now = time.time()
+        
+        # Least recently used first, so the first one still in use ends it.
+        for session in self._sessions.values():
+            if now - session.get_last_used() < self._idle:
+                break
+            self._expired += 1
+            session.close()
+        
+        self._expire_later()
+    
+    def close(self):
+        """
+        @brief Closes every session.
+        """
+        for session in self._sessions.values():
+            session.close()
+    
+    def __len__(self):
+        """
+        @brief Returns how many sessions are open (or opening).
+        
+        @return The number of sessions.
+        """
+        return len(self._sessions)
+    
+    def stats(self):
+        """
+        @brief Counters of what the Switchboard has done.
+        
+        @return A dictionary with opened (sessions opened), reused
+        (messages sent through a session that was already open), evicted
+        (sessions closed to make room), expired (sessions closed for being
+        idle), sent and received (messages).
+        """
+        return {"opened": self._opened,
+                "reused": self._reused,
+                "evicted": self._evicted,
+                "expired": self._expired,
+                "sent": self._sent,
+                "received": self._received_count}
+    
+    def reset(self):
+        """
+        @brief Sets every counter back to zero.
+        """
+        self._opened = 0
+        self._reused = 0
+        self._evicted = 0
+        self._expired = 0
+        self._sent = 0
+        self._received_count = 0
+
+# The Switchboard messages are sent through.
+_switchboard = None
+
+def use(switchboard):
+    """
+    @brief Sets the Switchboard shared by the whole app.
+    
+    @var switchboard: The Switchboard, None if signed out.
+    """
+    global _switchboard
+    _switchboard = switchboard
+
+def get():
+    """
+    @brief Gets the Switchboard shared by the whole app.
+    
+    @return The Switchboard, None if signed out.
+    """
+    return _switchboard
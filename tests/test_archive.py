@@ -0,0 +1,81 @@
+"""
+@file test_archive.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of reading messages out of an Archive, and of appending
+after an append that didn't finish.
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from calamity.archive import Archive
+
+def rows(first, last):
+    """
+    @return Messages with ids first to last (inclusive), taking turns
+    between two contacts, one message a second.
+    """
+    return [(id, "ab"[id % 2] + "@x.com", float(id), "Me", "message %d" % id)
+            for id in range(first, last + 1)]
+
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.archive = Archive(self.directory, block=256)
+    
+    def tearDown(self):
+        self.archive.close()
+        shutil.rmtree(self.directory)
+    
+    def test_reading(self):
+        self.assertEqual(self.archive.append(rows(1, 100)), 100)
+        self.assertEqual(self.archive.append(rows(50, 120)), 20)
+        
+        self.assertEqual(self.archive.get_last(), 120)
+        self.assertEqual(self.archive.get(77), rows(77, 77)[0])
+        self.assertEqual(self.archive.count("a@x.com"), 60)
+        self.assertEqual(self.archive.message("a@x.com", 0)[0], 2)
+        
+        page = self.archive.page("b@x.com", before=51, count=5)
+        self.assertEqual([row[0] for row in page], [41, 43, 45, 47, 49])
+        
+        between = self.archive.between(10.0, 15.0)
+        self.assertEqual([row[0] for row in between], range(10, 15))
+        between = self.archive.between(10.0, 15.0, "a@x.com")
+        self.assertEqual([row[0] for row in between], [10, 12, 14])
+    
+    def test_append_after_a_crash(self):
+        self.archive.append(rows(1, 10))
+        
+        # What an append that died before writing the index leaves behind:
+        # the ids of its messages in the contacts' files.
+        for contact, ids in [("a@x.com", [12, 14]), ("b@x.com", [11, 13])]:
+            path = os.path.join(self.directory, "contacts", 
+                                contact.encode("hex"))
+            with open(path, "ab") as f:
+                f.write("".join([struct.pack("<I", id) for id in ids]))
+        self.archive.close()
+        self.archive = Archive(self.directory, block=256)
+        self.assertEqual(self.archive.count("a@x.com"), 5)
+        
+        self.archive.append(rows(11, 20))
+        
+        self.assertEqual(self.archive.count("a@x.com"), 10)
+        self.assertEqual(self.archive.count("b@x.com"), 10)
+        self.assertEqual([row[0] for row in self.archive.page("a@x.com")],
+                         range(2, 21, 2))
+        between = self.archive.between(9.0, 16.0, "b@x.com")
+        self.assertEqual([row[0] for row in between], [9, 11, 13, 15])
+        
+        path = os.path.join(self.directory, "contacts", 
+                            "b@x.com".encode("hex"))
+        self.assertEqual(os.path.getsize(path), 10 * 4)
+
+if __name__ == "__main__":
+    unittest.main()
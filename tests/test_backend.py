@@ -0,0 +1,60 @@
+"""
+@file test_backend.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the recording backend's timers and main loop.
+"""
+
+import unittest
+
+import gui
+
+class RecorderTimerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.called = []
+    
+    def call(self, name):
+        return lambda: self.called.append(name)
+    
+    def test_cancel_takes_callbacks_out(self):
+        idle = self.recorder.after_idle(self.call("idle"))
+        timer = self.recorder.after(10, self.call("timer"))
+        self.recorder.after(20, self.call("later"))
+        
+        self.recorder.after_cancel(idle)
+        self.recorder.after_cancel(timer)
+        self.assertTrue(self.recorder.pending())
+        
+        self.recorder.advance(30)
+        self.assertEqual(self.called, ["later"])
+        self.assertFalse(self.recorder.pending())
+    
+    def test_cancel_after_running(self):
+        # Cancelling something that already ran mustn't hide what is left.
+        done = self.recorder.after_idle(self.call("first"))
+        self.recorder.update()
+        self.recorder.after_cancel(done)
+        self.recorder.after_cancel(done)
+        
+        self.recorder.after(5, self.call("second"))
+        self.assertTrue(self.recorder.pending())
+        
+        app = self.recorder.app()
+        app.mainloop()
+        self.assertEqual(self.called, ["first", "second"])
+    
+    def test_mainloop_runs_in_time_order(self):
+        self.recorder.after(30, self.call("c"))
+        self.recorder.after(10, self.call("a"))
+        cancelled = self.recorder.after(20, self.call("x"))
+        self.recorder.after(20, self.call("b"))
+        self.recorder.after_cancel(cancelled)
+        
+        self.recorder.app().mainloop()
+        self.assertEqual(self.called, ["a", "b", "c"])
+
+if __name__ == "__main__":
+    unittest.main()
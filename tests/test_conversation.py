@@ -0,0 +1,64 @@
+"""
+@file test_conversation.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of which conversation a Member shows received messages in, on
+the recording backend.
+"""
+
+import unittest
+
+import gui
+import calamity
+
+class MemberReceiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        # The first Window is the application's, conversations are the rest.
+        gui.Window(title="Calamity", app=self.recorder.app())
+        
+        self.member = calamity.Member("nick", "u@x.com", "online")
+        self.lines = []
+    
+    def tearDown(self):
+        gui.backend.use(self.previous)
+    
+    def close(self, conversation):
+        """
+        @brief Closes the conversation's window the way the user would.
+        """
+        component = conversation._window._component
+        component._protocols["WM_DELETE_WINDOW"]()
+    
+    def test_receive_reuses_open_conversation(self):
+        self.member.receive("hi")
+        first = self.member._conv[-1]
+        self.member.receive("there")
+        
+        self.assertEqual(self.member._conv, [first])
+    
+    def test_receive_after_close_opens_new_conversation(self):
+        self.member.receive("hi")
+        closed = self.member._conv[-1]
+        self.close(closed)
+        self.assertEqual(self.member._conv, [])
+        
+        self.member.receive("again")
+        self.assertEqual(len(self.member._conv), 1)
+        self.assertTrue(self.member._conv[-1] is not closed)
+    
+    def test_closing_older_conversation_keeps_newer(self):
+        self.member.start_conversation(None)
+        self.member.start_conversation(None)
+        older, newer = self.member._conv
+        self.close(older)
+        
+        self.member.receive("hi")
+        self.assertEqual(self.member._conv, [newer])
+
+if __name__ == "__main__":
+    unittest.main()
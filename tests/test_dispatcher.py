@@ -0,0 +1,126 @@
+"""
+@file test_dispatcher.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the Dispatcher counting the commands it hands out (and the
+ones it has no handler for), on its own and behind a Connection.
+"""
+
+import socket
+import unittest
+
+from network.msn import Connection, Dispatcher
+
+class _App:
+    """
+    @brief Stands in for CalamityApp, keeps the status changes.
+    """
+    
+    def __init__(self):
+        self.statuses = []
+    
+    def set_status(self, email, status):
+        self.statuses.append((email, status))
+
+class DispatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.handled = []
+        self.dispatcher = Dispatcher()
+        self.dispatcher.register(["NLN", "ILN"], self.handle)
+        self.dispatcher.register("FLN", self.handle)
+    
+    def handle(self, command, payload):
+        self.handled.append((command, payload))
+    
+    def test_handled(self):
+        self.assertTrue(self.dispatcher.dispatch(["NLN", "a@b.com"]))
+        self.assertFalse(self.dispatcher.dispatch(["MSG", "1"], "hi"))
+        self.assertEqual(self.handled, [(["NLN", "a@b.com"], None)])
+        
+        self.dispatcher.register("MSG", self.handle)
+        self.assertTrue("MSG" in self.dispatcher)
+        self.assertTrue(self.dispatcher.dispatch(["MSG", "1"], "hi"))
+        self.assertEqual(self.handled[-1], (["MSG", "1"], "hi"))
+    
+    def test_counts_per_verb(self):
+        for i in range(5):
+            self.dispatcher.dispatch(["ILN", str(i)])
+        for i in range(3):
+            self.dispatcher.dispatch(["NLN", str(i)])
+        self.dispatcher.dispatch(["FLN", "a@b.com"])
+        
+        stats = self.dispatcher.stats()
+        self.assertEqual(sorted(stats.keys()), ["FLN", "ILN", "NLN"])
+        self.assertEqual(stats["ILN"][0], 5)
+        self.assertEqual(stats["NLN"][0], 3)
+        self.assertEqual(stats["FLN"][0], 1)
+        for count, seconds in stats.values():
+            self.assertTrue(seconds >= 0.0)
+    
+    def test_unhandled(self):
+        for verb in ["UBX", "UBX", "NOT", "NLN"]:
+            self.dispatcher.dispatch([verb, "a@b.com"])
+        
+        self.assertEqual(self.dispatcher.unhandled(), {"UBX": 2, "NOT": 1})
+        self.assertEqual(self.handled, [(["NLN", "a@b.com"], None)])
+        
+        # No longer handled, so counted as such.
+        self.dispatcher.unregister("NLN")
+        self.assertFalse("NLN" in self.dispatcher)
+        self.assertFalse(self.dispatcher.dispatch(["NLN", "a@b.com"]))
+        self.assertEqual(self.dispatcher.unhandled()["NLN"], 1)
+        self.assertEqual(self.dispatcher.stats()["NLN"][0], 1)
+    
+    def test_counted_even_if_the_handler_fails(self):
+        def fail(command, payload):
+            raise ValueError(command[0])
+        self.dispatcher.register("CHL", fail)
+        
+        self.assertRaises(ValueError, self.dispatcher.dispatch, ["CHL", "0"])
+        self.assertEqual(self.dispatcher.stats()["CHL"][0], 1)
+    
+    def test_reset(self):
+        self.dispatcher.dispatch(["ILN", "1"])
+        self.dispatcher.dispatch(["UBX", "1"])
+        self.dispatcher.reset()
+        
+        self.assertEqual(self.dispatcher.unhandled(), {})
+        for count, seconds in self.dispatcher.stats().values():
+            self.assertEqual((count, seconds), (0, 0.0))
+
+class ConnectionDispatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server, ours = socket.socketpair()
+        self.connection = Connection("me@x.com", "pw", sock=ours)
+        self.app = _App()
+        self.connection.set_app(self.app)
+    
+    def tearDown(self):
+        self.connection.get_engine().close()
+        self.server.close()
+    
+    def test_commands_from_the_server(self):
+        self.connection.feed("ILN 9 NLN a@b.com A 0\r\n"
+                             "ILN 9 AWY b@b.com B 0\r\n"
+                             "NLN BSY a@b.com A 0\r\n"
+                             "FLN b@b.com\r\n"
+                             "UBX a@b.com 13\r\n<Data></Data>"
+                             "NOT 0\r\n")
+        
+        self.assertEqual(self.app.statuses,
+                         [("a@b.com", "online"), ("b@b.com", "away"),
+                          ("a@b.com", "busy"), ("b@b.com", "offline")])
+        
+        stats = self.connection.get_dispatcher().stats()
+        self.assertEqual(stats["ILN"][0], 2)
+        self.assertEqual(stats["NLN"][0], 1)
+        self.assertEqual(stats["FLN"][0], 1)
+        self.assertEqual(stats["LST"][0], 0)
+        self.assertEqual(self.connection.get_dispatcher().unhandled(),
+                         {"UBX": 1, "NOT": 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+@file test_engine.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the Engine telling its watcher (i.e. gui.App) when a socket
+has to be watched for writability.
+"""
+
+import socket
+import unittest
+
+from network.msn import Engine
+
+class EngineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = Engine()
+        self.watched = []
+        self.engine.set_watcher(self.watch, lambda fd: None)
+    
+    def tearDown(self):
+        self.engine.close()
+    
+    def watch(self, fd, callback, writable=False):
+        self.watched.append(writable)
+    
+    def test_pushed_while_connecting(self):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        
+        sock = socket.socket()
+        sock.setblocking(0)
+        channel = self.engine.connect(sock, listener.getsockname(),
+                                      lambda data: None)
+        channel.push("USR 1 SSO I a@b.com\r\n")
+        self.assertEqual(self.watched, [True])
+        
+        server, address = listener.accept()
+        while channel.connecting:
+            self.engine.poll(1.0)
+        
+        self.assertEqual(server.recv(4096), "USR 1 SSO I a@b.com\r\n")
+        self.assertEqual(self.watched, [True, False])
+        server.close()
+        listener.close()
+    
+    def test_writable_until_sent(self):
+        ours, theirs = socket.socketpair()
+        ours.setblocking(0)
+        theirs.setblocking(0)
+        channel = self.engine.add(ours, lambda data: None)
+        self.assertEqual(self.watched, [False])
+        
+        # Too much to be sent at once.
+        channel.push("x" * (4 * 1024 * 1024))
+        self.assertEqual(self.watched, [False, True])
+        
+        received = 0
+        while received < 4 * 1024 * 1024:
+            try:
+                received += len(theirs.recv(1024 * 1024))
+            except socket.error:
+                pass
+            self.engine.poll(0.1)
+        
+        self.assertEqual(self.watched, [False, True, False])
+        theirs.close()
+
+if __name__ == "__main__":
+    unittest.main()
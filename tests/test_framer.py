@@ -0,0 +1,90 @@
+"""
+@file test_framer.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the Framer, and of an Engine Channel reading through one.
+"""
+
+import random
+import socket
+import unittest
+
+from network.msn import Engine, Framer, FrameError
+
+class FramerTest(unittest.TestCase):
+
+    def test_commands_cut_anywhere(self):
+        body = "MIME-Version: 1.0\r\n\r\nhello"
+        data = ("ILN 9 NLN a@b.com A 0\r\n" +
+                "MSG a@b.com A %d\r\n%s" % (len(body), body) +
+                "FLN a@b.com\r\n") * 100
+        
+        framer = Framer(16)
+        commands = []
+        position = 0
+        while position < len(data):
+            cut = random.randint(1, 40)
+            framer.feed(data[position:position + cut])
+            position += cut
+            for command, payload in framer:
+                if payload != None:
+                    payload = payload.tobytes()
+                commands.append((command[0], payload))
+        
+        self.assertEqual(len(commands), 300)
+        self.assertEqual(commands[1], ("MSG", body))
+        self.assertEqual(framer.pending(), 0)
+    
+    def test_same_as_line_by_line(self):
+        pieces = ["ILN 9 NLN a@b.com A 0\r\n", "FLN a@b.com\n", "\n",
+                  "MSG a@b.com A 5\r\nhello", "UBX a@b.com 4\r\nMSG ",
+                  "NOT 2\r\n\r\n", "IPG 3\nabc", "MSG a@b.com A x\r\n",
+                  "MSGX 1\r\n", "GCF 1 3\r\nab\n"]
+        random.seed(3)
+        
+        for i in range(500):
+            data = "".join(random.choice(pieces) for j in range(10))
+            framers = (Framer(16), Framer(16))
+            commands = ([], [])
+            position = 0
+            while position < len(data):
+                cut = random.randint(1, 30)
+                for framer, framed in zip(framers, commands):
+                    framer.feed(data[position:position + cut])
+                    if framer is framers[0]:
+                        split = framer
+                    else:
+                        split = framer._split_lines()
+                    for command, payload in split:
+                        if payload != None:
+                            payload = payload.tobytes()
+                        framed.append((command, payload))
+                position += cut
+            
+            self.assertEqual(commands[0], commands[1], repr(data))
+            self.assertEqual(framers[0].pending(), framers[1].pending())
+    
+    def test_negative_length(self):
+        framer = Framer()
+        framer.feed("MSG a@b.com A -5\r\nFLN a@b.com\r\n")
+        self.assertRaises(FrameError, list, framer)
+    
+    def test_negative_length_closes_channel(self):
+        ours, theirs = socket.socketpair()
+        engine = Engine()
+        commands = []
+        closed = []
+        engine.add(ours, lambda command, payload: commands.append(command),
+                   closed=lambda: closed.append(True), framer=Framer())
+        
+        theirs.sendall("SYN 1 0\r\nMSG a@b.com A -20\r\nFLN a@b.com\r\n")
+        engine.poll(1.0)
+        
+        self.assertEqual(commands, [["SYN", "1", "0"]])
+        self.assertEqual(closed, [True])
+        self.assertEqual(len(engine), 0)
+        theirs.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,323 @@
+"""
+@file test_group.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of how much Group.reorder changes on screen, counted on the
+recording backend.
+"""
+
+import unittest
+
+import gui
+import calamity
+
+class GroupReorderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        
+        self.group = calamity.Group("group")
+        for i in range(200):
+            self.group.add(calamity.Member("nick%03d" % i, "u%d@x.com" % i,
+                                           "online"))
+        self.group.get_layer().parent(self.recorder.app())
+        self.recorder.update()
+        self.recorder.clear()
+    
+    def tearDown(self):
+        gui.backend.use(self.previous)
+    
+    def geometry(self):
+        """
+        @return How many grid changes were sent since the log was cleared.
+        """
+        return self.recorder.counts().get("grid_configure", 0)
+    
+    def test_unchanged_reorder_does_nothing(self):
+        self.group.reorder()
+        self.recorder.update()
+        
+        self.assertEqual(self.group.get_operations(), 0)
+        self.assertEqual(self.recorder.log, [])
+    
+    def test_move_touches_the_rows_in_between(self):
+        member = self.group[60]
+        member.set_nickname("nick049x")
+        self.recorder.clear()
+        
+        self.assertEqual(self.group.move(member), (60, 50))
+        self.recorder.update()
+        
+        # 11 rows change position, 10 of them change parity as well.
+        self.assertEqual(self.group.get_operations(), 21)
+        self.assertEqual(self.geometry(), 11)
+        self.assertEqual(self.group[50], member)
+    
+    def test_move_to_the_end(self):
+        member = self.group[190]
+        member.set_status("offline")
+        self.recorder.clear()
+        
+        self.assertEqual(self.group.move(member), (190, 199))
+        self.recorder.update()
+        
+        # Rows before the member are left alone.
+        self.assertEqual(self.geometry(), 10)
+        self.assertEqual(self.group.get_operations(), 20)
+    
+    def test_wrong_border_is_the_only_change(self):
+        self.group[120].set_border_color("blue")
+        self.recorder.clear()
+        
+        self.group.reorder()
+        self.recorder.update()
+        
+        self.assertEqual(self.group.get_operations(), 1)
+        self.assertEqual(self.geometry(), 0)
+
+# Widgets of a Group drawing 20 Rows: its own 4 and its Tag's, and 5 for 
+# each of the Rows.
+VIEW = 5 + 20 * 5
+
+class GroupPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        del calamity.Member.focus[:]
+        
+        self.group = calamity.Group("group", rows=20)
+        self.group.get_layer().parent(self.recorder.app())
+        self.grow(100)
+    
+    def tearDown(self):
+        del calamity.Member.focus[:]
+        gui.backend.use(self.previous)
+    
+    def grow(self, size):
+        """
+        @brief Adds Members (after the ones already there) until the Group 
+        has size of them, then draws them.
+        """
+        for i in range(len(self.group), size):
+            self.group.add(calamity.Member("nick%05d" % i, "u%d@x.com" % i,
+                                           "online"))
+        self.recorder.update()
+    
+    def widgets(self):
+        """
+        @return How many widgets have been made.
+        """
+        return self.recorder.counts().get("create", 0)
+    
+    def drawn(self):
+        """
+        @return The Members drawn by the Rows, top to bottom.
+        """
+        return [row.get_member() for row in self.group._pool]
+    
+    def test_widgets_stay_at_the_view(self):
+        self.assertEqual(self.widgets(), VIEW)
+        
+        self.grow(1000)
+        self.grow(10000)
+        self.assertEqual(self.widgets(), VIEW)
+        self.assertEqual(self.drawn(), self.group._members[:20])
+    
+    def test_rows_are_recycled(self):
+        rows = [row.get_layer().get_component() for row in self.group._pool]
+        self.recorder.clear()
+        
+        self.group.scroll_to(50)
+        self.recorder.update()
+        
+        self.assertEqual(self.widgets(), 0)
+        self.assertEqual(self.drawn(), self.group._members[50:70])
+        self.assertEqual([row.get_layer().get_component() 
+                          for row in self.group._pool], rows)
+        
+        # Past the end, the view stays full.
+        self.group.scroll_to(500)
+        self.assertEqual(self.drawn(), self.group._members[80:])
+    
+    def test_wheel_and_show(self):
+        nickname = self.group._pool[0]._nickname.get_component()
+        nickname.event_generate(gui.globals.WHEEL_DOWN, num=5)
+        self.assertEqual(self.drawn()[0], self.group[3])
+        
+        nickname.event_generate(gui.globals.WHEEL_UP, num=4)
+        self.assertEqual(self.drawn()[0], self.group[0])
+        
+        self.group.show(60)
+        self.assertEqual(self.drawn()[-1], self.group[60])
+        self.group.show(30)
+        self.assertEqual(self.drawn()[0], self.group[30])
+        self.assertEqual(self.widgets(), VIEW)
+    
+    def test_selection_survives_scrolling(self):
+        member = self.group[5]
+        row = self.group._pool[5]
+        row._nickname.get_component().event_generate(gui.globals.CLICKED)
+        self.assertEqual(calamity.Member.focus, [member])
+        self.assertEqual(row._border.get_border_width(), 
+                         calamity.globals.HIGHLIGHT_BORDER_WIDTH)
+        
+        # The Row is given to someone else, and loses the highlight.
+        self.group.scroll_to(40)
+        self.assertTrue(member.get_row() == None)
+        self.assertNotEqual(row._border.get_border_width(), 
+                            calamity.globals.HIGHLIGHT_BORDER_WIDTH)
+        
+        self.group.scroll_to(0)
+        self.assertEqual(calamity.Member.focus, [member])
+        self.assertTrue(member.get_row() is row)
+        self.assertEqual(row._border.get_border_width(), 
+                         calamity.globals.HIGHLIGHT_BORDER_WIDTH)
+
+class GroupCanvasTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        del calamity.Member.focus[:]
+        # The first Window is the application's, conversations are the rest.
+        gui.Window(title="Calamity", app=self.recorder.app())
+        
+        self.group = calamity.Group("group", canvas=True)
+        for i in range(30):
+            self.group.add(calamity.Member("nick%03d" % i, "u%d@x.com" % i,
+                                           "online"))
+        self.group.get_layer().parent(self.recorder.app())
+        self.recorder.update()
+        self.canvas = self.group._canvas.get_component()
+    
+    def tearDown(self):
+        del calamity.Member.focus[:]
+        gui.backend.use(self.previous)
+    
+    def click(self, index, event=gui.globals.CLICKED):
+        """
+        @brief Clicks the middle of a row of the Canvas.
+        """
+        height = calamity.globals.CANVAS_ROW_HEIGHT
+        self.canvas.event_generate(event, x=40, y=index*height + height/2)
+    
+    def item(self, member, name):
+        """
+        @return The [type, coordinates, options] of an item drawing a Member.
+        """
+        return self.canvas._items[getattr(member.get_row(), name)]
+    
+    def test_rows_are_drawn_at_their_index(self):
+        height = calamity.globals.CANVAS_ROW_HEIGHT
+        for i in [0, 1, 17, 29]:
+            member = self.group[i]
+            kind, coordinates, options = self.item(member, "_nickname")
+            self.assertEqual(coordinates[1], i*height + height/2)
+            self.assertEqual(options["text"], member.get_nickname())
+        
+        kind, coordinates, options = self.item(self.group[17], "_background")
+        self.assertEqual((coordinates[1], coordinates[3]), 
+                         (17*height, 18*height))
+    
+    def test_click_selects_the_row_under_it(self):
+        self.click(7)
+        self.assertEqual(calamity.Member.focus, [self.group[7]])
+        self.assertEqual(self.item(self.group[7], "_border")[2]["width"], 
+                         calamity.globals.HIGHLIGHT_BORDER_WIDTH)
+        
+        self.click(2)
+        self.assertEqual(calamity.Member.focus, [self.group[2]])
+        self.assertNotEqual(self.item(self.group[7], "_border")[2]["width"],
+                            calamity.globals.HIGHLIGHT_BORDER_WIDTH)
+        
+        # Below the last row.
+        self.click(45)
+        self.assertEqual(calamity.Member.focus, [self.group[2]])
+    
+    def test_click_follows_a_move(self):
+        member = self.group[10]
+        member.set_status("offline")
+        self.group.move(member)
+        self.assertTrue(self.group[29] is member)
+        
+        self.click(29)
+        self.assertEqual(calamity.Member.focus, [member])
+        self.click(10)
+        self.assertEqual(calamity.Member.focus, [self.group[10]])
+    
+    def test_tab_from_a_click(self):
+        self.click(7)
+        self.assertTrue(self.group.tab(gui.globals.DOWN))
+        self.assertEqual(calamity.Member.focus, [self.group[8]])
+        
+        self.group.tab(gui.globals.UP)
+        self.group.tab(gui.globals.UP)
+        self.assertEqual(calamity.Member.focus, [self.group[6]])
+    
+    def test_double_click_opens_a_conversation(self):
+        self.click(4, gui.globals.DBL_CLICKED)
+        
+        self.assertEqual(len(self.group[4]._conv), 1)
+        self.assertEqual([i for i in range(30) 
+                          if len(self.group[i]._conv) > 0], [4])
+
+class GroupTagTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        del calamity.Member.focus[:]
+        # The first Window is the application's, conversations are the rest.
+        gui.Window(title="Calamity", app=self.recorder.app())
+    
+    def tearDown(self):
+        del calamity.Member.focus[:]
+        gui.backend.use(self.previous)
+    
+    def drawn_group(self, size):
+        """
+        @brief Makes and draws a Group with a Row for every Member.
+        
+        @return The Group, and the bindings made while drawing it as a 
+        dictionary of operation -> count.
+        """
+        self.recorder.clear()
+        group = calamity.Group("group", rows=0, canvas=False)
+        for i in range(size):
+            group.add(calamity.Member("nick%04d" % i, "u%d@x.com" % i,
+                                      "online"))
+        group.get_layer().parent(self.recorder.app())
+        self.recorder.update()
+        
+        counts = self.recorder.counts()
+        return group, dict([(operation, counts.get(operation, 0))
+                            for operation in ["bind", "bind_class"]])
+    
+    def test_bindings_do_not_grow_with_the_group(self):
+        small, bindings = self.drawn_group(10)
+        self.assertEqual(bindings, {"bind": 0, "bind_class": 2})
+        
+        large, bindings = self.drawn_group(1000)
+        self.assertEqual(bindings, {"bind": 0, "bind_class": 2})
+    
+    def test_click_through_the_tag(self):
+        group, bindings = self.drawn_group(1000)
+        nickname = group[500].get_row()._nickname.get_component()
+        self.assertTrue(group._tag.get_name() in nickname.bindtags())
+        
+        nickname.event_generate(gui.globals.CLICKED)
+        self.assertEqual(calamity.Member.focus, [group[500]])
+        
+        nickname.event_generate(gui.globals.DBL_CLICKED)
+        self.assertEqual(len(group[500]._conv), 1)
+        self.assertEqual(len(group[499]._conv), 0)
+
+if __name__ == "__main__":
+    unittest.main()
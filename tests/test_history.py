@@ -0,0 +1,115 @@
+"""
+@file test_history.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the History, its pages and what its writer does when a
+write fails.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+
+import calamity.globals
+from calamity.history import History
+
+class _Failing:
+    """
+    @brief Stands in for the writer's connection, failing its inserts
+    while the History's failures counter is above zero.
+    """
+    
+    def __init__(self, connection, history):
+        self._connection = connection
+        self._history = history
+    
+    def executemany(self, *arguments):
+        if self._history.failures > 0:
+            self._history.failures -= 1
+            raise sqlite3.OperationalError("database or disk is full")
+        return self._connection.executemany(*arguments)
+    
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+class _FailingHistory(History):
+    """
+    @brief A History whose writer fails the first few times it writes.
+    """
+    
+    failures = 0
+    
+    def _connect(self):
+        connection = History._connect(self)
+        if not hasattr(self, "_reader"):
+            return connection
+        return _Failing(connection, self)
+
+class HistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "history.db")
+        self.retry = calamity.globals.HISTORY_RETRY
+        calamity.globals.HISTORY_RETRY = 0.01
+    
+    def tearDown(self):
+        calamity.globals.HISTORY_RETRY = self.retry
+        shutil.rmtree(self.directory)
+    
+    def test_pages(self):
+        history = History(self.path)
+        for i in range(120):
+            history.record("a@b.com", "Me", "message %d" % i, when=i)
+        history.record("c@d.com", "Me", "someone else")
+        history.flush()
+        
+        page = history.page("a@b.com", count=50)
+        self.assertEqual([row[3] for row in page],
+                         ["message %d" % i for i in range(70, 120)])
+        older = history.page("a@b.com", before=page[0][0], count=50)
+        self.assertEqual(older[-1][3], "message 69")
+        self.assertEqual(history.count("a@b.com"), 120)
+        history.close()
+    
+    def test_failed_write_is_retried(self):
+        history = _FailingHistory(self.path)
+        history.failures = 2
+        
+        for i in range(3):
+            history.record("a@b.com", "Me", "message %d" % i)
+        
+        # The first tries fail and are reported, the writer keeps the
+        # messages and writes them once it can.
+        self.assertRaises(sqlite3.OperationalError, history.flush)
+        for i in range(100):
+            try:
+                history.flush()
+                break
+            except sqlite3.OperationalError:
+                time.sleep(0.01)
+        history.record("a@b.com", "Me", "message 3")
+        history.flush()
+        
+        self.assertEqual(history.failures, 0)
+        self.assertEqual(history.get_unwritten(), 0)
+        self.assertEqual(history.get_error(), None)
+        self.assertEqual([row[3] for row in history.page("a@b.com")],
+                         ["message %d" % i for i in range(4)])
+        history.close()
+    
+    def test_close_reports_unwritten(self):
+        history = _FailingHistory(self.path)
+        history.failures = 1000000
+        history.record("a@b.com", "Me", "lost?")
+        
+        self.assertRaises(sqlite3.OperationalError, history.flush)
+        self.assertEqual(history.get_unwritten(), 1)
+        self.assertRaises(sqlite3.OperationalError, history.close)
+
+if __name__ == "__main__":
+    unittest.main()
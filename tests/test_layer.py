@@ -0,0 +1,128 @@
+"""
+@file test_layer.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of Layers handing blend changes down to their children in one
+pass on the next idle callback, on the recording backend.
+"""
+
+import unittest
+
+import gui
+import gui.layer
+
+class LayerBlendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        self.frame = self.recorder.widget("Frame", None)
+        
+        # A pass other tests left waiting on their own recorder.
+        gui.layer._flush_dirty()
+    
+    def tearDown(self):
+        gui.backend.use(self.previous)
+    
+    def layer(self, boxes, *layers):
+        """
+        @return A Layer holding a number of TextBoxes and then the layers.
+        """
+        layer = gui.Layer()
+        for i in range(boxes):
+            layer.add(gui.TextBox(text="x", pos=(i, 0)))
+        for i, inner in enumerate(layers):
+            inner.set_position((boxes + i, 0))
+            layer.add(inner)
+        return layer
+    
+    def configures(self):
+        """
+        @return How many configure calls were sent since the log was cleared.
+        """
+        return self.recorder.counts().get("configure", 0)
+    
+    def test_changes_collapse_into_one_pass(self):
+        outer = self.layer(10)
+        outer.parent(self.frame)
+        self.recorder.update()
+        self.recorder.clear()
+        
+        outer.blend("red")
+        outer.blend("blue")
+        outer.blend(remove="red")
+        self.assertEqual(self.configures(), 0)
+        self.recorder.update()
+        
+        # The Layer itself once, and once for each box.
+        self.assertEqual(gui.Layer.visited, 11)
+        self.assertEqual(self.configures(), 11)
+        for box in outer._items:
+            self.assertEqual(box.get_blend_colors(), ["blue"])
+    
+    def test_changes_that_cancel_out(self):
+        outer = self.layer(10)
+        outer.parent(self.frame)
+        self.recorder.update()
+        self.recorder.clear()
+        
+        outer.blend("red")
+        outer.blend(remove="red")
+        self.recorder.update()
+        
+        self.assertEqual(gui.Layer.visited, 1)
+        for box in outer._items:
+            self.assertEqual(box.get_blend_colors(), [])
+            self.assertEqual(self.recorder.counts().get("configure", 0), 0)
+    
+    def test_dirty_below_a_clean_layer(self):
+        inner = self.layer(1)
+        middle = self.layer(5, inner)
+        outer = self.layer(5, middle)
+        outer.parent(self.frame)
+        self.recorder.update()
+        
+        # The Outer pass (with nothing to hand down) still reaches Inner, 
+        # through Middle, which has no changes of its own.
+        inner.blend("red")
+        outer.blend("blue")
+        outer.blend(remove="blue")
+        self.recorder.update()
+        
+        self.assertFalse(inner._dirty)
+        box = inner._items[0]
+        self.assertEqual(box.get_blend_colors(), ["red"])
+        self.assertEqual(box.get_component()["bg"], box._bg)
+        self.assertEqual(gui.Layer.visited, 4)
+        
+        # And later changes still get there.
+        inner.blend("blue")
+        self.recorder.update()
+        self.assertEqual(sorted(box.get_blend_colors()), ["blue", "red"])
+        self.assertEqual(gui.Layer.visited, 2)
+    
+    def test_visited(self):
+        middle = self.layer(5)
+        outer = self.layer(10, middle)
+        outer.parent(self.frame)
+        self.recorder.update()
+        
+        outer.blend("red")
+        self.recorder.update()
+        self.assertEqual(gui.Layer.visited, 1 + 10 + 1 + 5)
+        
+        middle.blend("blue")
+        self.recorder.update()
+        self.assertEqual(gui.Layer.visited, 1 + 5)
+        
+        # Both at once, Middle is reached through Outer's pass.
+        middle.blend(remove="blue")
+        outer.blend(remove="red")
+        self.recorder.update()
+        self.assertEqual(gui.Layer.visited, 1 + 10 + 1 + 5)
+        self.assertEqual(middle._items[0].get_blend_colors(), [])
+
+if __name__ == "__main__":
+    unittest.main()
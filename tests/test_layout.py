@@ -0,0 +1,130 @@
+"""
+@file test_layout.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of how many calls attaching (and laying out) a widget sends,
+counted on the recording backend.
+"""
+
+import unittest
+
+import gui
+
+class LayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        self.frame = self.recorder.widget("Frame", None)
+    
+    def tearDown(self):
+        gui.backend.use(self.previous)
+    
+    def calls(self, widget):
+        """
+        @return operation -> count of what was sent to a widget since the 
+        log was cleared.
+        """
+        name = str(widget.get_component())
+        counts = {}
+        for widget_name, operation, arguments in self.recorder.log:
+            if widget_name == name:
+                counts[operation] = counts.get(operation, 0) + 1
+        return counts
+    
+    def test_attach_configures_the_grid_once(self):
+        # The first TextBox reads the background every TextBox starts with.
+        gui.TextBox(text="x").parent(self.frame)
+        
+        boxes = [gui.TextBox(text="x", pos=(i, 0), width=10)
+                 for i in range(20)]
+        self.recorder.clear()
+        
+        for box in boxes:
+            box.parent(self.frame)
+        self.recorder.update()
+        
+        for box in boxes:
+            self.assertEqual(self.calls(box), {"create": 1, 
+                                               "grid_configure": 1})
+    
+    def red_layer(self):
+        """
+        @return A red Layer holding a TextBox, not attached yet.
+        """
+        layer = gui.Layer()
+        layer.set_background_color("red")
+        box = gui.TextBox(text="x", justify="left")
+        box.set_foreground_color("blue")
+        box.set_border_width(2)
+        layer.add(box)
+        return layer, box
+    
+    def test_known_options_are_made_with(self):
+        # Red (and the background TextBoxes start with) are looked up once.
+        layer, box = self.red_layer()
+        layer.parent(self.frame)
+        
+        layer, box = self.red_layer()
+        self.recorder.clear()
+        layer.parent(self.frame)
+        self.recorder.update()
+        
+        self.assertEqual(self.calls(box), {"create": 1, "grid_configure": 1})
+        kind, options = [arguments for name, operation, arguments 
+                         in self.recorder.log if operation == "create" and 
+                         name == str(box.get_component())][0]
+        self.assertEqual((options["anchor"], options["fg"], options["bd"]), 
+                         ("w", "blue", 2))
+        self.assertEqual(options["bg"], "#ecec6cec6cec")
+        
+        # Reading options back doesn't ask Tk.
+        self.assertEqual(box.get_message(), "x")
+        self.assertEqual(box.get_background_color(), "#ecec6cec6cec")
+        self.assertEqual(self.calls(box).get("cget", 0), 0)
+    
+    def test_setters_in_a_layout_configure_once(self):
+        box = gui.TextBox(text="x")
+        box.parent(self.frame)
+        self.recorder.clear()
+        
+        with box.layout():
+            box.set_position((1, 1))
+            box.set_padding(2, 2)
+            box.set_growth(True, False)
+            box.row_growth_rate(0, 1)
+        
+        self.assertEqual(self.calls(box), {"grid_configure": 1,
+                                           "grid_rowconfigure": 1})
+        options = self.recorder.log[0][2][0]
+        self.assertEqual((options["row"], options["column"], options["padx"],
+                          options["sticky"]), (1, 1, 2, "we"))
+    
+    def test_nested_layouts_configure_at_the_end(self):
+        box = gui.TextBox(text="x")
+        box.parent(self.frame)
+        self.recorder.clear()
+        
+        box.begin_layout()
+        with box.layout():
+            box.set_position((3, 0))
+        box.set_padding(1, 1)
+        self.assertEqual(self.recorder.log, [])
+        box.end_layout()
+        
+        self.assertEqual(self.calls(box), {"grid_configure": 1})
+    
+    def test_setters_without_a_layout(self):
+        box = gui.TextBox(text="x")
+        box.parent(self.frame)
+        self.recorder.clear()
+        
+        box.set_position((1, 1))
+        box.set_padding(2, 2)
+        
+        self.assertEqual(self.calls(box), {"grid_configure": 2})
+
+if __name__ == "__main__":
+    unittest.main()
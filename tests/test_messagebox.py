@@ -0,0 +1,113 @@
+"""
+@file test_messagebox.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the MessageBox scrollback, on the recording backend.
+"""
+
+import unittest
+
+import gui
+
+class MessageBoxTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        self.frame = self.recorder.widget("Frame", None)
+        
+        self.box = gui.MessageBox(scrollback=100)
+        self.box.parent(self.frame)
+        self.recorder.update()
+        self.recorder.clear()
+    
+    def tearDown(self):
+        gui.backend.use(self.previous)
+    
+    def shown(self):
+        """
+        @return The text in the component.
+        """
+        return self.box._component._text
+    
+    def lines(self, first, last):
+        return "".join(["line %d\n" % i for i in range(first, last)])
+    
+    def test_scrollback_is_kept(self):
+        for i in range(1000):
+            self.box.append("line %d\n" % i)
+            self.assertTrue(self.box.get_line_count() <= 125)
+        
+        self.assertTrue(self.box.get_line_count() >= 100)
+        self.assertTrue(self.box.get_message().endswith("line 999\n"))
+        self.assertEqual(self.shown(), self.box.get_message())
+    
+    def test_lines_are_thrown_away_in_bulk(self):
+        for i in range(126):
+            self.box.append("line %d\n" % i)
+        
+        # The 126th line goes past the slack, back down to 100 at once.
+        self.assertEqual(self.recorder.counts()["delete"], 1)
+        self.assertEqual(self.box.get_line_count(), 100)
+        self.assertEqual(self.box.get_message(), self.lines(26, 126))
+        self.assertEqual(self.shown(), self.lines(26, 126))
+        
+        self.recorder.clear()
+        for i in range(126, 151):
+            self.box.append("line %d\n" % i)
+        self.assertFalse("delete" in self.recorder.counts())
+        self.assertEqual(self.box.get_line_count(), 125)
+    
+    def test_lines_are_never_cut_in_half(self):
+        for i in range(130):
+            self.box.append("line ")
+            self.box.append("%d\n" % i)
+        
+        self.assertTrue(self.box.get_message().startswith("line "))
+        self.assertEqual(self.shown(), self.box.get_message())
+    
+    def test_set_scrollback_trims(self):
+        for i in range(120):
+            self.box.append("line %d\n" % i)
+        
+        self.box.set_scrollback(10)
+        self.assertEqual(self.box.get_scrollback(), 10)
+        self.assertEqual(self.box.get_message(), self.lines(110, 120))
+        self.assertEqual(self.shown(), self.lines(110, 120))
+    
+    def test_appended_to_the_top(self):
+        self.box.append("line 1\n")
+        self.box.append("line 0\n", to="top")
+        self.assertEqual(self.box.get_message(), self.lines(0, 2))
+        self.assertEqual(self.shown(), self.lines(0, 2))
+    
+    def test_older_lines_trim_the_bottom(self):
+        for i in range(100, 200):
+            self.box.append("line %d\n" % i)
+        
+        # Older messages are put on top (i.e. scrolling up), the newest
+        # are the ones thrown away then.
+        for i in reversed(range(100)):
+            self.box.append("line %d\n" % i, to="top")
+        
+        self.assertTrue(self.box.get_line_count() <= 125)
+        message = self.box.get_message()
+        self.assertTrue(message.startswith("line 0\n"))
+        self.assertEqual(message, self.lines(0, self.box.get_line_count()))
+        self.assertEqual(self.shown(), message)
+    
+    def test_realized_later(self):
+        box = gui.MessageBox(scrollback=100)
+        for i in range(200):
+            box.append("line %d\n" % i)
+        box.parent(self.frame)
+        self.recorder.update()
+        
+        self.assertEqual(box._component._text, box.get_message())
+        self.assertEqual(box.get_line_count(), 
+                         box.get_message().count("\n"))
+
+if __name__ == "__main__":
+    unittest.main()
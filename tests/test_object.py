@@ -0,0 +1,242 @@
+"""
+@file test_object.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of how often a gui.Object asks Tk about colors (and its other
+options), and of hidden Objects not being made until they are shown, counted
+on the recording backend.
+"""
+
+import random
+import unittest
+
+import gui
+import gui.layer
+import gui.object
+
+class BlendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        self.frame = self.recorder.widget("Frame", None)
+        
+        # Every color is looked up again.
+        self.looked_up = dict(gui.object._rgb)
+        gui.object._rgb.clear()
+        
+        self.box = gui.TextBox(text="x")
+        self.box.set_background_color("white")
+        self.box.parent(self.frame)
+        self.recorder.update()
+    
+    def tearDown(self):
+        gui.object._rgb.clear()
+        gui.object._rgb.update(self.looked_up)
+        gui.backend.use(self.previous)
+    
+    def summed(self, colors):
+        """
+        @brief Blends colors the old way, adding up every color in a list
+        (and the base color) each time.
+        
+        @return The (red, green, blue) of the blended color.
+        """
+        r = g = b = 0
+        for color in colors + ["white"]:
+            rgb = gui.backend._rgb(color)
+            r += rgb[0]
+            g += rgb[1]
+            b += rgb[2]
+        count = len(colors) + 1
+        return (r/count, g/count, b/count)
+    
+    def drawn(self):
+        """
+        @return The (red, green, blue) of the background that was drawn.
+        """
+        return gui.backend._rgb(self.box.get_background_color())
+    
+    def test_colors_are_looked_up_once(self):
+        for color in ["red", "blue", "red", "green"]:
+            self.box.blend(add=color)
+        self.assertEqual(self.recorder.counts()["winfo_rgb"], 4)
+        
+        self.recorder.clear()
+        for i in range(50):
+            self.box.blend(add="blue", remove="red")
+            self.box.blend(add="red", remove="blue")
+        self.box.blend(remove="green")
+        
+        self.assertEqual(self.recorder.counts(), {"configure": 101})
+        self.assertEqual(self.drawn(), self.summed(["red", "blue", "red"]))
+    
+    def test_same_as_summing_every_color(self):
+        colors = []
+        random.seed(4)
+        for i in range(300):
+            add = random.choice(["", "red", "green", "blue", "yellow"])
+            remove = random.choice(["", "red", "green", "blue", "orange"])
+            self.box.blend(add=add, remove=remove)
+            
+            # The old way: a list, and colors that aren't in it are skipped.
+            if remove in colors:
+                colors.remove(remove)
+            if add != "":
+                colors.append(add)
+            
+            self.assertEqual(sorted(self.box.get_blend_colors()),
+                             sorted(colors))
+            self.assertEqual(self.drawn(), self.summed(colors))
+        
+        # Only the colors that were blended in were looked up, once each.
+        self.assertEqual(self.recorder.counts()["winfo_rgb"], 5)
+
+class OptionCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        self.frame = self.recorder.widget("Frame", None)
+        
+        self.box = gui.TextBox(text="hello")
+        self.box.parent(self.frame)
+        self.recorder.update()
+        self.recorder.clear()
+    
+    def tearDown(self):
+        gui.backend.use(self.previous)
+    
+    def set_everything(self):
+        self.box.set_message("hi")
+        self.box.set_foreground_color("blue")
+        self.box.set_border_width(3)
+        self.box.set_border_type("raised")
+        self.box.set_background_color("red")
+        self.box.justify("left")
+    
+    def test_same_values_are_not_written(self):
+        self.set_everything()
+        self.assertEqual(self.recorder.counts(), {"configure": 6})
+        
+        self.recorder.clear()
+        for i in range(10):
+            self.set_everything()
+        self.assertEqual(self.recorder.log, [])
+    
+    def test_getters_are_not_read_from_tk(self):
+        # Known from when the widget was made.
+        self.assertEqual(self.box.get_message(), "hello")
+        self.assertEqual(self.recorder.log, [])
+        
+        self.set_everything()
+        self.recorder.clear()
+        self.assertEqual(self.box.get_message(), "hi")
+        self.assertEqual(self.box.get_foreground_color(None), "blue")
+        self.assertEqual(self.box.get_border_width(), 3)
+        self.assertEqual(self.box.get_background_color(), "red")
+        self.assertEqual(self.recorder.log, [])
+
+class RealizeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        self.frame = self.recorder.widget("Frame", None)
+        
+        # A pass other tests left waiting on their own recorder.
+        gui.layer._flush_dirty()
+        self.recorder.clear()
+        self.clicked = []
+        self.tagged = []
+    
+    def tearDown(self):
+        gui.backend.use(self.previous)
+    
+    def tree(self, visible):
+        """
+        @brief Makes a Layer with a Layer of boxes in it, then binds, blends
+        and sets options of the boxes.
+        
+        @var visible: Whether the outer Layer is shown.
+        @return The outer Layer and the boxes.
+        """
+        tag = gui.Tag()
+        tag.bind("<Button-1>", lambda event, value: self.tagged.append(value))
+        
+        boxes = []
+        inner = gui.Layer()
+        for i in range(3):
+            box = gui.TextBox(text="x", pos=(i, 0))
+            boxes.append(box)
+            inner.add(box)
+        outer = gui.Layer()
+        outer.add(inner)
+        outer.set_visibility(visible)
+        outer.parent(self.frame)
+        
+        for i, box in enumerate(boxes):
+            box.bind("<Button-1>", lambda event: self.clicked.append(event))
+            tag.add(box, i)
+            box.set_message("box %d" % i)
+            box.set_foreground_color("blue")
+            box.set_border_width(2)
+        outer.set_background_color("white")
+        outer.blend("red")
+        self.recorder.update()
+        return outer, boxes
+    
+    def drawn(self, boxes):
+        """
+        @return The options each box's component was left with.
+        """
+        options = []
+        for box in boxes:
+            component = box.get_component()
+            options.append([component.cget(option)
+                            for option in ["text", "fg", "bd", "bg"]])
+        return options
+    
+    def test_hidden_makes_nothing(self):
+        outer, boxes = self.tree(False)
+        
+        self.assertEqual(self.recorder.log, [])
+        for box in boxes:
+            self.assertEqual(box.get_component(), None)
+    
+    def test_applied_when_shown(self):
+        shown, boxes = self.tree(True)
+        expected = self.drawn(boxes)
+        self.assertEqual(expected[0][:3], ["box 0", "blue", 2])
+        
+        outer, boxes = self.tree(False)
+        self.recorder.clear()
+        outer.set_visibility(True)
+        self.recorder.update()
+        
+        # The two Layers, and the three boxes.
+        self.assertEqual(self.recorder.counts()["create"], 5)
+        self.assertEqual(self.drawn(boxes), expected)
+        
+        for box in boxes:
+            self.assertEqual(sorted(box.get_blend_colors()),
+                             ["red", "white"])
+            box.get_component().event_generate("<Button-1>")
+        self.assertEqual(len(self.clicked), 3)
+        self.assertEqual(self.tagged, [0, 1, 2])
+    
+    def test_shown_before_parent(self):
+        box = gui.TextBox(text="x")
+        box.set_visibility(False)
+        box.set_visibility(True)
+        self.assertEqual(self.recorder.log, [])
+        
+        box.parent(self.frame)
+        self.assertEqual(self.recorder.counts()["create"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+@file test_presence.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of a burst of status changes from the server being applied
+together, each Group re-sorted once, on the recording backend.
+"""
+
+import os
+import random
+import shutil
+import socket
+import tempfile
+import unittest
+
+import gui
+import calamity
+import calamity.globals
+from calamity import history
+from network.msn import Connection
+
+# Members in each Group.
+MEMBERS = 100
+
+class PresenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.previous = gui.backend.get()
+        gui.backend.use(self.recorder)
+        del calamity.Member.focus[:]
+        
+        self.directory = tempfile.mkdtemp()
+        self.history_file = calamity.globals.HISTORY_FILE
+        calamity.globals.HISTORY_FILE = os.path.join(self.directory,
+                                                     "history.db")
+        self.app = calamity.CalamityApp()
+        
+        # id(group) -> how often it was re-sorted
+        self.sorted = {}
+        
+        # The Default Group and three more, only the first three hear
+        # from the server.
+        for i in range(1, 4):
+            self.app.add(calamity.Group("group %d" % i))
+        for i, group in enumerate(self.app._groups):
+            for j in range(MEMBERS):
+                group.add(calamity.Member("nick%03d" % j,
+                                          "u%d.%d@x.com" % (i, j),
+                                          "offline"))
+            self.count(group)
+        
+        self.server, ours = socket.socketpair()
+        self.connection = Connection("me@x.com", "pw", sock=ours)
+        self.connection.set_app(self.app)
+        self.recorder.update()
+        self.recorder.clear()
+    
+    def tearDown(self):
+        self.connection.get_engine().close()
+        self.server.close()
+        history.get().close()
+        history.use(None)
+        gui.scheduler.get().set_app(None)
+        calamity.globals.HISTORY_FILE = self.history_file
+        shutil.rmtree(self.directory, True)
+        del calamity.Member.focus[:]
+        gui.backend.use(self.previous)
+    
+    def count(self, group):
+        """
+        @brief Counts how often a Group is re-sorted.
+        """
+        reorder = group.reorder
+        def counted(*arguments):
+            self.sorted[id(group)] = self.sorted.get(id(group), 0) + 1
+            reorder(*arguments)
+        group.reorder = counted
+    
+    def burst(self, lines):
+        """
+        @brief Sends ILN lines for random Members of the first three Groups.
+        
+        @return email -> the status it was last sent.
+        """
+        random.seed(lines)
+        statuses = {}
+        data = []
+        for i in range(lines):
+            email = "u%d.%d@x.com" % (random.randint(0, 2),
+                                       random.randint(0, MEMBERS - 1))
+            code, status = random.choice([("NLN", "online"),
+                                          ("AWY", "away"),
+                                          ("BSY", "busy")])
+            data.append("ILN %d %s %s Nick 0\r\n" % (i, code, email))
+            statuses[email] = status
+        self.connection.feed("".join(data))
+        return statuses
+    
+    def applied(self):
+        """
+        @return How many re-sorts each Group had, from the first to the last.
+        """
+        return [self.sorted.get(id(group), 0)
+                for group in self.app._groups]
+    
+    def test_burst_sorts_each_group_once(self):
+        statuses = self.burst(500)
+        
+        # Nothing changes until the batch is applied, on a single timer.
+        self.assertEqual(self.applied(), [0, 0, 0, 0])
+        self.assertEqual(self.recorder.counts(), {"after": 1})
+        self.assertEqual(self.app.find("u0.0@x.com")[0].get_status(),
+                         "offline")
+        
+        self.recorder.advance()
+        self.assertEqual(self.applied(), [1, 1, 1, 0])
+        self.assertEqual(self.recorder.pending(), 0)
+        
+        for email, status in statuses.items():
+            self.assertEqual(self.app.find(email)[0].get_status(), status)
+        for group in self.app._groups:
+            keys = [member.get_key() for member in group]
+            self.assertEqual(keys, sorted(keys))
+    
+    def test_every_burst_is_a_batch(self):
+        self.burst(500)
+        self.recorder.advance()
+        self.burst(501)
+        self.recorder.advance()
+        self.assertEqual(self.applied(), [2, 2, 2, 0])
+    
+    def test_unchanged_status_sorts_nothing(self):
+        self.connection.feed("FLN u0.0@x.com\r\n" * 20)
+        self.recorder.advance()
+        self.assertEqual(self.applied(), [0, 0, 0, 0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+@file test_scheduler.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the Scheduler's frames on the recording backend, with a
+clock that only moves when a change says so.
+"""
+
+import unittest
+
+import gui
+import gui.scheduler
+
+class _Clock:
+    """
+    @brief Stands in for the time module in gui.scheduler.
+    """
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def time(self):
+        return self.now
+
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = gui.backend.Recorder()
+        self.clock = _Clock()
+        self.time = gui.scheduler.time
+        gui.scheduler.time = self.clock
+        
+        self.scheduler = gui.scheduler.Scheduler(self.recorder.app(),
+                                                 budget=5)
+        self.recorder.clear()
+        self.made = []
+    
+    def tearDown(self):
+        gui.scheduler.time = self.time
+    
+    def change(self, name, milliseconds=2):
+        """
+        @brief A change that takes some time to make.
+        """
+        self.made.append(name)
+        self.clock.now += milliseconds / 1000.0
+    
+    def queue(self, count):
+        for i in range(count):
+            self.scheduler.schedule(None, self.change, i)
+    
+    def test_nothing_is_made_before_the_frame(self):
+        self.queue(10)
+        self.assertEqual(self.made, [])
+        self.assertEqual(self.scheduler.pending(), 10)
+        
+        # A single frame is asked for however many changes are queued.
+        self.assertEqual(self.recorder.counts(), {"after_idle": 1})
+    
+    def test_frame_stays_in_the_budget(self):
+        self.queue(10)
+        self.recorder.update()
+        
+        # The change that goes past 5 ms ends the frame.
+        self.assertEqual(self.made, [0, 1, 2])
+        self.assertEqual(self.scheduler.pending(), 7)
+    
+    def test_rest_is_spread_over_later_frames(self):
+        self.queue(10)
+        self.recorder.update()
+        
+        # The next frame is a timer, so input waiting is handled first.
+        made = []
+        while self.recorder.pending():
+            self.recorder.advance()
+            made.append(len(self.made))
+        self.assertEqual(made, [6, 9, 10])
+        self.assertEqual(self.made, range(10))
+    
+    def test_slow_change_is_still_made(self):
+        self.scheduler.schedule(None, self.change, "slow", 50)
+        self.scheduler.schedule(None, self.change, "next")
+        self.recorder.update()
+        self.assertEqual(self.made, ["slow"])
+        
+        self.recorder.advance()
+        self.assertEqual(self.made, ["slow", "next"])
+    
+    def test_counters(self):
+        self.queue(10)
+        self.scheduler.schedule("nick", self.change, "first")
+        self.scheduler.schedule("nick", self.change, "last")
+        while self.recorder.pending():
+            self.recorder.advance()
+        
+        # 11 changes: 3 made in each frame, the ones left over are
+        # deferred again at the end of every frame they didn't fit in.
+        self.assertEqual(self.scheduler.stats(),
+                         {"queued": 12, "collapsed": 1, "flushed": 11,
+                          "deferred": 8 + 5 + 2, "frames": 4})
+        self.assertEqual(self.made[-1], "last")
+        self.assertFalse("first" in self.made)
+        
+        self.scheduler.reset()
+        self.assertEqual(set(self.scheduler.stats().values()), set([0]))
+    
+    def test_without_an_app_changes_are_made_right_away(self):
+        self.scheduler.set_app(None)
+        self.queue(10)
+        self.assertEqual(self.made, range(10))
+        self.assertEqual(self.scheduler.stats()["frames"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+"""
+@file test_switchboard.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of the Switchboard keeping sessions open, against a stand-in
+notification server (a socketpair answering XFR) and switchboard server
+(on localhost, answering USR, CAL, MSG and OUT).
+"""
+
+import socket
+import threading
+import time
+import unittest
+
+from network.msn import Connection
+from network.msn import switchboard
+
+# Messages with this text are never acknowledged by the stand-in server.
+UNANSWERED = "no ack please"
+
+def _commands(sock):
+    """
+    @brief Reads commands (and the payloads of MSG) from a blocking socket.
+    
+    @return A generator of (command split on spaces, payload).
+    """
+    data = ""
+    while True:
+        try:
+            read = sock.recv(4096)
+        except socket.error:
+            return
+        if not read:
+            return
+        data += read
+        
+        # The notification server is sent lines ending in "\n" alone.
+        while "\n" in data:
+            line, rest = data.split("\n", 1)
+            command = line.rstrip("\r").split(" ")
+            payload = ""
+            if command[0] == "MSG":
+                length = int(command[-1])
+                if len(rest) < length:
+                    break
+                payload, rest = rest[:length], rest[length:]
+            data = rest
+            yield command, payload
+
+class _Server:
+    """
+    @brief A stand-in switchboard server, a thread for each connection.
+    """
+    
+    def __init__(self):
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(16)
+        self.address = "127.0.0.1:%d" % self.listener.getsockname()[1]
+        self.connections = 0
+        self.outs = 0
+        
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+    
+    def _accept(self):
+        while True:
+            try:
+                sock, address = self.listener.accept()
+            except socket.error:
+                return
+            self.connections += 1
+            thread = threading.Thread(target=self._serve, args=(sock,))
+            thread.daemon = True
+            thread.start()
+    
+    def _serve(self, sock):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            self._answer(sock)
+        except socket.error:
+            # The session went away without saying goodbye.
+            pass
+        sock.close()
+    
+    def _answer(self, sock):
+        for command, payload in _commands(sock):
+            if command[0] == "USR":
+                sock.sendall("USR %s OK %s Me\r\n" % (command[1], command[2]))
+            elif command[0] == "CAL":
+                sock.sendall("CAL %s RINGING 1175\r\n" % command[1])
+                sock.sendall("JOI %s Name\r\n" % command[2])
+            elif command[0] == "MSG" and not payload.endswith(UNANSWERED):
+                sock.sendall("ACK %s\r\n" % command[1])
+            elif command[0] == "OUT":
+                self.outs += 1
+                return
+    
+    def close(self):
+        self.listener.close()
+
+class SwitchboardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _Server()
+        
+        self.notification, ours = socket.socketpair()
+        self.connection = Connection("me@x.com", "pw", sock=ours)
+        self.engine = self.connection.get_engine()
+        self.switchboard = self.connection.get_switchboard()
+        
+        thread = threading.Thread(target=self._notify)
+        thread.daemon = True
+        thread.start()
+    
+    def tearDown(self):
+        self.switchboard.close()
+        self.engine.close()
+        self.notification.close()
+        self.server.close()
+    
+    def _notify(self):
+        """
+        @brief The stand-in notification server, every XFR gets the 
+        switchboard server.
+        """
+        try:
+            for command, payload in _commands(self.notification):
+                if command[0] == "XFR":
+                    self.notification.sendall(
+                        "XFR %s SB %s CKI 1726.1050\r\n" % 
+                        (command[1], self.server.address))
+        except socket.error:
+            # Closed by tearDown.
+            pass
+    
+    def run_until(self, done, timeout=2.0):
+        """
+        @brief Runs the Engine until done() is True.
+        """
+        deadline = time.time() + timeout
+        while not done() and time.time() < deadline:
+            self.engine.poll(0.05)
+    
+    def send(self, email, message="hi"):
+        """
+        @brief Sends a message and waits for it to be acknowledged.
+        
+        @return The seconds it took.
+        """
+        acked = []
+        start = time.time()
+        self.switchboard.send([email], message, acked.append)
+        self.run_until(lambda: len(acked) > 0)
+        self.assertEqual(acked, [True])
+        return time.time() - start
+    
+    def test_reuse(self):
+        first = []
+        later = []
+        for i in range(10):
+            email = "c%d@x.com" % i
+            first.append(self.send(email))
+            session = self.switchboard.get_session([email])
+            for j in range(10):
+                later.append(self.send(email.upper()))
+            self.assertTrue(self.switchboard.get_session([email]) is session)
+        
+        stats = self.switchboard.stats()
+        self.assertEqual(stats["opened"], 10)
+        self.assertEqual(stats["reused"], 100)
+        self.assertEqual(self.server.connections, 10)
+        
+        first.sort()
+        later.sort()
+        print "\nfirst message: median %.3f ms, later messages: median " \
+              "%.3f ms" % (first[5] * 1000, later[50] * 1000)
+    
+    def test_least_recently_used_evicted(self):
+        limit = switchboard.SESSION_LIMIT
+        self.assertEqual(self.switchboard.get_limit(), limit)
+        for i in range(limit):
+            self.send("c%d@x.com" % i)
+        oldest = self.switchboard.get_session(["c0@x.com"])
+        evicted = self.switchboard.get_session(["c1@x.com"])
+        
+        # c0 is used again, so c1 is the least recently used.
+        self.send("c0@x.com")
+        self.send("new@x.com")
+        
+        self.assertEqual(len(self.switchboard), limit)
+        self.assertEqual(self.switchboard.stats()["evicted"], 1)
+        self.assertEqual(evicted.get_state(), switchboard.Session.CLOSED)
+        self.assertTrue(self.switchboard.get_session(["c0@x.com"]) is oldest)
+        self.assertEqual(self.switchboard.get_session(["c1@x.com"]), None)
+        self.run_until(lambda: self.server.outs == 1)
+        self.assertEqual(self.server.outs, 1)
+    
+    def test_idle_expiry(self):
+        delays = []
+        call_later = self.engine.call_later
+        def counted(delay, callback):
+            delays.append(delay)
+            call_later(delay, callback)
+        self.engine.call_later = counted
+        
+        self.switchboard.set_idle_timeout(0.1)
+        self.send("c0@x.com")
+        self.send("c1@x.com")
+        self.assertEqual(len(delays), 1)
+        self.assertTrue(delays[0] <= 0.1)
+        
+        self.run_until(lambda: len(self.switchboard) == 0)
+        self.assertEqual(len(self.switchboard), 0)
+        self.assertEqual(self.switchboard.stats()["expired"], 2)
+        self.run_until(lambda: self.server.outs == 2)
+        self.assertEqual(self.server.outs, 2)
+    
+    def test_close_fails_unacknowledged(self):
+        acked = []
+        self.send("c0@x.com")
+        self.switchboard.send(["c0@x.com"], UNANSWERED, acked.append)
+        self.run_until(lambda: False, 0.1)
+        # Closed before it is even connected, the message is still queued.
+        self.switchboard.send(["c1@x.com"], "hi", acked.append)
+        self.assertEqual(acked, [])
+        
+        self.switchboard.close()
+        self.assertEqual(acked, [False, False])
+        self.assertEqual(len(self.switchboard), 0)
+    
+    def test_refused_connection(self):
+        # A port nobody listens on.
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        self.server.address = "127.0.0.1:%d" % sock.getsockname()[1]
+        sock.close()
+        
+        acked = []
+        self.switchboard.send(["c0@x.com"], "hi", acked.append)
+        self.run_until(lambda: len(acked) > 0)
+        self.assertEqual(acked, [False])
+        self.assertEqual(len(self.switchboard), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+@file test_window.py
+@date 10/18/2026
+@version 0.1
+
+@brief Tests of gui.App watching sockets from inside its main loop.
+"""
+
+import socket
+import threading
+import time
+import unittest
+
+import _tkinter
+
+import gui
+
+class _NoFileHandlers:
+    """
+    @brief Stands in for a Tcl interpreter without file handlers (Windows).
+    """
+    
+    def __init__(self, tk):
+        self._tk = tk
+    
+    def createfilehandler(self, fd, mask, callback):
+        raise AttributeError("createfilehandler")
+    
+    def __getattr__(self, name):
+        return getattr(self._tk, name)
+
+class AppReaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = gui.App(useTk=0)
+        self.afters = []
+        after = self.app.after
+        def counted(delay, callback, *arguments):
+            self.afters.append(callback)
+            return after(delay, callback, *arguments)
+        self.app.after = counted
+        
+        self.ours, self.theirs = socket.socketpair()
+    
+    def tearDown(self):
+        self.app.remove_reader(self.ours)
+        self.ours.close()
+        self.theirs.close()
+    
+    def run_until(self, done, timeout=2.0):
+        """
+        @brief Runs the main loop until done() is True.
+        """
+        deadline = time.time() + timeout
+        while not done() and time.time() < deadline:
+            self.app.tk.dooneevent(_tkinter.DONT_WAIT)
+            time.sleep(0.0005)
+    
+    def test_no_timers_while_idle(self):
+        read = []
+        self.app.add_reader(self.ours, lambda: read.append(self.ours.recv(64)))
+        
+        self.run_until(lambda: False, 0.2)
+        self.assertEqual(self.afters, [])
+        self.assertEqual(read, [])
+        
+        self.theirs.send("x")
+        self.run_until(lambda: len(read) > 0)
+        self.assertEqual(read, ["x"])
+        self.assertEqual(self.afters, [])
+    
+    def test_dispatch_latency(self):
+        latencies = []
+        def readable():
+            sent = float(self.ours.recv(64))
+            latencies.append(time.time() - sent)
+        self.app.add_reader(self.ours, readable)
+        
+        def write():
+            for i in range(50):
+                time.sleep(0.005)
+                self.theirs.send("%.6f" % time.time())
+        writer = threading.Thread(target=write)
+        writer.start()
+        self.run_until(lambda: len(latencies) == 50, 5.0)
+        writer.join()
+        
+        latencies.sort()
+        median = latencies[len(latencies) / 2]
+        print "\nsocket write -> handler: median %.3f ms, max %.3f ms" % \
+            (median * 1000, latencies[-1] * 1000)
+        self.assertEqual(len(latencies), 50)
+        self.assertTrue(median < 0.010)
+    
+    def test_polled_in_main_thread(self):
+        self.app.tk = _NoFileHandlers(self.app.tk)
+        threads = []
+        def readable():
+            self.ours.recv(64)
+            threads.append(threading.current_thread())
+        
+        # Adding a descriptor twice still polls it once.
+        self.app.add_reader(self.ours, readable)
+        self.app.add_reader(self.ours, readable)
+        self.assertEqual(len(self.afters), 1)
+        
+        self.theirs.send("x")
+        self.run_until(lambda: len(threads) > 0)
+        self.assertEqual(threads, [threading.current_thread()])
+        
+        # Nothing is polled once the reader is gone.
+        self.app.remove_reader(self.ours)
+        polls = len(self.afters)
+        self.run_until(lambda: False, 0.05)
+        self.assertEqual(len(self.afters), polls)
+    
+    def test_writable_until_added_again(self):
+        for tk in (self.app.tk, _NoFileHandlers(self.app.tk)):
+            self.app.tk = tk
+            called = []
+            self.app.add_reader(self.ours, lambda: called.append(1), True)
+            self.run_until(lambda: len(called) > 0)
+            self.assertTrue(len(called) > 0)
+            
+            # Writable is no longer watched, and nothing can be read.
+            self.app.add_reader(self.ours, lambda: called.append(2))
+            self.run_until(lambda: False, 0.05)
+            self.assertFalse(2 in called)
+            self.app.remove_reader(self.ours)
+
+if __name__ == "__main__":
+    unittest.main()